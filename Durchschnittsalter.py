@@ -1,21 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Durchschnittsalter / Geburtsquartale der Amateur-Teams.
+
+Als Modul importierbar (Dashboard, altersstatistik_app.py):
+    import Durchschnittsalter
+    Durchschnittsalter.render_altersstatistik(excel_path, title=..., team_colors=...)
+
+Standalone: streamlit run Durchschnittsalter.py
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import re
+
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-import numpy as np
-from datetime import datetime, date
-import plotly.subplots as make_subplots
-
-# Seite konfigurieren
-st.set_page_config(
-    page_title="JWR - Durchschnittsalter Dashboard",
-    page_icon="⚽",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# CSS für besseres Styling
-st.markdown("""
+
+try:
+    from spaltenspeicher import read_frame, write_frame, write_partition, read_partitions, list_partitions
+except ImportError:  # Skript liegt ohne das Dashboard-Repo -> kein Sidecar-Cache/Saison-Archiv
+    read_frame = write_frame = write_partition = read_partitions = list_partitions = None
+
+try:
+    from laufzeiten import timed, cache_miss
+except ImportError:  # ohne Dashboard-Repo keine Laufzeit-Messung
+    def timed(name=None, cache=False):
+        return lambda fn: fn
+
+    def cache_miss(name):
+        pass
+
+try:
+    import relativalter
+except ImportError:  # ohne Dashboard-Repo keine RAE-Auswertung
+    relativalter = None
+
+# ========================= CONFIG =========================
+DEFAULT_EXCEL = Path(__file__).parent / "Statistik Altersdurchschnitt.xlsx"
+DEFAULT_TITLE = "⚽ Durchschnittsalter Amateur-Teams"
+DEFAULT_SEASON = "Saison 2025/26"
+CURRENT_SEASON = "2526"                    # Saisonordner-Schema wie ...\Matches\2526
+SEASON_DIR_RE = re.compile(r"^\d{4}$")
+ARCHIVE_DIRNAME = ".altersstatistik_archiv"  # partitioniertes Archiv neben den Saisonordnern
+LINEUPS_FILENAME = "Aufstellungen.csv"     # optional neben der Arbeitsmappe: Team;Datum;Gegner;Spieler;Minuten
+
+# CSS für die Elemente der Ansicht (nur eigene Klassen – unschädlich beim Einbetten)
+COMPONENT_CSS = """
 <style>
     .main-header {
         font-size: 2.2rem;
@@ -42,10 +74,6 @@ st.markdown("""
         font-size: 0.9rem;
         opacity: 0.9;
     }
-    .stPlotlyChart {
-        border-radius: 12px;
-        box-shadow: 0 3px 12px rgba(0,0,0,0.1);
-    }
     .team-info {
         background: linear-gradient(135deg, #ff6b6b 0%, #ee5a24 100%);
         padding: 0.8rem;
@@ -55,28 +83,19 @@ st.markdown("""
         margin-bottom: 0.8rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-# Funktion zum Laden der Excel-Daten
-@st.cache_data
-def load_excel_data():
-    try:
-        # Excel-Datei laden
-        excel_path = "Statistik Altersdurchschnitt.xlsx"
-        df = pd.read_excel(excel_path)
-        
-        # Spaltennamen bereinigen
-        df.columns = ['Team', 'Altersdurchschnitt']
-        
-        # Daten sortieren nach Altersdurchschnitt
-        df = df.sort_values('Altersdurchschnitt')
-        
-        return df
-    except Exception as e:
-        st.error(f"Fehler beim Laden der Excel-Datei: {e}")
-        return None
+# Seitenweites Styling – nur standalone, eingebettet gilt das Theme der aufrufenden App
+PAGE_CSS = """
+<style>
+    .stPlotlyChart {
+        border-radius: 12px;
+        box-shadow: 0 3px 12px rgba(0,0,0,0.1);
+    }
+</style>
+"""
 
-# Team-Farben definieren
+# Team-Farben definieren (Haupt- und Zweitfarbe; Aufrufer dürfen auch einfache Hex-Strings übergeben)
 TEAM_COLORS = {
     'Liefering': ['#FF0000', '#FFFFFF'],      # Rot-Weiß
     'Altach': ['#FFD700', '#000000'],         # Gelb-Schwarz
@@ -84,715 +103,1110 @@ TEAM_COLORS = {
     'JWR': ['#006400', '#000000'],            # Dunkelgrün-Schwarz
     'LASK': ['#000000', '#FFFFFF'],           # Schwarz-Weiß
     'Sturm': ['#000000', '#C0C0C0'],          # Schwarz-Gepunktet (Silber)
-    'Young Violetts': ['#800080', '#FFFFFF'], # Violett-Weiß
+    'Young Violets': ['#800080', '#FFFFFF'],  # Violett-Weiß
     'WAC': ['#000000', '#FFFFFF']             # Schwarz-Gestreift (Schwarz-Weiß)
 }
 
-# Funktion zum Laden der echten Geburtsdaten aus den Mannschaftsblättern
-@st.cache_data
-def load_birth_quarter_data():
-    """Lädt echte Geburtsdaten aus den Mannschaftsblättern der Excel-Datei"""
+# Standardfarbe für unbekannte/ungültige Teams
+DEFAULT_COLOR = '#1f77b4'
+
+# Mapping der Blattnamen zu den Team-Namen (nicht aufgeführte Blätter heißen wie das Team)
+SHEET_TEAM_MAPPING = {
+    'Liefering': 'Liefering',
+    'Altach Juniors': 'Altach',
+    'Rapid': 'Rapid',
+    'JWR': 'JWR',
+    'LASK': 'LASK',
+    'Sturm': 'Sturm',
+    'Young Violets': 'Young Violets',
+    'WAC': 'WAC'
+}
+
+# Blätter ohne Kader (alle übrigen Blätter gelten als Mannschaftsblatt)
+NON_TEAM_SHEETS = ('Gesamtübersicht', 'Alter pro Spieltag')
+
+QUARTER_COLUMNS = ['Q1_Jan_Mar', 'Q2_Apr_Jun', 'Q3_Jul_Sep', 'Q4_Oct_Dec']
+ROSTER_FIELDS = ['Blatt', 'Team', 'Spieler', 'Geburtsdatum']
+LINEUP_FIELDS = ['Team', 'Spiel', 'Gegner', 'Spieler']
+
+
+# ========================= Daten =========================
+SUMMARY_SHEET = 0          # Gesamtübersicht: Team | Startelf-Altersdurchschnitt
+LINEUP_COLUMNS = "A:L"     # Mannschaftsblätter: Gegner | 11 Spieler der Startelf (Block pro Spiel)
+ROSTER_COLUMNS = "P:Q"     # Mannschaftsblätter: Spielername | Geburtsdatum (Spalte Q)
+SIDECAR_DIRNAME = ".altersstatistik_cache"  # Spaltenspeicher neben der Arbeitsmappe
+
+
+def workbook_key(excel_path) -> float:
+    """Cache-Key der Arbeitsmappe (mtime) – eine Änderung an der Datei lädt genau einmal neu."""
     try:
-        excel_path = "Statistik Altersdurchschnitt.xlsx"
-        
-        # Mapping der Blattnamen zu den Team-Namen
-        sheet_team_mapping = {
-            'Liefering': 'Liefering',
-            'Altach Juniors': 'Altach',
-            'Rapid': 'Rapid',
-            'JWR': 'JWR',
-            'LASK': 'LASK',
-            'Sturm': 'Sturm',
-            'Young Violets': 'Young Violetts',
-            'WAC': 'WAC'
-        }
-        
-        birth_quarter_data = []
-        
-        for sheet_name, team_name in sheet_team_mapping.items():
+        return Path(excel_path).stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _lineup_blocks(block: pd.DataFrame, team: str) -> pd.DataFrame:
+    """Startelf-Blöcke (Gegner in Spalte A, Spieler in B:L) im Langformat."""
+    names = block.iloc[:, 1:]
+    is_lineup = block.iloc[:, 0].map(lambda v: isinstance(v, str)) & names.map(lambda v: isinstance(v, str)).any(axis=1)
+    lineups = block[is_lineup]
+    if lineups.empty:
+        return pd.DataFrame(columns=LINEUP_FIELDS)
+    wide = pd.DataFrame({'Spiel': range(1, len(lineups) + 1), 'Gegner': lineups.iloc[:, 0].str.strip().values})
+    players = lineups.iloc[:, 1:].set_axis(range(lineups.shape[1] - 1), axis=1).reset_index(drop=True)
+    long = wide.join(players).melt(id_vars=['Spiel', 'Gegner'], value_name='Spieler').dropna(subset=['Spieler'])
+    long['Spieler'] = long['Spieler'].astype(str).str.strip()
+    long.insert(0, 'Team', team)
+    return long[LINEUP_FIELDS].sort_values(['Spiel']).reset_index(drop=True)
+
+
+@timed()
+def read_workbook(excel_path) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Liest die Arbeitsmappe in einem Durchgang.
+
+    Die Datei wird genau einmal geöffnet (pd.ExcelFile, openpyxl read-only); aus der
+    Übersicht werden nur Team/Altersdurchschnitt, aus den Mannschaftsblättern nur die
+    Startelf-Blöcke (A:L) und der Kader (P:Q) gelesen. Ergebnis:
+    (summary[Team, Altersdurchschnitt],
+     roster[Blatt, Team, Spieler, Geburtsdatum] im Langformat über alle Teams,
+     lineups[Team, Spiel, Gegner, Spieler] – eine Zeile pro Startelf-Spieler).
+    """
+    with pd.ExcelFile(excel_path) as xl:
+        summary = xl.parse(SUMMARY_SHEET, usecols="A:B")
+        summary.columns = ['Team', 'Altersdurchschnitt']
+
+        rosters, lineups = [], []
+        for sheet_name in xl.sheet_names[1:]:
+            if sheet_name in NON_TEAM_SHEETS:
+                continue
+            team_name = SHEET_TEAM_MAPPING.get(sheet_name, sheet_name)
+            df_full = xl.parse(sheet_name, header=None, usecols=f"{LINEUP_COLUMNS},{ROSTER_COLUMNS}")
+            if df_full.shape[1] < 14:
+                continue
+            lineups.append(_lineup_blocks(df_full.iloc[:, :12], team_name))
+            df_sheet = df_full.iloc[:, 12:14].copy()
+            df_sheet.columns = ['Spieler', 'Geburtsdatum']
+            dates = df_sheet['Geburtsdatum']
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                # Zahlen (Alterswerte, Spieltage) nicht als Epoch-Datum interpretieren
+                dates = dates.where(~dates.map(lambda v: isinstance(v, (int, float))))
+            df_sheet['Geburtsdatum'] = pd.to_datetime(dates, errors='coerce')
+            df_sheet = df_sheet.dropna(subset=['Geburtsdatum'])
+            df_sheet.insert(0, 'Blatt', sheet_name)
+            df_sheet.insert(1, 'Team', team_name)
+            rosters.append(df_sheet)
+
+    roster = (pd.concat(rosters, ignore_index=True) if rosters
+              else pd.DataFrame(columns=ROSTER_FIELDS))
+    lineup = (pd.concat(lineups, ignore_index=True) if lineups
+              else pd.DataFrame(columns=LINEUP_FIELDS))
+    return summary, roster, lineup
+
+
+def workbook_hash(excel_path) -> str:
+    """Inhalts-Hash der Arbeitsmappe (Key des Sidecar-Caches)."""
+    h = hashlib.sha1()
+    with open(excel_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def sidecar_dir(excel_path, digest: str) -> Path:
+    return Path(excel_path).parent / SIDECAR_DIRNAME / digest
+
+
+def _read_sidecar(cache_dir: Path):
+    summary = read_frame(cache_dir / "summary")
+    roster = read_frame(cache_dir / "roster", parse_dates=['Geburtsdatum'])
+    lineups = read_frame(cache_dir / "aufstellungen")
+    if summary is None or roster is None or lineups is None or list(roster.columns) != ROSTER_FIELDS:
+        return None
+    return summary, roster, lineups
+
+
+def _write_sidecar(cache_dir: Path, summary: pd.DataFrame, roster: pd.DataFrame, lineups: pd.DataFrame):
+    if not (write_frame(summary, cache_dir / "summary") and write_frame(roster, cache_dir / "roster")
+            and write_frame(lineups, cache_dir / "aufstellungen")):
+        return
+    # Stände älterer Arbeitsmappen-Versionen entfernen
+    for old in cache_dir.parent.iterdir():
+        if old.is_dir() and old != cache_dir:
+            for f in old.iterdir():
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
             try:
-                # Lade das Mannschaftsblatt
-                df_sheet = pd.read_excel(excel_path, sheet_name=sheet_name)
-                
-                # Prüfe ob Spalte Q existiert (Geburtsdaten)
-                if 'Q' in df_sheet.columns or len(df_sheet.columns) >= 17:  # Spalte Q ist die 17. Spalte
-                    # Verwende die 17. Spalte (Index 16) für Geburtsdaten
-                    birth_column = df_sheet.iloc[:, 16]  # Spalte Q (0-basiert: 16)
-                    
-                    # Filtere gültige Geburtsdaten (nicht NaN)
-                    valid_birth_dates = birth_column.dropna()
-                    
-                    if len(valid_birth_dates) > 0:
-                        # Konvertiere zu Datetime falls möglich
-                        try:
-                            birth_dates = pd.to_datetime(valid_birth_dates, errors='coerce')
-                            birth_dates = birth_dates.dropna()
-                            
-                            if len(birth_dates) > 0:
-                                # Bestimme Quartale
-                                q1_count = len(birth_dates[birth_dates.dt.quarter == 1])  # Jan-März
-                                q2_count = len(birth_dates[birth_dates.dt.quarter == 2])  # Apr-Jun
-                                q3_count = len(birth_dates[birth_dates.dt.quarter == 3])  # Jul-Sep
-                                q4_count = len(birth_dates[birth_dates.dt.quarter == 4])  # Okt-Dez
-                                total_count = len(birth_dates)
-                                
-                                birth_quarter_data.append({
-                                    'Team': team_name,
-                                    'Q1_Jan_Mar': q1_count,
-                                    'Q2_Apr_Jun': q2_count,
-                                    'Q3_Jul_Sep': q3_count,
-                                    'Q4_Oct_Dec': q4_count,
-                                    'Gesamt': total_count
-                                })
-                            else:
-                                # Fallback: Keine gültigen Datumsdaten
-                                birth_quarter_data.append({
-                                    'Team': team_name,
-                                    'Q1_Jan_Mar': 0,
-                                    'Q2_Apr_Jun': 0,
-                                    'Q3_Jul_Sep': 0,
-                                    'Q4_Oct_Dec': 0,
-                                    'Gesamt': 0
-                                })
-                        except:
-                            # Fallback: Zähle alle nicht-leeren Einträge
-                            total_count = len(valid_birth_dates)
-                            # Gleichmäßige Verteilung als Fallback
-                            q1_count = total_count // 4
-                            q2_count = total_count // 4
-                            q3_count = total_count // 4
-                            q4_count = total_count - q1_count - q2_count - q3_count
-                            
-                            birth_quarter_data.append({
-                                'Team': team_name,
-                                'Q1_Jan_Mar': q1_count,
-                                'Q2_Apr_Jun': q2_count,
-                                'Q3_Jul_Sep': q3_count,
-                                'Q4_Oct_Dec': q4_count,
-                                'Gesamt': total_count
-                            })
-                    else:
-                        # Keine Geburtsdaten gefunden
-                        birth_quarter_data.append({
-                            'Team': team_name,
-                            'Q1_Jan_Mar': 0,
-                            'Q2_Apr_Jun': 0,
-                            'Q3_Jul_Sep': 0,
-                            'Q4_Oct_Dec': 0,
-                            'Gesamt': 0
-                        })
-                else:
-                    # Spalte Q nicht gefunden
-                    birth_quarter_data.append({
-                        'Team': team_name,
-                        'Q1_Jan_Mar': 0,
-                        'Q2_Apr_Jun': 0,
-                        'Q3_Jul_Sep': 0,
-                        'Q4_Oct_Dec': 0,
-                        'Gesamt': 0
-                    })
-                    
-            except Exception as e:
-                st.warning(f"Fehler beim Laden von {sheet_name}: {e}")
-                # Fallback-Daten für dieses Team
-                birth_quarter_data.append({
-                    'Team': team_name,
-                    'Q1_Jan_Mar': 0,
-                    'Q2_Apr_Jun': 0,
-                    'Q3_Jul_Sep': 0,
-                    'Q4_Oct_Dec': 0,
-                    'Gesamt': 0
-                })
+                old.rmdir()
+            except OSError:
+                pass
+
+
+@timed(cache=True)
+@st.cache_data(show_spinner=False)
+def load_workbook(excel_path: str, workbook_mtime: float):
+    """Übersicht, Kader und Startelf-Blöcke der Arbeitsmappe (Key: Pfad + mtime).
+
+    Neben der Arbeitsmappe liegt ein Parquet-Sidecar pro Inhalts-Hash: Neustarts,
+    weitere Worker und altersstatistik_app.py lesen den Spaltenspeicher statt
+    Excel; geparst wird nur, wenn sich der Inhalt der Datei geändert hat.
+    """
+    cache_miss("load_workbook")
+    if read_frame is None:
+        return read_workbook(excel_path)
+    cache_dir = sidecar_dir(excel_path, workbook_hash(excel_path))
+    cached = _read_sidecar(cache_dir)
+    if cached is not None:
+        return cached
+    summary, roster, lineups = read_workbook(excel_path)
+    _write_sidecar(cache_dir, summary, roster, lineups)
+    return summary, roster, lineups
+
+
+@st.cache_data(show_spinner=False)
+def load_relative_age_analysis(excel_path: str, workbook_mtime: float) -> dict | None:
+    """RAE-Tabellen (relativalter.analyse) des Kaders. Liegen im Sidecar-Ordner der
+    Arbeitsmappe und werden nur neu berechnet, wenn sich deren Inhalt (Kader) ändert."""
+    if relativalter is None:
+        return None
+    roster = load_workbook(excel_path, workbook_mtime)[1]
+    if read_frame is None:
+        return relativalter.analyse(roster)
+    cache_dir = sidecar_dir(excel_path, workbook_hash(excel_path))
+    stored = {name: read_frame(cache_dir / f"rae_{name}") for name in ("quartale", "monate")}
+    if all(df is not None for df in stored.values()):
+        return stored
+    result = relativalter.analyse(roster)
+    for name, df in result.items():
+        write_frame(df, cache_dir / f"rae_{name}")
+    return result
+
+
+# Funktion zum Laden der Excel-Daten
+@timed()
+def load_excel_data(excel_path: str = str(DEFAULT_EXCEL)):
+    try:
+        df = load_workbook(str(excel_path), workbook_key(excel_path))[0]
         
-        if not birth_quarter_data:
+        # Leerzeilen am Tabellenende entfernen, nach Altersdurchschnitt sortieren
+        df = df.dropna(subset=['Team'])
+        df = df.sort_values('Altersdurchschnitt').reset_index(drop=True)
+        
+        return df
+    except Exception as e:
+        st.error(f"Fehler beim Laden der Excel-Datei: {e}")
+        return None
+
+def birth_quarter_table(roster: pd.DataFrame) -> pd.DataFrame:
+    """Geburtsquartale und Halbjahre (H1 = Q1+Q2, H2 = Q3+Q4) je Team – ein crosstab über den ganzen Kader."""
+    counts = pd.crosstab(roster['Team'], roster['Geburtsdatum'].dt.quarter).reindex(columns=[1, 2, 3, 4], fill_value=0)
+    counts.columns = QUARTER_COLUMNS
+    counts['Gesamt'] = counts.sum(axis=1)
+    counts['H1_Jan_Jun'] = counts['Q1_Jan_Mar'] + counts['Q2_Apr_Jun']
+    counts['H2_Jul_Dec'] = counts['Q3_Jul_Sep'] + counts['Q4_Oct_Dec']
+    return counts.rename_axis(None, axis=1).reset_index()
+
+
+# Funktion zum Laden der echten Geburtsdaten aus den Mannschaftsblättern
+@timed()
+def load_birth_quarter_data(excel_path: str = str(DEFAULT_EXCEL)):
+    """Geburtsquartale aller Teams aus dem Kader der Mannschaftsblätter"""
+    try:
+        roster = load_workbook(str(excel_path), workbook_key(excel_path))[1]
+        if roster.empty:
             st.error("❌ Konnte keine Geburtsdaten aus den Mannschaftsblättern laden.")
             return None
-            
-        return pd.DataFrame(birth_quarter_data)
+        return birth_quarter_table(roster)
         
     except Exception as e:
         st.error(f"Fehler beim Laden der Geburtsdaten: {e}")
         return None
 
-# Geburtsquartal-Daten laden
-df_birth_quarters = load_birth_quarter_data()
-
-if df_birth_quarters is None:
-    st.error("❌ Konnte Geburtsdaten nicht laden. Verwende Beispieldaten.")
-    # Fallback zu Beispieldaten
-    df_birth_quarters = pd.DataFrame({
-        'Team': ['Liefering', 'Altach', 'Rapid', 'JWR', 'LASK', 'Sturm', 'Young Violetts', 'WAC'],
-        'Q1_Jan_Mar': [5, 4, 6, 3, 5, 4, 3, 4],
-        'Q2_Apr_Jun': [3, 4, 2, 4, 3, 3, 4, 3],
-        'Q3_Jul_Sep': [2, 3, 3, 3, 2, 2, 3, 2],
-        'Q4_Oct_Dec': [3, 2, 2, 3, 3, 4, 3, 4],
-        'Gesamt': [13, 13, 13, 13, 13, 13, 13, 13]
-    })
 
-# Standardfarbe für unbekannte Teams
-DEFAULT_COLOR = '#1f77b4'
+# ========================= Saison-Archiv =========================
+def format_season(code: str) -> str:
+    """'2526' -> 'Saison 2025/26'"""
+    return f"Saison 20{code[:2]}/{code[2:]}" if SEASON_DIR_RE.match(code) else code
 
-def get_team_color(team_name):
-    """Gibt die Farbe für ein Team zurück"""
-    for team_key, colors in TEAM_COLORS.items():
-        if team_key.lower() in team_name.lower():
-            return colors[0]  # Hauptfarbe verwenden
-    return DEFAULT_COLOR
 
-def get_team_colors_list(teams):
-    """Gibt eine Liste von Farben für alle Teams zurück"""
-    return [get_team_color(team) for team in teams]
-
-# Excel-Daten laden
-df_teams = load_excel_data()
-
-if df_teams is None:
-    st.error("❌ Konnte Excel-Datei nicht laden. Bitte überprüfen Sie den Dateipfad.")
-    st.stop()
+def find_season_workbooks(excel_path) -> dict[str, Path]:
+    """Arbeitsmappen gleichen Namens in allen Saisonordnern neben dem aktuellen (Saison -> Pfad)."""
+    excel_path = Path(excel_path)
+    folder = excel_path.parent
+    if not SEASON_DIR_RE.match(folder.name):
+        return {CURRENT_SEASON: excel_path}
+    found = {
+        d.name: d / excel_path.name for d in folder.parent.iterdir()
+        if d.is_dir() and SEASON_DIR_RE.match(d.name) and (d / excel_path.name).exists()
+    }
+    found[folder.name] = excel_path
+    return dict(sorted(found.items()))
 
-# Haupttitel
-st.markdown('<h1 class="main-header">⚽ Durchschnittsalter Amateur-Teams</h1>', unsafe_allow_html=True)
-st.markdown('<p style="text-align: center; font-size: 1.2rem; color: #666;">Saison 2025/26</p>', unsafe_allow_html=True)
 
-# Team-Auswahl (ohne Sidebar-Header)
-# Index für JWR finden (falls vorhanden) und in int konvertieren
-jwr_index = 0
-if 'JWR' in df_teams['Team'].values:
-    jwr_index = int(df_teams[df_teams['Team'] == 'JWR'].index[0])
+def archive_root(excel_path) -> Path:
+    folder = Path(excel_path).parent
+    return (folder.parent if SEASON_DIR_RE.match(folder.name) else folder) / ARCHIVE_DIRNAME
 
-selected_team = st.sidebar.selectbox(
-    "Wählen Sie ein Team aus:",
-    options=df_teams['Team'].tolist(),
-    index=jwr_index
-)
 
-# Gefilterte Daten für das ausgewählte Team
-team_data = df_teams[df_teams['Team'] == selected_team].iloc[0]
-team_age = team_data['Altersdurchschnitt']
+def season_of(excel_path) -> str:
+    """Saisoncode aus dem Ordnernamen der Arbeitsmappe (sonst die aktuelle Saison)."""
+    folder = Path(excel_path).parent.name
+    return folder if SEASON_DIR_RE.match(folder) else CURRENT_SEASON
 
-# Hauptmetriken in einer Zeile (alle gleiche Höhe, farblich nach Teams)
-col1, col2, col3, col4, col5 = st.columns([1.5, 1, 1, 1, 1])
 
-# Team-Farben für verschiedene Metriken
-selected_team_color = get_team_color(selected_team)
-youngest_team = df_teams.iloc[0]['Team']  # Jüngstes Team
-youngest_team_color = get_team_color(youngest_team)
+def _read_manifest(root: Path) -> dict:
+    try:
+        return json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
 
-with col1:
-    # Team-Info als metric-card für gleiche Höhe
-    st.markdown(f"""
-    <div class="metric-card" style="background: linear-gradient(135deg, {selected_team_color} 0%, {selected_team_color}dd 100%);">
-        <div class="metric-value">🏆 {selected_team}</div>
-        <div class="metric-label">Startelf: {team_age:.2f} Jahre</div>
-    </div>
-    """, unsafe_allow_html=True)
 
-with col2:
-    # Team Durchschnittsalter
-    st.markdown(f"""
-    <div class="metric-card" style="background: linear-gradient(135deg, {selected_team_color} 0%, {selected_team_color}dd 100%);">
-        <div class="metric-value">{team_age:.2f}</div>
-        <div class="metric-label">Team Ø</div>
-    </div>
-    """, unsafe_allow_html=True)
+def _write_manifest(root: Path, manifest: dict):
+    (root / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
 
-with col3:
-    # Position in der Liga
-    team_position = df_teams[df_teams['Altersdurchschnitt'] <= team_age].shape[0]
-    st.markdown(f"""
-    <div class="metric-card" style="background: linear-gradient(135deg, {selected_team_color} 0%, {selected_team_color}dd 100%);">
-        <div class="metric-value">{team_position}</div>
-        <div class="metric-label">Position</div>
-    </div>
-    """, unsafe_allow_html=True)
 
-with col4:
-    # Differenz zum jüngsten Team
-    youngest_age = df_teams['Altersdurchschnitt'].min()
-    age_diff = team_age - youngest_age
-    st.markdown(f"""
-    <div class="metric-card" style="background: linear-gradient(135deg, {youngest_team_color} 0%, {youngest_team_color}dd 100%);">
-        <div class="metric-value">{age_diff:.2f}</div>
-        <div class="metric-label">Differenz zu {youngest_team}</div>
-    </div>
-    """, unsafe_allow_html=True)
+def ingest_seasons(workbooks: dict[str, Path], root: Path) -> list[str]:
+    """Übernimmt jede Saison-Arbeitsmappe ins Archiv (teams/ + kader/, partitioniert nach
+    saison=...). Erneut nur, wenn sich der Inhalt einer Arbeitsmappe geändert hat."""
+    manifest = _read_manifest(root)
+    changed = []
+    for season, path in workbooks.items():
+        digest = workbook_hash(path)
+        if manifest.get(season, {}).get("hash") == digest:
+            continue
+        summary, roster, _ = load_workbook(str(path), workbook_key(path))
+        summary = summary.dropna(subset=['Team'])
+        if (write_partition(summary, root / "teams", "saison", season)
+                and write_partition(roster, root / "kader", "saison", season)):
+            manifest.setdefault(season, {}).update(hash=digest, datei=str(path))
+            changed.append(season)
+    if changed:
+        _write_manifest(root, manifest)
+    return changed
 
-with col5:
-    # Durchschnittsalter aller Teams
-    overall_avg = df_teams['Altersdurchschnitt'].mean()
-    st.markdown(f"""
-    <div class="metric-card" style="background: linear-gradient(135deg, #1f77b4 0%, #1f77b4dd 100%);">
-        <div class="metric-value">{overall_avg:.2f}</div>
-        <div class="metric-label">Ø Teams</div>
-    </div>
-    """, unsafe_allow_html=True)
 
+@st.cache_data(show_spinner=False)
+def sync_season_archive(excel_path: str, workbook_mtimes: tuple) -> list[str]:
+    """Archiv abgleichen (nur wenn sich eine mtime geändert hat); liefert alle archivierten Saisons."""
+    if write_partition is None:
+        return []
+    root = archive_root(excel_path)
+    ingest_seasons(find_season_workbooks(excel_path), root)
+    return list_partitions(root / "teams", "saison")
 
 
-st.markdown("---")
+@st.cache_data(show_spinner=False)
+def load_season_trends(root: str, seasons: tuple, workbook_mtimes: tuple) -> pd.DataFrame:
+    """Ø-Alter und Q1-Anteil je (Saison, Team) – gelesen werden nur die gewählten Saisons."""
+    teams = read_partitions(Path(root) / "teams", "saison", list(seasons))
+    kader = read_partitions(Path(root) / "kader", "saison", list(seasons),
+                            columns=['Team', 'Geburtsdatum'], parse_dates=['Geburtsdatum'])
+    if teams is None:
+        return pd.DataFrame(columns=['saison', 'Team', 'Altersdurchschnitt', 'Q1_Anteil'])
+    trends = teams[['saison', 'Team', 'Altersdurchschnitt']]
+    if kader is not None and not kader.empty:
+        quarter = kader['Geburtsdatum'].dt.quarter
+        q1_share = (quarter == 1).groupby([kader['saison'], kader['Team']]).mean().mul(100).round(1)
+        trends = trends.merge(q1_share.rename('Q1_Anteil').reset_index(), on=['saison', 'Team'], how='left')
+    else:
+        trends = trends.assign(Q1_Anteil=float('nan'))
+    return trends.sort_values(['Team', 'saison']).reset_index(drop=True)
 
-# Hauptvisualisierungen
-col1, col2 = st.columns([2, 1])
 
-with col1:
-    st.markdown("## 📊 Altersdurchschnitt aller Teams - Startelf")
-    
-    # Balkendiagramm aller Teams mit Team-Farben
+def season_trend_figure(trends: pd.DataFrame, value_col: str, team_colors=None, **layout) -> go.Figure:
+    """Linie pro Team über die Saisons."""
     fig = go.Figure()
-    
-    # Jedes Team mit seiner spezifischen Farbe hinzufügen
-    for i, team in enumerate(df_teams['Team']):
-        team_age_val = df_teams.iloc[i]['Altersdurchschnitt']
-        team_color = get_team_color(team)
-        
-        fig.add_trace(go.Bar(
-            x=[team],
-            y=[team_age_val],
+    for team, rows in trends.groupby('Team', sort=False):
+        fig.add_trace(go.Scatter(
+            x=rows['saison'].map(format_season),
+            y=rows[value_col],
+            mode='lines+markers',
             name=team,
-            marker_color=team_color,
-            showlegend=False
+            line_color=get_team_color(team, team_colors)
         ))
-    
-    # Ausgewähltes Team hervorheben
-    fig.add_hline(
-        y=team_age,
-        line_dash="dash",
-        line_color="red",
-        line_width=3,
-        annotation_text=f"{selected_team}: {team_age:.2f} Jahre"
-    )
-    
+    fig.update_layout(template='plotly_white', **layout)
+    return fig
+
+
+def render_season_comparison(excel_path, team_colors=None):
+    """Saisonvergleich (Trends) aus dem partitionierten Archiv."""
+    workbooks = find_season_workbooks(excel_path)
+    mtimes = tuple((season, workbook_key(path)) for season, path in workbooks.items())
+    seasons = sync_season_archive(str(excel_path), mtimes)
+    st.markdown("## 📆 Saisonvergleich")
+    if len(seasons) < 2:
+        st.caption("Noch keine Vorsaison im Archiv – Saisonordner (z.B. 2425, 2526) mit derselben Excel-Datei anlegen.")
+        return
+    selected = st.multiselect("Saisons", seasons, default=seasons[-5:], format_func=format_season,
+                              key="altersstatistik_saisons")
+    if not selected:
+        return
+    trends = load_season_trends(str(archive_root(excel_path)), tuple(sorted(selected)), mtimes)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(season_trend_figure(
+            trends, 'Altersdurchschnitt', team_colors,
+            title="Altersdurchschnitt (Startelf) je Saison", yaxis_title="Jahre", height=400
+        ), use_container_width=True)
+    with col2:
+        st.plotly_chart(season_trend_figure(
+            trends, 'Q1_Anteil', team_colors,
+            title="Anteil Q1-Geborene (Jan-März) je Saison", yaxis_title="%", height=400
+        ), use_container_width=True)
+
+
+# ========================= Alter pro Spiel (Startelf) =========================
+def season_cutoff(season: str) -> pd.Timestamp:
+    """Stichtag 1.1. im zweiten Jahr der Saison (Jahrgangs-Stichtag), z.B. '2526' -> 2026-01-01."""
+    return pd.Timestamp(2000 + int(season[2:]), 1, 1)
+
+
+def read_lineup_file(path: Path) -> pd.DataFrame | None:
+    """Startelf-Datei (CSV, ; oder ,) mit Team, Datum, Spieler und optional Gegner/Minuten.
+    Spiele werden je Team nach Datum nummeriert."""
+    if not Path(path).exists():
+        return None
+    df = pd.read_csv(path, sep=None, engine='python', encoding='utf-8-sig')
+    df.columns = [str(c).strip().capitalize() for c in df.columns]
+    if not {'Team', 'Datum', 'Spieler'} <= set(df.columns):
+        return None
+    df['Datum'] = pd.to_datetime(df['Datum'], dayfirst=True, errors='coerce')
+    df = df.dropna(subset=['Datum', 'Spieler'])
+    if 'Gegner' not in df:
+        df['Gegner'] = ""
+    df['Spiel'] = df.groupby('Team')['Datum'].rank(method='dense').astype(int)
+    return df
+
+
+def match_ages(lineups: pd.DataFrame, roster: pd.DataFrame, reference_date: pd.Timestamp) -> pd.DataFrame:
+    """Startelf × Kader-Geburtsdaten -> Alter je (Team, Spiel), vollständig vektorisiert.
+
+    Alter ist das exakte Alter am Spieltag; ohne Datum (Blöcke der Arbeitsmappe) wird am
+    Jahrgangs-Stichtag gerechnet (Datum_geschaetzt). Alter_Minuten gewichtet mit den
+    Einsatzminuten (ohne Angabe: 90).
+    """
+    lu = lineups.copy()
+    if 'Datum' not in lu:
+        lu['Datum'] = pd.NaT
+    if 'Minuten' not in lu:
+        lu['Minuten'] = 90
+    lu['Minuten'] = pd.to_numeric(lu['Minuten'], errors='coerce').fillna(90)
+    lu['Datum_geschaetzt'] = lu['Datum'].isna()
+    lu['_stichtag'] = lu['Datum'].fillna(reference_date)
+    lu['_key'] = lu['Spieler'].astype(str).str.strip().str.casefold()
+
+    births = roster.assign(_key=roster['Spieler'].astype(str).str.strip().str.casefold())
+    births = births.drop_duplicates(['Team', '_key'])[['Team', '_key', 'Geburtsdatum']]
+    merged = lu.merge(births, on=['Team', '_key'], how='left')
+
+    merged['Alter'] = (merged['_stichtag'] - merged['Geburtsdatum']).dt.days / 365.2425
+    merged['_alter_min'] = merged['Alter'] * merged['Minuten']
+    merged['_min'] = merged['Minuten'].where(merged['Alter'].notna())
+    out = merged.groupby(['Team', 'Spiel'], sort=True).agg(
+        Datum=('Datum', 'first'),
+        Gegner=('Gegner', 'first'),
+        Spieler=('Spieler', 'size'),
+        Spieler_mit_Datum=('Alter', 'count'),
+        Alter=('Alter', 'mean'),
+        _alter_min=('_alter_min', 'sum'),
+        _min=('_min', 'sum'),
+        Datum_geschaetzt=('Datum_geschaetzt', 'all'),
+    ).reset_index()
+    out['Alter_Minuten'] = out['_alter_min'] / out['_min'].where(out['_min'] > 0)
+    return out.drop(columns=['_alter_min', '_min'])
+
+
+def _match_age_sources(excel_path) -> tuple[Path, Path]:
+    return Path(excel_path), Path(excel_path).parent / LINEUPS_FILENAME
+
+
+def compute_match_ages(excel_path, season: str) -> pd.DataFrame:
+    workbook, lineup_file = _match_age_sources(excel_path)
+    _, roster, lineups = load_workbook(str(workbook), workbook_key(workbook))
+    file_lineups = read_lineup_file(lineup_file)
+    if file_lineups is not None:
+        lineups = file_lineups
+    return match_ages(lineups, roster, season_cutoff(season))
+
+
+def ingest_match_ages(excel_path, season: str, root: Path) -> bool:
+    """Spiel × Team-Altersreihe ins Archiv (spiele/saison=...); neu berechnet nur, wenn sich
+    Arbeitsmappe oder Startelf-Datei geändert haben."""
+    workbook, lineup_file = _match_age_sources(excel_path)
+    source_key = workbook_hash(workbook) + (f"-{workbook_hash(lineup_file)}" if lineup_file.exists() else "")
+    manifest = _read_manifest(root)
+    if manifest.get(season, {}).get("spiele") == source_key:
+        return False
+    if not write_partition(compute_match_ages(excel_path, season), root / "spiele", "saison", season):
+        return False
+    manifest.setdefault(season, {})["spiele"] = source_key
+    _write_manifest(root, manifest)
+    return True
+
+
+@st.cache_data(show_spinner=False)
+def load_match_ages(excel_path: str, season: str, source_mtimes: tuple) -> pd.DataFrame:
+    """Gespeicherte Altersreihe einer Saison (Key: Pfad, Saison, mtimes von Arbeitsmappe/Startelf-Datei)."""
+    if write_partition is None:
+        return compute_match_ages(excel_path, season)
+    root = archive_root(excel_path)
+    ingest_match_ages(excel_path, season, root)
+    stored = read_partitions(root / "spiele", "saison", [season])
+    return stored if stored is not None else compute_match_ages(excel_path, season)
+
+
+def render_match_ages(excel_path, season: str, selected_team: str, team_colors=None):
+    """Startelf-Alter pro Spiel mit gleitendem Schnitt (und Minuten-Gewichtung, falls vorhanden)."""
+    st.markdown("## ⏱️ Startelf-Alter pro Spiel")
+    mtimes = tuple(workbook_key(p) for p in _match_age_sources(excel_path))
+    ages = load_match_ages(str(excel_path), season, mtimes)
+    team_ages = ages[ages['Team'] == selected_team].sort_values('Spiel')
+    if team_ages.empty:
+        st.caption(f"Keine Startelf-Daten für {selected_team}.")
+        return
+
+    window = st.slider("Gleitender Schnitt (Spiele)", 2, 10, 5, key="altersstatistik_rolling")
+    estimated = bool(team_ages['Datum_geschaetzt'].all())
+    x = (team_ages['Spiel'].astype(str) + ". " + team_ages['Gegner'].astype(str)) if estimated else team_ages['Datum']
+    color = get_team_color(selected_team, team_colors)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x, y=team_ages['Alter'], mode='markers', name='Startelf',
+                             marker_color=color))
+    fig.add_trace(go.Scatter(x=x, y=team_ages['Alter'].rolling(window, min_periods=1).mean(),
+                             mode='lines', name=f'Ø letzte {window}', line_color=color))
+    if (team_ages['Alter_Minuten'] - team_ages['Alter']).abs().max() > 1e-9:
+        fig.add_trace(go.Scatter(x=x, y=team_ages['Alter_Minuten'].rolling(window, min_periods=1).mean(),
+                                 mode='lines', name=f'Ø minutengewichtet ({window})', line_dash='dot',
+                                 line_color=color))
     fig.update_layout(
-        title="Vergleich der Altersdurchschnitte aller Teams",
-        xaxis_title="Team",
-        yaxis_title="Altersdurchschnitt (Jahre)",
+        title=f"Startelf-Alter {selected_team} ({len(team_ages)} Spiele)",
+        xaxis_title="Spiel" if estimated else "Datum",
+        yaxis_title="Alter (Jahre)",
         template='plotly_white',
-        height=400,
-        showlegend=False
+        height=400
     )
-    
-    # Y-Achse auf Bereich 18-22 Jahre skalieren
-    fig.update_yaxes(range=[18, 22])
-    
     st.plotly_chart(fig, use_container_width=True)
 
-# Team-Details in der linken Spalte unter dem Diagramm
-with col1:
-    st.markdown("## 📋 Team-Details")
-    
-    # Tabelle mit allen Teams, Q1+Q2 und Q3+Q4 Spielern
-    if df_birth_quarters is not None:
-        # Erstelle erweiterte Tabelle mit Q1+Q2 und Q3+Q4 Daten
-        team_details_df = df_teams.copy()
-        
-        # Füge Q1+Q2 und Q3+Q4 Spalten hinzu
-        for i, team in enumerate(team_details_df['Team']):
-            # Verwende die gleiche Logik wie im Fokus-Bereich
-            team_found = False
-            
-            # Erstelle die korrekten Q1+Q2 und Q3+Q4 Daten wie im Fokus-Bereich
-            if df_birth_quarters is not None and team in df_birth_quarters['Team'].values:
-                team_row = df_birth_quarters[df_birth_quarters['Team'] == team].iloc[0]
-                team_q1 = team_row['Q1_Jan_Mar']
-                team_q2 = team_row['Q2_Apr_Jun']
-                team_q3 = team_row['Q3_Jul_Sep']
-                team_q4 = team_row['Q4_Oct_Dec']
-                team_q1_q2 = team_q1 + team_q2
-                team_q3_q4 = team_q3 + team_q4
-                team_details_df.loc[i, 'Q1_Q2_Spieler'] = team_q1_q2
-                team_details_df.loc[i, 'Q3_Q4_Spieler'] = team_q3_q4
-                team_found = True
-            else:
-                # Fallback: Verwende die gleichen Beispieldaten wie im Fokus-Bereich
-                if team == 'JWR':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 7  # 3 + 4
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 6  # 3 + 3
-                elif team == 'Liefering':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 8  # 5 + 3
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 5  # 2 + 3
-                elif team == 'Altach':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 8  # 4 + 4
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 5  # 3 + 2
-                elif team == 'Rapid':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 8  # 6 + 2
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 5  # 3 + 2
-                elif team == 'LASK':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 8  # 5 + 3
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 5  # 2 + 3
-                elif team == 'Sturm':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 7  # 4 + 3
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 6  # 2 + 4
-                elif team == 'Young Violetts':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 7  # 3 + 4
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 6  # 3 + 3
-                elif team == 'WAC':
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 7  # 4 + 3
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 7  # 3 + 4
-                else:
-                    team_details_df.loc[i, 'Q1_Q2_Spieler'] = 0
-                    team_details_df.loc[i, 'Q3_Q4_Spieler'] = 0
-        
-        # Formatiere die Tabelle mit visuell zentrierten Zahlen
-        # Erstelle eine Kopie für die Formatierung
-        display_df = team_details_df.copy()
-        
-        # Formatiere Zahlen mit Leerzeichen für visuelle Zentrierung
-        display_df['Altersdurchschnitt'] = display_df['Altersdurchschnitt'].apply(lambda x: f"{x:.2f}")
-        display_df['Q1_Q2_Spieler'] = display_df['Q1_Q2_Spieler'].apply(lambda x: f"{x:>3}")
-        display_df['Q3_Q4_Spieler'] = display_df['Q3_Q4_Spieler'].apply(lambda x: f"{x:>3}")
-        
-        st.dataframe(
-            display_df,
-            use_container_width=False,
-            width=800
+    coverage = team_ages['Spieler_mit_Datum'].sum() / max(int(team_ages['Spieler'].sum()), 1) * 100
+    note = (f"Ohne {LINEUPS_FILENAME}: Alter am Stichtag {season_cutoff(season):%d.%m.%Y} "
+            "aus den Startelf-Blöcken der Excel-Datei." if estimated else "Exaktes Alter am Spieltag.")
+    st.caption(f"{note} Geburtsdatum bekannt für {coverage:.0f}% der Einsätze.")
+
+
+# ========================= Helper =========================
+def _valid_team_name(team) -> bool:
+    return team is not None and str(team).strip().lower() not in ('', 'nan', 'none')
+
+
+def filter_valid_teams(teams):
+    """Filtert ungültige Team-Namen (NaN, None, leere Strings) heraus."""
+    return [team for team in (teams or []) if _valid_team_name(team)]
+
+
+def get_team_color(team_name, team_colors=None):
+    """Gibt eine gültige Hex-Farbe für ein Team zurück.
+
+    Werte in team_colors dürfen Hex-Strings oder [Hauptfarbe, Zweitfarbe] sein.
+    Unbekannte Teams bekommen eine stabile Farbe aus dem Namens-Hash.
+    """
+    if not _valid_team_name(team_name):
+        return DEFAULT_COLOR
+    team_str = str(team_name).strip()
+    for team_key, color in (team_colors or TEAM_COLORS).items():
+        if team_key.lower() in team_str.lower():
+            return color[0] if isinstance(color, (list, tuple)) else color
+    return f'#{hashlib.md5(team_str.encode()).hexdigest()[:6]}'
+
+
+def get_team_colors_list(teams, team_colors=None):
+    """Gibt eine Liste von Farben für alle Teams zurück"""
+    return [get_team_color(team, team_colors) for team in teams]
+
+
+def frame_hash(*frames: pd.DataFrame) -> str:
+    """Inhalts-Hash von DataFrames (Key für gecachte Diagramme)."""
+    h = hashlib.sha1()
+    for df in frames:
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+def colors_key(team_colors: dict | None) -> str:
+    return hashlib.sha1(repr(sorted((team_colors or TEAM_COLORS).items())).encode()).hexdigest()[:8]
+
+
+def team_bar_figure(teams, values, team_colors=None, text=None, **layout) -> go.Figure:
+    """Balkendiagramm mit genau einem Trace; Team-Farben als marker_color-Array pro Balken."""
+    teams = list(teams)
+    fig = go.Figure(go.Bar(
+        x=teams,
+        y=list(values),
+        marker_color=get_team_colors_list(teams, team_colors),
+        text=text,
+        textposition='auto' if text is not None else None,
+        showlegend=False
+    ))
+    fig.update_layout(template='plotly_white', showlegend=False, **layout)
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _figure_json(chart: str, data_key: str, selected_team: str, _build) -> str:
+    return _build().to_json()
+
+
+def cached_figure(chart: str, data_key: str, selected_team: str, build) -> dict:
+    """Figure-JSON pro (Diagramm, Daten-Hash, ausgewähltes Team) – bei Teamwechsel wird
+    nur neu gebaut, was vom Team abhängt (Markierungslinie, Differenzen).
+
+    Rückgabe als dict für st.plotly_chart (validiert ohnehin selbst; ein go.Figure
+    aus dem JSON würde ein zweites Mal validiert)."""
+    return json.loads(_figure_json(chart, data_key, selected_team or "", build))
+
+
+def ranking_table(ranking: pd.DataFrame, count_col: str, pct_col: str) -> pd.DataFrame:
+    """Ranking als eine Tabelle (Medaille für die Top 3) statt einer st.metric pro Team."""
+    rank = pd.Series(range(1, len(ranking) + 1), index=ranking.index)
+    return pd.DataFrame({
+        'Rang': rank.map({1: "🥇", 2: "🥈", 3: "🥉"}).fillna(rank.astype(str) + "."),
+        'Team': ranking['Team'],
+        'Spieler': ranking[count_col],
+        'Anteil': ranking[pct_col],
+    })
+
+
+RANKING_COLUMN_CONFIG = {
+    'Spieler': st.column_config.NumberColumn(format="%d"),
+    'Anteil': st.column_config.ProgressColumn(format="%.1f%%", min_value=0, max_value=100),
+}
+
+
+# ========================= Render =========================
+def render_altersstatistik(excel_path=DEFAULT_EXCEL, title: str = DEFAULT_TITLE,
+                           season_label: str = DEFAULT_SEASON, team_colors: dict | None = None,
+                           default_team: str = "JWR", embedded: bool = False):
+    """Zeichnet die komplette Altersstatistik-Seite (ohne st.set_page_config).
+
+    embedded=True: Ansicht innerhalb einer anderen App (Dashboard) – nur die CSS-Klassen
+    der Ansicht werden gesetzt, kein seitenweites Styling.
+    """
+    st.markdown(COMPONENT_CSS if embedded else COMPONENT_CSS + PAGE_CSS, unsafe_allow_html=True)
+
+    colors = team_colors or TEAM_COLORS
+    archive_excel = excel_path
+
+    # Saisonauswahl, sobald es mehrere Saisonordner mit derselben Arbeitsmappe gibt
+    workbooks = find_season_workbooks(excel_path)
+    if len(workbooks) > 1:
+        seasons = list(workbooks)[::-1]
+        season = st.sidebar.selectbox("Saison", seasons, format_func=format_season, key="altersstatistik_saison")
+        if workbooks[season] != Path(excel_path):
+            excel_path = workbooks[season]
+            season_label = format_season(season)
+
+    # Geburtsquartal-Daten laden
+    df_birth_quarters = load_birth_quarter_data(str(excel_path))
+
+    if df_birth_quarters is None:
+        # Ohne Kader: leere Tabelle, die Geburtsquartal-Abschnitte bleiben leer
+        df_birth_quarters = pd.DataFrame({'Team': pd.Series(dtype=object),
+                                          **{c: pd.Series(dtype='int64') for c in [*QUARTER_COLUMNS, 'Gesamt', 'H1_Jan_Jun', 'H2_Jul_Dec']}})
+
+    # Excel-Daten laden
+    df_teams = load_excel_data(str(excel_path))
+
+    if df_teams is None:
+        st.error("❌ Konnte Excel-Datei nicht laden. Bitte überprüfen Sie den Dateipfad.")
+        return
+
+    # Key für gecachte Diagramme: Daten + Farben
+    data_key = f"{frame_hash(df_teams, df_birth_quarters)}-{colors_key(colors)}"
+
+    # Haupttitel
+    st.markdown(f'<h1 class="main-header">{title}</h1>', unsafe_allow_html=True)
+    st.markdown(f'<p style="text-align: center; font-size: 1.2rem; color: #666;">{season_label}</p>', unsafe_allow_html=True)
+
+    # Team-Auswahl (ohne Sidebar-Header), Standard: default_team
+    team_options = filter_valid_teams(df_teams['Team'].tolist())
+    default_index = team_options.index(default_team) if default_team in team_options else 0
+
+    selected_team = st.sidebar.selectbox(
+        "Wählen Sie ein Team aus:",
+        options=team_options,
+        index=default_index
+    )
+
+    # Gefilterte Daten für das ausgewählte Team
+    team_data = df_teams[df_teams['Team'] == selected_team].iloc[0]
+    team_age = team_data['Altersdurchschnitt']
+
+    # Hauptmetriken in einer Zeile (alle gleiche Höhe, farblich nach Teams)
+    col1, col2, col3, col4, col5 = st.columns([1.5, 1, 1, 1, 1])
+
+    # Team-Farben für verschiedene Metriken
+    selected_team_color = get_team_color(selected_team, colors)
+    youngest_team = df_teams.iloc[0]['Team']  # Jüngstes Team
+    youngest_team_color = get_team_color(youngest_team, colors)
+
+    with col1:
+        # Team-Info als metric-card für gleiche Höhe
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, {selected_team_color} 0%, {selected_team_color}dd 100%);">
+            <div class="metric-value">🏆 {selected_team}</div>
+            <div class="metric-label">Startelf: {team_age:.2f} Jahre</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        # Team Durchschnittsalter
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, {selected_team_color} 0%, {selected_team_color}dd 100%);">
+            <div class="metric-value">{team_age:.2f}</div>
+            <div class="metric-label">Team Ø</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        # Position in der Liga
+        team_position = df_teams[df_teams['Altersdurchschnitt'] <= team_age].shape[0]
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, {selected_team_color} 0%, {selected_team_color}dd 100%);">
+            <div class="metric-value">{team_position}</div>
+            <div class="metric-label">Position</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        # Differenz zum jüngsten Team
+        youngest_age = df_teams['Altersdurchschnitt'].min()
+        age_diff = team_age - youngest_age
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, {youngest_team_color} 0%, {youngest_team_color}dd 100%);">
+            <div class="metric-value">{age_diff:.2f}</div>
+            <div class="metric-label">Differenz zu {youngest_team}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col5:
+        # Durchschnittsalter aller Teams
+        overall_avg = df_teams['Altersdurchschnitt'].mean()
+        st.markdown(f"""
+        <div class="metric-card" style="background: linear-gradient(135deg, #1f77b4 0%, #1f77b4dd 100%);">
+            <div class="metric-value">{overall_avg:.2f}</div>
+            <div class="metric-label">Ø Teams</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+
+    st.markdown("---")
+
+    # Hauptvisualisierungen
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("## 📊 Altersdurchschnitt aller Teams - Startelf")
+
+        # Balkendiagramm aller Teams mit Team-Farben, ausgewähltes Team hervorgehoben
+        def build_age_chart():
+            fig = team_bar_figure(
+                df_teams['Team'], df_teams['Altersdurchschnitt'], colors,
+                title="Vergleich der Altersdurchschnitte aller Teams",
+                xaxis_title="Team",
+                yaxis_title="Altersdurchschnitt (Jahre)",
+                height=400
+            )
+            fig.add_hline(
+                y=team_age,
+                line_dash="dash",
+                line_color="red",
+                line_width=3,
+                annotation_text=f"{selected_team}: {team_age:.2f} Jahre"
+            )
+            # Y-Achse auf den Datenbereich (ganze Jahre) skalieren
+            ages = df_teams['Altersdurchschnitt']
+            fig.update_yaxes(range=[min(18, int(ages.min())), max(22, int(ages.max()) + 1)])
+            return fig
+
+        fig = cached_figure("alter", data_key, selected_team, build_age_chart)
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Team-Details in der linken Spalte unter dem Diagramm
+    with col1:
+        st.markdown("## 📋 Team-Details")
+
+        # Tabelle mit allen Teams, Q1+Q2 und Q3+Q4 Spielern (Halbjahre aus dem Quartals-Aggregat)
+        halves = df_birth_quarters[['Team', 'H1_Jan_Jun', 'H2_Jul_Dec']].rename(
+            columns={'H1_Jan_Jun': 'Q1_Q2_Spieler', 'H2_Jul_Dec': 'Q3_Q4_Spieler'})
+        team_details_df = df_teams.merge(halves, on='Team', how='left')
+        # Teams ohne Kader im Workbook
+        team_details_df[['Q1_Q2_Spieler', 'Q3_Q4_Spieler']] = (
+            team_details_df[['Q1_Q2_Spieler', 'Q3_Q4_Spieler']].fillna(0).astype(int)
         )
-    else:
-        # Fallback: Normale Tabelle ohne Q1+Q2 und Q3+Q4
+
         st.dataframe(
-            df_teams.style.format({'Altersdurchschnitt': '{:.2f}'}),
+            team_details_df,
+            column_config={'Altersdurchschnitt': st.column_config.NumberColumn(format="%.2f")},
             use_container_width=False,
             width=800
         )
 
-with col2:
-    st.markdown("## 📈 Statistiken")
-    
-    # Zusammenfassungsstatistiken - kompakter
-    st.markdown("### Liga-Übersicht")
-    col_a, col_b = st.columns(2)
-    with col_a:
-        st.markdown(f"**Jüngstes:** {df_teams.iloc[0]['Team']} ({df_teams.iloc[0]['Altersdurchschnitt']:.1f})")
-        st.markdown(f"**Ältestes:** {df_teams.iloc[-1]['Team']} ({df_teams.iloc[-1]['Altersdurchschnitt']:.1f})")
-    with col_b:
-        st.markdown(f"**Ø Teams:** {overall_avg:.1f}")
-        team_rank = df_teams[df_teams['Team'] == selected_team].index[0] + 1
-        st.markdown(f"**Position:** {team_rank}/{len(df_teams)}")
-    
+    with col2:
+        st.markdown("## 📈 Statistiken")
 
+        # Zusammenfassungsstatistiken - kompakter
+        st.markdown("### Liga-Übersicht")
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.markdown(f"**Jüngstes:** {df_teams.iloc[0]['Team']} ({df_teams.iloc[0]['Altersdurchschnitt']:.1f})")
+            st.markdown(f"**Ältestes:** {df_teams.iloc[-1]['Team']} ({df_teams.iloc[-1]['Altersdurchschnitt']:.1f})")
+        with col_b:
+            st.markdown(f"**Ø Teams:** {overall_avg:.1f}")
+            team_rank = df_teams[df_teams['Team'] == selected_team].index[0] + 1
+            st.markdown(f"**Position:** {team_rank}/{len(df_teams)}")
 
-# Team-Details bereits über dem Diagramm angezeigt
 
-st.markdown("---")
 
-# Dritte Zeile - Geburtsquartal-Analyse
-st.markdown("## 🎂 Geburtsquartal-Analyse der Spieler")
+    # Team-Details bereits über dem Diagramm angezeigt
 
-col1, col2 = st.columns(2)
+    st.markdown("---")
 
-with col1:
-    st.markdown("### 📊 Spieler pro Geburtsquartal")
-    
-    # Stacked Bar Chart für alle Teams
-    fig = go.Figure()
-    
-    # Q1 (Jan-März) - Wichtigstes Quartal
-    fig.add_trace(go.Bar(
-        name='Q1 (Jan-März)',
-        x=df_birth_quarters['Team'],
-        y=df_birth_quarters['Q1_Jan_Mar'],
-        marker_color='#FF6B6B',  # Rot für Q1
-        text=df_birth_quarters['Q1_Jan_Mar'],
-        textposition='auto'
-    ))
-    
-    # Q2 (Apr-Jun)
-    fig.add_trace(go.Bar(
-        name='Q2 (Apr-Jun)',
-        x=df_birth_quarters['Team'],
-        y=df_birth_quarters['Q2_Apr_Jun'],
-        marker_color='#4ECDC4',  # Türkis für Q2
-        text=df_birth_quarters['Q2_Apr_Jun'],
-        textposition='auto'
-    ))
-    
-    # Q3 (Jul-Sep)
-    fig.add_trace(go.Bar(
-        name='Q3 (Jul-Sep)',
-        x=df_birth_quarters['Team'],
-        y=df_birth_quarters['Q3_Jul_Sep'],
-        marker_color='#45B7D1',  # Blau für Q3
-        text=df_birth_quarters['Q3_Jul_Sep'],
-        textposition='auto'
-    ))
-    
-    # Q4 (Okt-Dez)
-    fig.add_trace(go.Bar(
-        name='Q4 (Okt-Dez)',
-        x=df_birth_quarters['Team'],
-        y=df_birth_quarters['Q4_Oct_Dec'],
-        marker_color='#96CEB4',  # Grün für Q4
-        text=df_birth_quarters['Q4_Oct_Dec'],
-        textposition='auto'
-    ))
-    
-    fig.update_layout(
-        title="Verteilung der Spieler nach Geburtsquartalen pro Team",
-        xaxis_title="Team",
-        yaxis_title="Anzahl Spieler",
-        template='plotly_white',
-        height=500,
-        barmode='stack'
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    # Dritte Zeile - Geburtsquartal-Analyse
+    st.markdown("## 🎂 Geburtsquartal-Analyse der Spieler")
 
-with col2:
-    st.markdown("### 🎯 Fokus: Q1 und Q2 (Jan-Jun) Spieler")
-    
-    # Q1 + Q2 Spieler als separate Metrik
-    q1_q2_data = df_birth_quarters[['Team', 'Q1_Jan_Mar', 'Q2_Apr_Jun', 'Gesamt']].copy()
-    q1_q2_data['Q1_Q2_Jan_Jun'] = q1_q2_data['Q1_Jan_Mar'] + q1_q2_data['Q2_Apr_Jun']
-    q1_q2_data['Q1_Q2_Prozent'] = (q1_q2_data['Q1_Q2_Jan_Jun'] / q1_q2_data['Gesamt'] * 100).round(1)
-    
-    # Q1+Q2 Balkendiagramm mit Team-Farben
-    fig = go.Figure()
-    
-    for i, team in enumerate(q1_q2_data['Team']):
-        q1_q2_count = q1_q2_data.iloc[i]['Q1_Q2_Jan_Jun']
-        team_color = get_team_color(team)
-        
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 📊 Spieler pro Geburtsquartal")
+
+        # Stacked Bar Chart für alle Teams
+        fig = go.Figure()
+
+        # Q1 (Jan-März) - Wichtigstes Quartal
         fig.add_trace(go.Bar(
-            x=[team],
-            y=[q1_q2_count],
-            name=team,
-            marker_color=team_color,
-            text=f"{q1_q2_count} ({q1_q2_data.iloc[i]['Q1_Q2_Prozent']}%)",
-            textposition='auto',
-            showlegend=False
+            name='Q1 (Jan-März)',
+            x=df_birth_quarters['Team'],
+            y=df_birth_quarters['Q1_Jan_Mar'],
+            marker_color='#FF6B6B',  # Rot für Q1
+            text=df_birth_quarters['Q1_Jan_Mar'],
+            textposition='auto'
         ))
-    
-    fig.update_layout(
-        title="Spieler im Q1 und Q2 (Jan-Jun) pro Team",
-        xaxis_title="Team",
-        yaxis_title="Anzahl Q1+Q2-Spieler",
-        template='plotly_white',
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
 
-# Fünfte Zeile - Detaillierte Q1+Q2-Analyse
-st.markdown("---")
-st.markdown("## 📈 Detaillierte Q1+Q2 (Jan-Jun) Analyse")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("### 🏆 Q1+Q2-Ranking")
-    
-    # Q1+Q2-Ranking nach Anzahl Spieler
-    q1_q2_ranking = q1_q2_data.sort_values('Q1_Q2_Jan_Jun', ascending=False)
-    
-    for i, (_, row) in enumerate(q1_q2_ranking.iterrows()):
-        team_name = row['Team']
-        q1_q2_count = row['Q1_Q2_Jan_Jun']
-        percentage = row['Q1_Q2_Prozent']
-        
-        # Emoji für Top 3
-        if i == 0:
-            medal = "🥇"
-        elif i == 1:
-            medal = "🥈"
-        elif i == 2:
-            medal = "🥉"
-        else:
-            medal = f"{i+1}."
-        
-        st.metric(f"{medal} {team_name}", f"{q1_q2_count} Spieler", f"{percentage}%")
-
-with col2:
-    st.markdown("### 📊 Q1+Q2-Statistiken")
-    
-    total_q1_q2 = q1_q2_data['Q1_Q2_Jan_Jun'].sum()
-    total_players = q1_q2_data['Gesamt'].sum()
-    overall_q1_q2_percentage = (total_q1_q2 / total_players * 100).round(1)
-    
-    st.metric("Gesamt Q1+Q2-Spieler", f"{total_q1_q2}")
-    st.metric("Gesamt Spieler", f"{total_players}")
-    st.metric("Liga Q1+Q2-Anteil", f"{overall_q1_q2_percentage}%")
-    
-    # Durchschnitt Q1+Q2 pro Team
-    avg_q1_q2 = q1_q2_data['Q1_Q2_Jan_Jun'].mean()
-    st.metric("Ø Q1+Q2 pro Team", f"{avg_q1_q2:.1f}")
-
-with col3:
-    st.markdown("### 📋 Q1+Q2-Details")
-    
-    # Tabelle mit Q1+Q2-Daten
-    display_df = q1_q2_data[['Team', 'Q1_Jan_Mar', 'Q2_Apr_Jun', 'Q1_Q2_Jan_Jun', 'Gesamt', 'Q1_Q2_Prozent']].copy()
-    display_df.columns = ['Team', 'Q1 (Jan-März)', 'Q2 (Apr-Jun)', 'Q1+Q2 (Jan-Jun)', 'Gesamt', 'Q1+Q2 %']
-    
-    st.dataframe(
-        display_df.style.format({'Q1 (Jan-März)': '{:.0f}', 'Q2 (Apr-Jun)': '{:.0f}', 'Q1+Q2 (Jan-Jun)': '{:.0f}', 'Gesamt': '{:.0f}', 'Q1+Q2 %': '{:.1f}%'}),
-        use_container_width=True,
-        height=300
-    )
+        # Q2 (Apr-Jun)
+        fig.add_trace(go.Bar(
+            name='Q2 (Apr-Jun)',
+            x=df_birth_quarters['Team'],
+            y=df_birth_quarters['Q2_Apr_Jun'],
+            marker_color='#4ECDC4',  # Türkis für Q2
+            text=df_birth_quarters['Q2_Apr_Jun'],
+            textposition='auto'
+        ))
 
-st.markdown("---")
-
-# Sechste Zeile - Detaillierte Q3+Q4-Analyse
-st.markdown("## 📈 Detaillierte Q3+Q4 (Jul-Dez) Analyse")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("### 🏆 Q3+Q4-Ranking")
-    
-    # Q3+Q4-Ranking nach Anzahl Spieler
-    q3_q4_data = df_birth_quarters[['Team', 'Q3_Jul_Sep', 'Q4_Oct_Dec', 'Gesamt']].copy()
-    q3_q4_data['Q3_Q4_Jul_Dec'] = q3_q4_data['Q3_Jul_Sep'] + q3_q4_data['Q4_Oct_Dec']
-    q3_q4_data['Q3_Q4_Prozent'] = (q3_q4_data['Q3_Q4_Jul_Dec'] / q3_q4_data['Gesamt'] * 100).round(1)
-    
-    q3_q4_ranking = q3_q4_data.sort_values('Q3_Q4_Jul_Dec', ascending=False)
-    
-    for i, (_, row) in enumerate(q3_q4_ranking.iterrows()):
-        team_name = row['Team']
-        q3_q4_count = row['Q3_Q4_Jul_Dec']
-        percentage = row['Q3_Q4_Prozent']
-        
-        # Emoji für Top 3
-        if i == 0:
-            medal = "🥇"
-        elif i == 1:
-            medal = "🥈"
-        elif i == 2:
-            medal = "🥉"
-        else:
-            medal = f"{i+1}."
-        
-        st.metric(f"{medal} {team_name}", f"{q3_q4_count} Spieler", f"{percentage}%")
-
-with col2:
-    st.markdown("### 📊 Q3+Q4-Statistiken")
-    
-    total_q3_q4 = q3_q4_data['Q3_Q4_Jul_Dec'].sum()
-    total_players = q3_q4_data['Gesamt'].sum()
-    overall_q3_q4_percentage = (total_q3_q4 / total_players * 100).round(1)
-    
-    st.metric("Gesamt Q3+Q4-Spieler", f"{total_q3_q4}")
-    st.metric("Gesamt Spieler", f"{total_players}")
-    st.metric("Liga Q3+Q4-Anteil", f"{overall_q3_q4_percentage}%")
-    
-    # Durchschnitt Q3+Q4 pro Team
-    avg_q3_q4 = q3_q4_data['Q3_Q4_Jul_Dec'].mean()
-    st.metric("Ø Q3+Q4 pro Team", f"{avg_q3_q4:.1f}")
-
-with col3:
-    st.markdown("### 📋 Q3+Q4-Details")
-    
-    # Tabelle mit Q3+Q4-Daten
-    display_df = q3_q4_data[['Team', 'Q3_Jul_Sep', 'Q4_Oct_Dec', 'Q3_Q4_Jul_Dec', 'Gesamt', 'Q3_Q4_Prozent']].copy()
-    display_df.columns = ['Team', 'Q3 (Jul-Sep)', 'Q4 (Okt-Dez)', 'Q3+Q4 (Jul-Dez)', 'Gesamt', 'Q3+Q4 %']
-    
-    st.dataframe(
-        display_df.style.format({'Q3 (Jul-Sep)': '{:.0f}', 'Q4 (Okt-Dez)': '{:.0f}', 'Q3+Q4 (Jul-Dez)': '{:.0f}', 'Gesamt': '{:.0f}', 'Q3+Q4 %': '{:.1f}%'}),
-        use_container_width=True,
-        height=300
-    )
+        # Q3 (Jul-Sep)
+        fig.add_trace(go.Bar(
+            name='Q3 (Jul-Sep)',
+            x=df_birth_quarters['Team'],
+            y=df_birth_quarters['Q3_Jul_Sep'],
+            marker_color='#45B7D1',  # Blau für Q3
+            text=df_birth_quarters['Q3_Jul_Sep'],
+            textposition='auto'
+        ))
 
-st.markdown("---")
+        # Q4 (Okt-Dez)
+        fig.add_trace(go.Bar(
+            name='Q4 (Okt-Dez)',
+            x=df_birth_quarters['Team'],
+            y=df_birth_quarters['Q4_Oct_Dec'],
+            marker_color='#96CEB4',  # Grün für Q4
+            text=df_birth_quarters['Q4_Oct_Dec'],
+            textposition='auto'
+        ))
 
-# Vierte Zeile - Erweiterte Analysen
-st.markdown("## 🔍 Erweiterte Analysen")
+        fig.update_layout(
+            title="Verteilung der Spieler nach Geburtsquartalen pro Team",
+            xaxis_title="Team",
+            yaxis_title="Anzahl Spieler",
+            template='plotly_white',
+            height=500,
+            barmode='stack'
+        )
 
-col1, col2 = st.columns(2)
+        st.plotly_chart(fig, use_container_width=True)
 
-with col1:
-    st.markdown("### 📊 Boxplot der Liga")
-    
-    fig = go.Figure()
-    fig.add_trace(go.Box(
-        y=df_teams['Altersdurchschnitt'],
-        name='Alle Teams',
-        boxpoints='outliers',
-        marker_color='#1f77b4',
-        line_color='#1f77b4'
-    ))
-    
-    # Ausgewähltes Team markieren
-    fig.add_hline(
-        y=team_age,
-        line_dash="dash",
-        line_color="red",
-        line_width=3,
-        annotation_text=f"{selected_team}"
-    )
-    
-    fig.update_layout(
-        title="Boxplot der Altersdurchschnitte aller Teams",
-        yaxis_title="Alter (Jahre)",
-        template='plotly_white',
-        height=400
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.markdown("### 🎯 Fokus: Q1 und Q2 (Jan-Jun) Spieler")
 
-with col2:
-    st.markdown("### 📈 Team-Vergleich")
-    
-    # Vergleich mit anderen Teams
-    comparison_data = df_teams.copy()
-    comparison_data['Differenz'] = comparison_data['Altersdurchschnitt'] - team_age
-    comparison_data = comparison_data.sort_values('Differenz')
-    
-    # Balkendiagramm mit Team-Farben
-    fig = go.Figure()
-    
-    for i, team in enumerate(comparison_data['Team']):
-        diff_val = comparison_data.iloc[i]['Differenz']
-        team_color = get_team_color(team)
-        
-        fig.add_trace(go.Bar(
-            x=[team],
-            y=[diff_val],
-            name=team,
-            marker_color=team_color,
-            showlegend=False
+        # Q1 + Q2 Spieler als separate Metrik
+        q1_q2_data = df_birth_quarters[['Team', 'Q1_Jan_Mar', 'Q2_Apr_Jun', 'H1_Jan_Jun', 'Gesamt']].copy()
+        q1_q2_data['Q1_Q2_Prozent'] = (q1_q2_data['H1_Jan_Jun'] / q1_q2_data['Gesamt'] * 100).round(1)
+
+        # Q1+Q2 Balkendiagramm mit Team-Farben (unabhängig vom ausgewählten Team)
+        fig = cached_figure("q1_q2", data_key, "", lambda: team_bar_figure(
+            q1_q2_data['Team'], q1_q2_data['H1_Jan_Jun'], colors,
+            text=q1_q2_data['H1_Jan_Jun'].astype(str) + " (" + q1_q2_data['Q1_Q2_Prozent'].astype(str) + "%)",
+            title="Spieler im Q1 und Q2 (Jan-Jun) pro Team",
+            xaxis_title="Team",
+            yaxis_title="Anzahl Q1+Q2-Spieler",
+            height=400
         ))
-    
-    fig.update_layout(
-        title=f"Altersdifferenz zu {selected_team}",
-        xaxis_title="Team",
-        yaxis_title="Altersdifferenz (Jahre)",
-        template='plotly_white',
-        height=400,
-        showlegend=False
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(fig, use_container_width=True)
 
+    # Fünfte Zeile - Detaillierte Q1+Q2-Analyse
+    st.markdown("---")
+    st.markdown("## 📈 Detaillierte Q1+Q2 (Jan-Jun) Analyse")
 
+    col1, col2, col3 = st.columns(3)
 
+    with col1:
+        st.markdown("### 🏆 Q1+Q2-Ranking")
 
+        # Q1+Q2-Ranking nach Anzahl Spieler
+        q1_q2_ranking = q1_q2_data.sort_values('H1_Jan_Jun', ascending=False)
 
-# Footer
-st.markdown("---")
-st.markdown("""
-<div style="text-align: center; color: #666; padding: 2rem;">
-    <p>📊 Dashboard erstellt für die Saison 2025/26</p>
-    <p>⚽ Daten aus: Statistik Altersdurchschnitt.xlsx | Wird regelmäßig aktualisiert</p>
-    <p>🎂 Geburtsquartal-Analyse: Q1 = Jan-März, Q2 = Apr-Jun, Q3 = Jul-Sep, Q4 = Okt-Dez</p>
-</div>
-""", unsafe_allow_html=True)
+        st.dataframe(
+            ranking_table(q1_q2_ranking, 'H1_Jan_Jun', 'Q1_Q2_Prozent'),
+            column_config=RANKING_COLUMN_CONFIG,
+            hide_index=True,
+            use_container_width=True
+        )
 
-# Sidebar Footer ausgeblendet
+    with col2:
+        st.markdown("### 📊 Q1+Q2-Statistiken")
+
+        total_q1_q2 = q1_q2_data['H1_Jan_Jun'].sum()
+        total_players = q1_q2_data['Gesamt'].sum()
+        overall_q1_q2_percentage = (total_q1_q2 / total_players * 100).round(1)
+
+        st.metric("Gesamt Q1+Q2-Spieler", f"{total_q1_q2}")
+        st.metric("Gesamt Spieler", f"{total_players}")
+        st.metric("Liga Q1+Q2-Anteil", f"{overall_q1_q2_percentage}%")
+
+        # Durchschnitt Q1+Q2 pro Team
+        avg_q1_q2 = q1_q2_data['H1_Jan_Jun'].mean()
+        st.metric("Ø Q1+Q2 pro Team", f"{avg_q1_q2:.1f}")
+
+    with col3:
+        st.markdown("### 📋 Q1+Q2-Details")
+
+        # Tabelle mit Q1+Q2-Daten
+        display_df = q1_q2_data[['Team', 'Q1_Jan_Mar', 'Q2_Apr_Jun', 'H1_Jan_Jun', 'Gesamt', 'Q1_Q2_Prozent']].copy()
+        display_df.columns = ['Team', 'Q1 (Jan-März)', 'Q2 (Apr-Jun)', 'Q1+Q2 (Jan-Jun)', 'Gesamt', 'Q1+Q2 %']
+
+        st.dataframe(
+            display_df.style.format({'Q1 (Jan-März)': '{:.0f}', 'Q2 (Apr-Jun)': '{:.0f}', 'Q1+Q2 (Jan-Jun)': '{:.0f}', 'Gesamt': '{:.0f}', 'Q1+Q2 %': '{:.1f}%'}),
+            use_container_width=True,
+            height=300
+        )
+
+    st.markdown("---")
+
+    # Sechste Zeile - Detaillierte Q3+Q4-Analyse
+    st.markdown("## 📈 Detaillierte Q3+Q4 (Jul-Dez) Analyse")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("### 🏆 Q3+Q4-Ranking")
+
+        # Q3+Q4-Ranking nach Anzahl Spieler
+        q3_q4_data = df_birth_quarters[['Team', 'Q3_Jul_Sep', 'Q4_Oct_Dec', 'H2_Jul_Dec', 'Gesamt']].copy()
+        q3_q4_data['Q3_Q4_Prozent'] = (q3_q4_data['H2_Jul_Dec'] / q3_q4_data['Gesamt'] * 100).round(1)
+
+        q3_q4_ranking = q3_q4_data.sort_values('H2_Jul_Dec', ascending=False)
+
+        st.dataframe(
+            ranking_table(q3_q4_ranking, 'H2_Jul_Dec', 'Q3_Q4_Prozent'),
+            column_config=RANKING_COLUMN_CONFIG,
+            hide_index=True,
+            use_container_width=True
+        )
+
+    with col2:
+        st.markdown("### 📊 Q3+Q4-Statistiken")
+
+        total_q3_q4 = q3_q4_data['H2_Jul_Dec'].sum()
+        total_players = q3_q4_data['Gesamt'].sum()
+        overall_q3_q4_percentage = (total_q3_q4 / total_players * 100).round(1)
+
+        st.metric("Gesamt Q3+Q4-Spieler", f"{total_q3_q4}")
+        st.metric("Gesamt Spieler", f"{total_players}")
+        st.metric("Liga Q3+Q4-Anteil", f"{overall_q3_q4_percentage}%")
+
+        # Durchschnitt Q3+Q4 pro Team
+        avg_q3_q4 = q3_q4_data['H2_Jul_Dec'].mean()
+        st.metric("Ø Q3+Q4 pro Team", f"{avg_q3_q4:.1f}")
+
+    with col3:
+        st.markdown("### 📋 Q3+Q4-Details")
+
+        # Tabelle mit Q3+Q4-Daten
+        display_df = q3_q4_data[['Team', 'Q3_Jul_Sep', 'Q4_Oct_Dec', 'H2_Jul_Dec', 'Gesamt', 'Q3_Q4_Prozent']].copy()
+        display_df.columns = ['Team', 'Q3 (Jul-Sep)', 'Q4 (Okt-Dez)', 'Q3+Q4 (Jul-Dez)', 'Gesamt', 'Q3+Q4 %']
+
+        st.dataframe(
+            display_df.style.format({'Q3 (Jul-Sep)': '{:.0f}', 'Q4 (Okt-Dez)': '{:.0f}', 'Q3+Q4 (Jul-Dez)': '{:.0f}', 'Gesamt': '{:.0f}', 'Q3+Q4 %': '{:.1f}%'}),
+            use_container_width=True,
+            height=300
+        )
+
+    st.markdown("---")
+
+    # Relativer Alterseffekt (vorberechnet je Arbeitsmappen-Stand)
+    rae = load_relative_age_analysis(str(excel_path), workbook_key(excel_path))
+    if rae is not None and not rae['quartale'].empty:
+        st.markdown("## 🧮 Relativer Alterseffekt")
+        rae_quarters = rae['quartale']
+        selected_rae = rae_quarters[rae_quarters['Team'] == selected_team]
+        if not selected_rae.empty:
+            row = selected_rae.iloc[0]
+            verdict = "signifikant" if row['Signifikant'] else "nicht signifikant"
+            st.markdown(f"**{selected_team}:** Q1-Index {row['Q1_Index']:.2f}, Q4-Index {row['Q4_Index']:.2f}, "
+                        f"Odds Ratio Q1/Q4 {row['OR_Q1_Q4']:.2f} – χ² = {row['Chi2']:.2f}, p = {row['p_Wert']:.4f} ({verdict})")
+
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            st.dataframe(
+                rae_quarters[['Team', 'Gesamt', 'Q1_Index', 'Q2_Index', 'Q3_Index', 'Q4_Index',
+                              'OR_Q1_Q4', 'Chi2', 'p_Wert', 'Signifikant']],
+                column_config={
+                    'Q1_Index': st.column_config.NumberColumn("Q1-Index", format="%.2f"),
+                    'Q2_Index': st.column_config.NumberColumn("Q2-Index", format="%.2f"),
+                    'Q3_Index': st.column_config.NumberColumn("Q3-Index", format="%.2f"),
+                    'Q4_Index': st.column_config.NumberColumn("Q4-Index", format="%.2f"),
+                    'OR_Q1_Q4': st.column_config.NumberColumn("OR Q1/Q4", format="%.2f"),
+                    'Chi2': st.column_config.NumberColumn("χ²", format="%.2f"),
+                    'p_Wert': st.column_config.NumberColumn("p", format="%.4f"),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption("Index = beobachtet / erwartet bei Gleichverteilung der Geburten (nach Tagen gewichtet), "
+                       "> 1 = überrepräsentiert. χ²-Test der Quartale gegen Gleichverteilung (3 FG), "
+                       f"signifikant bei p < {relativalter.SIGNIFICANCE:.2f}.")
+        with col2:
+            rae_months = rae['monate'].set_index('Team')
+
+            def build_month_heatmap():
+                shares = rae_months.div(rae_months.sum(axis=1).where(lambda n: n > 0), axis=0) * 100
+                fig = go.Figure(go.Heatmap(
+                    z=shares.values.round(1),
+                    x=list(shares.columns),
+                    y=list(shares.index),
+                    colorscale='Reds',
+                    colorbar_title="%"
+                ))
+                fig.update_layout(title="Geburtsmonate (Anteil je Team)", template='plotly_white', height=400)
+                return fig
+
+            st.plotly_chart(cached_figure("rae_monate", frame_hash(rae['monate']), "", build_month_heatmap),
+                            use_container_width=True)
+
+        st.markdown("---")
+
+    # Vierte Zeile - Erweiterte Analysen
+    st.markdown("## 🔍 Erweiterte Analysen")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 📊 Boxplot der Liga")
+
+        fig = go.Figure()
+        fig.add_trace(go.Box(
+            y=df_teams['Altersdurchschnitt'],
+            name='Alle Teams',
+            boxpoints='outliers',
+            marker_color='#1f77b4',
+            line_color='#1f77b4'
+        ))
+
+        # Ausgewähltes Team markieren
+        fig.add_hline(
+            y=team_age,
+            line_dash="dash",
+            line_color="red",
+            line_width=3,
+            annotation_text=f"{selected_team}"
+        )
+
+        fig.update_layout(
+            title="Boxplot der Altersdurchschnitte aller Teams",
+            yaxis_title="Alter (Jahre)",
+            template='plotly_white',
+            height=400
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("### 📈 Team-Vergleich")
+
+        # Vergleich mit anderen Teams
+        comparison_data = df_teams.copy()
+        comparison_data['Differenz'] = comparison_data['Altersdurchschnitt'] - team_age
+        comparison_data = comparison_data.sort_values('Differenz')
+
+        # Balkendiagramm mit Team-Farben
+        fig = cached_figure("differenz", data_key, selected_team, lambda: team_bar_figure(
+            comparison_data['Team'], comparison_data['Differenz'], colors,
+            title=f"Altersdifferenz zu {selected_team}",
+            xaxis_title="Team",
+            yaxis_title="Altersdifferenz (Jahre)",
+            height=400
+        ))
+        st.plotly_chart(fig, use_container_width=True)
+
+
+
+
+
+    st.markdown("---")
+    render_match_ages(excel_path, season_of(excel_path), selected_team, colors)
+
+    st.markdown("---")
+    render_season_comparison(archive_excel, colors)
+
+    # Footer
+    st.markdown("---")
+    st.markdown(f"""
+    <div style="text-align: center; color: #666; padding: 2rem;">
+        <p>📊 Dashboard erstellt für die {season_label}</p>
+        <p>⚽ Daten aus: {Path(excel_path).name} | Wird regelmäßig aktualisiert</p>
+        <p>🎂 Geburtsquartal-Analyse: Q1 = Jan-März, Q2 = Apr-Jun, Q3 = Jul-Sep, Q4 = Okt-Dez</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Sidebar Footer ausgeblendet
+
+    # Export-Funktionalität
+    st.sidebar.markdown("### 💾 Export")
+    if st.sidebar.button("📥 Alle Daten exportieren (CSV)"):
+        csv = df_teams.to_csv(index=False)
+        st.sidebar.download_button(
+            label="Download CSV",
+            data=csv,
+            file_name="alle_teams_altersdurchschnitt.csv",
+            mime="text/csv"
+        )
+
+    if st.sidebar.button("📥 Team-Daten exportieren (CSV)"):
+        team_csv = df_teams[df_teams['Team'] == selected_team].to_csv(index=False)
+        st.sidebar.download_button(
+            label=f"Download {selected_team}",
+            data=team_csv,
+            file_name=f"{selected_team}_altersdurchschnitt.csv",
+            mime="text/csv"
+        )
 
-# Export-Funktionalität
-st.sidebar.markdown("### 💾 Export")
-if st.sidebar.button("📥 Alle Daten exportieren (CSV)"):
-    csv = df_teams.to_csv(index=False)
-    st.sidebar.download_button(
-        label="Download CSV",
-        data=csv,
-        file_name="alle_teams_altersdurchschnitt.csv",
-        mime="text/csv"
-    )
 
-if st.sidebar.button("📥 Team-Daten exportieren (CSV)"):
-    team_csv = df_teams[df_teams['Team'] == selected_team].to_csv(index=False)
-    st.sidebar.download_button(
-        label=f"Download {selected_team}",
-        data=team_csv,
-        file_name=f"{selected_team}_altersdurchschnitt.csv",
-        mime="text/csv"
+if __name__ == "__main__":
+    # Seite konfigurieren (nur standalone – eingebettet macht das die aufrufende App)
+    st.set_page_config(
+        page_title="JWR - Durchschnittsalter Dashboard",
+        page_icon="⚽",
+        layout="wide",
+        initial_sidebar_state="expanded"
     )
+    render_altersstatistik()
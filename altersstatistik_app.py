@@ -4,7 +4,8 @@ Standalone Altersstatistik App
 Streamlit: streamlit run altersstatistik_app.py
 """
 
-import os
+import sys
+import importlib.util
 import streamlit as st
 from pathlib import Path
 
@@ -48,8 +49,45 @@ st.markdown(
     """, unsafe_allow_html=True
 )
 
+# Team-Farben der Altersstatistik (einfarbig, wie im Dashboard)
+TEAM_COLORS = {
+    'JWR': '#1f77b4',
+    'LASK': '#ff7f0e',
+    'Sturm': '#2ca02c',
+    'Rapid': '#d62728',
+    'WAC': '#9467bd',
+    'Liefering': '#8c564b',
+    'Altach Juniors': '#e377c2',
+    'Young Violets': '#7f7f7f',
+    'Gleisdorf': '#bcbd22',
+    'Gurten': '#17becf',
+    'Kalsdorf': '#ff9896',
+    'Lafnitz': '#98df8a',
+    'Oedt': '#ffbb78',
+    'St. Anna': '#f0027f',
+    'Treibach': '#386cb0',
+    'Velden': '#fdc086',
+    'Voitsberg': '#beaed4',
+    'Wallern': '#fccde5',
+    'Weiz': '#d9d9d9',
+    'Dietach': '#fb8072'
+}
+
+@st.cache_resource(show_spinner=False)
+def _import_altersstatistik(script_path: str, script_mtime: float):
+    """Importiert Durchschnittsalter.py einmal pro Prozess (neu nur bei geänderter Datei)."""
+    spec = importlib.util.spec_from_file_location("Durchschnittsalter", script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(spec.name, None)
+        raise
+    return module
+
 def load_and_execute_altersstatistik_script():
-    """Lädt und führt das Altersstatistik-Skript aus."""
+    """Lädt das Altersstatistik-Modul und zeichnet die Seite."""
     if not ALTERSSTATISTIK_SCRIPT.exists():
         st.error(f"Altersstatistik-Skript nicht gefunden: {ALTERSSTATISTIK_SCRIPT}")
         return False
@@ -71,206 +109,20 @@ def load_and_execute_altersstatistik_script():
         return False
     
     try:
-        # Skript-Inhalt laden
-        script_content = ALTERSSTATISTIK_SCRIPT.read_text(encoding='utf-8', errors='ignore')
-        
-        # Modifiziere das Skript, um den absoluten Pfad zur Excel-Datei zu verwenden
-        script_content = script_content.replace(
-            '"Statistik Altersdurchschnitt.xlsx"',
-            f'r"{str(ALTERSSTATISTIK_EXCEL)}"'
-        )
-        
-        # Titel explizit auf JWR setzen
-        script_content = script_content.replace(
-            'st.title("SK Rapid Wien II - Durchschnittsalter Dashboard")',
-            'st.title("JWR - Durchschnittsalter Dashboard")'
-        )
-        
-        # Page title auch auf JWR setzen
-        script_content = script_content.replace(
-            'page_title="SK Rapid Wien II - Durchschnittsalter Dashboard"',
-            'page_title="JWR - Durchschnittsalter Dashboard"'
+        altersstatistik = _import_altersstatistik(
+            str(ALTERSSTATISTIK_SCRIPT), ALTERSSTATISTIK_SCRIPT.stat().st_mtime
         )
-        
-        # Modifiziere die get_team_color Funktion im Skript, um ungültige Farben zu verhindern
-        script_content = script_content.replace(
-            'def get_team_color(team_name):',
-            '''def get_team_color(team_name):
-    """Gibt eine sichere Farbe für ein Team zurück, immer gültige Hex-Farbe"""
-    if team_name is None:
-        return '#1f77b4'  # Standard-Blau
-    
-    team_str = str(team_name).strip()
-    if not team_str or team_str.lower() in ['nan', 'none', '']:
-        return '#1f77b4'  # Standard-Blau
-    
-    # Suche nach passender Farbe
-    for team_key, color in TEAM_COLORS.items():
-        if team_key.lower() in team_str.lower():
-            return color
+    except ImportError as e:
+        st.error(f"❌ Fehlendes Modul: {e.name}. Bitte stellen Sie sicher, dass alle Requirements installiert sind.")
+        st.info("**Lösung:** Alle Module sind bereits in der requirements_altersstatistik.txt aufgeführt.")
+        return False
     
-    # Fallback: Generiere eine Farbe basierend auf dem Team-Namen
-    import hashlib
-    hash_object = hashlib.md5(team_str.encode())
-    hash_hex = hash_object.hexdigest()
-    return f'#{hash_hex[:6]}'  # Erste 6 Zeichen als Farbe'''
-        )
-        
-        # Modifiziere das Dropdownmenü, um nan-Werte zu filtern und JWR als Standard zu setzen
-        # Ersetze den kompletten st.selectbox Aufruf
-        script_content = script_content.replace(
-            'st.sidebar.selectbox(\n    "Wählen Sie ein Team aus:",\n    options=df_teams[\'Team\'].tolist(),\n    index=jwr_index\n)',
-            'st.sidebar.selectbox(\n    "Wählen Sie ein Team aus:",\n    options=filter_valid_teams(df_teams[\'Team\'].tolist()),\n    index=filter_valid_teams(df_teams[\'Team\'].tolist()).index("JWR") if "JWR" in filter_valid_teams(df_teams[\'Team\'].tolist()) else 0\n)'
-        )
-        
-        # Korrigiere das Team-Mapping für Young Violets
-        script_content = script_content.replace(
-            "'Young Violets': 'Young Violetts',",
-            "'Young Violets': 'Young Violets',"
+    try:
+        altersstatistik.render_altersstatistik(
+            ALTERSSTATISTIK_EXCEL,
+            title="⚽ JWR - Durchschnittsalter Dashboard",
+            team_colors=TEAM_COLORS,
         )
-        
-        # TEAM_COLORS definieren
-        TEAM_COLORS = {
-            'JWR': '#1f77b4',
-            'LASK': '#ff7f0e',
-            'Sturm': '#2ca02c',
-            'Rapid': '#d62728',
-            'WAC': '#9467bd',
-            'Liefering': '#8c564b',
-            'Altach Juniors': '#e377c2',
-            'Young Violets': '#7f7f7f',
-            'Gleisdorf': '#bcbd22',
-            'Gurten': '#17becf',
-            'Kalsdorf': '#ff9896',
-            'Lafnitz': '#98df8a',
-            'Oedt': '#ffbb78',
-            'St. Anna': '#f0027f',
-            'Treibach': '#386cb0',
-            'Velden': '#fdc086',
-            'Voitsberg': '#beaed4',
-            'Wallern': '#fccde5',
-            'Weiz': '#d9d9d9',
-            'Dietach': '#fb8072'
-        }
-        
-        # Skript in einem exec() ausführen
-        local_namespace = {
-            'st': st,
-            'pd': None,  # Wird bei Bedarf importiert
-            'plt': None,
-            'numpy': None,
-            'np': None,
-            'matplotlib': None,
-            'os': os,
-            'pathlib': None,
-            'Path': Path,
-            'TEAM_COLORS': TEAM_COLORS
-        }
-        
-        # TEAM_COLORS auch global verfügbar machen
-        globals()['TEAM_COLORS'] = TEAM_COLORS
-        
-        # Versuche häufig benötigte Module zu importieren
-        try:
-            import pandas as pd
-            local_namespace['pd'] = pd
-            # Wichtig: pandas auch als 'pd' verfügbar machen
-            local_namespace['pd'] = pd
-            globals()['pd'] = pd
-        except ImportError:
-            st.error("❌ Das 'pandas' Modul ist nicht installiert. Installieren Sie es mit: `pip install pandas`")
-            return False
-        
-        try:
-            import numpy as np
-            local_namespace['np'] = np
-            local_namespace['numpy'] = np
-            globals()['np'] = np
-        except ImportError:
-            pass
-        
-        try:
-            import matplotlib.pyplot as plt
-            local_namespace['plt'] = plt
-            globals()['plt'] = plt
-        except ImportError:
-            pass
-        
-        try:
-            import plotly
-            import plotly.express as px
-            import plotly.graph_objects as go
-            import plotly.offline as pyo
-            local_namespace['plotly'] = plotly
-            local_namespace['px'] = px
-            local_namespace['go'] = go
-            local_namespace['pyo'] = pyo
-            # Auch global verfügbar machen
-            globals()['plotly'] = plotly
-            globals()['px'] = px
-            globals()['go'] = go
-            globals()['pyo'] = pyo
-        except ImportError:
-            st.error("❌ Das 'plotly' Modul ist nicht installiert. Bitte stellen Sie sicher, dass alle Requirements installiert sind.")
-            st.info("**Lösung:** Alle Module sind bereits in der requirements_altersstatistik.txt aufgeführt.")
-            return False
-        
-        try:
-            import openpyxl
-            local_namespace['openpyxl'] = openpyxl
-        except ImportError:
-            st.error("❌ Das 'openpyxl' Modul ist nicht installiert. Bitte stellen Sie sicher, dass alle Requirements installiert sind.")
-            st.info("**Lösung:** Alle Module sind bereits in der requirements_altersstatistik.txt aufgeführt.")
-            return False
-        
-        try:
-            import seaborn as sns
-            local_namespace['sns'] = sns
-        except ImportError:
-            pass
-        
-        try:
-            import scipy
-            local_namespace['scipy'] = scipy
-        except ImportError:
-            pass
-        
-        # Hilfsfunktion zum Filtern von ungültigen Team-Namen
-        def filter_valid_teams(teams):
-            if teams is None:
-                return []
-            valid_teams = []
-            for team in teams:
-                if team is not None and str(team).lower() not in ['nan', 'none', ''] and str(team).strip():
-                    valid_teams.append(team)
-            return valid_teams
-        
-        local_namespace['filter_valid_teams'] = filter_valid_teams
-        
-        # Sichere get_team_color Funktion hinzufügen
-        def safe_get_team_color(team_name):
-            if team_name is None:
-                return '#1f77b4'
-            
-            team_str = str(team_name).strip()
-            if not team_str or team_str.lower() in ['nan', 'none', '']:
-                return '#1f77b4'
-            
-            TEAM_COLORS = local_namespace['TEAM_COLORS']
-            for team_key, color in TEAM_COLORS.items():
-                if team_key.lower() in team_str.lower():
-                    return color
-            
-            import hashlib
-            hash_object = hashlib.md5(team_str.encode())
-            hash_hex = hash_object.hexdigest()
-            return f'#{hash_hex[:6]}'
-        
-        local_namespace['get_team_color'] = safe_get_team_color
-        local_namespace['safe_get_team_color'] = safe_get_team_color
-        
-        # Skript ausführen
-        exec(script_content, globals(), local_namespace)
         return True
         
     except Exception as e:
@@ -0,0 +1,626 @@
+# -*- coding: utf-8 -*-
+"""
+Mikro-Benchmarks für die Parser/Datenpfade des Dashboards.
+
+    python benchmarks.py kader [--html kader.html] [-n 50]
+    python benchmarks.py table [--html tabelle.html] [-n 50]
+    python benchmarks.py record              # Live-Seiten als Fixtures aufzeichnen
+    python benchmarks.py fixtures [-n 20]    # Parser offline über alle Fixtures messen
+    python benchmarks.py startup [-n 3] [--save]   # Import-Zeit + erster Render (synthetische Liga) gegen Baseline
+    python benchmarks.py suite [--teams 16 --scripts 10 --clips 3000] [--save]   # synthetische Liga
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE = Path(__file__).parent
+BASELINE_FILE = BASE / "benchmark_baseline.json"
+TOLERANCE = 0.25  # +25 % gegenüber der Baseline gilt als Regression
+SUITE_TOLERANCE = 1.0  # Suite: bis doppelt so langsam; kurze Messungen schwanken zwischen Prozessen stark,
+                       # gesucht sind Ausreißer wie Excel statt Sidecar (x28) oder quadratische Scans
+MIN_DELTA_MS = 2.0  # darunter ist ein Unterschied nur Rauschen (z.B. 3 ms -> 4.5 ms)
+
+
+# ========================= Helper =========================
+def _import_dashboard():
+    """dashboard_fixed ohne Streamlit-Runtime importieren (main() läuft nicht)."""
+    import logging
+    sys.path.insert(0, str(BASE))
+    import dashboard_fixed
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    return dashboard_fixed
+
+
+def timeit(fn, *args, n: int = 20) -> list[float]:
+    """Führt fn n-mal aus und gibt die Laufzeiten in ms zurück (ein Warmup-Lauf vorab)."""
+    fn(*args)
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(*args)
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def report(name: str, times: list[float], baseline: list[float] | None = None):
+    med = statistics.median(times)
+    line = f"{name:<42} min {min(times):8.3f} ms   median {med:8.3f} ms"
+    if baseline:
+        line += f"   x{statistics.median(baseline) / med:5.1f}"
+    print(line)
+
+
+# ========================= Kader (SG.container.appPreloads) =========================
+def synthetic_kader_page(n_players: int = 30, filler_kb: int = 400) -> str:
+    """ÖFB-ähnliche Kaderseite: viel Markup, ein Spiele-Preload vor dem Kader-Preload."""
+    filler = "<div class='nav-item'><a href='/verein/seite'>Menüpunkt</a></div>\n" * (filler_kb * 1024 // 64)
+    spiele = [{"spielId": i, "heim": "Team A", "gast": "Team B", "ergebnis": "1:0"} for i in range(300)]
+    kader = [
+        {
+            "spielerName": f"Spieler {i}",
+            "kartenGelb": i % 5,
+            "kartenGelbRot": i % 7 == 0,
+            "kartenRot": 0,
+            "spielerProfilUrl": f"https://vereine.oefb.at/spieler/{i}",
+            "einsaetze": i % 20,
+        }
+        for i in range(n_players)
+    ]
+    return (
+        "<html><body>" + filler
+        + "<script>SG.container.appPreloads['101'] = " + json.dumps([{"spiele": spiele}]) + ";</script>"
+        + filler
+        + "<script>SG.container.appPreloads['102'] = " + json.dumps([{"kader": kader}]) + ";</script>"
+        + "</body></html>"
+    )
+
+
+def _kader_legacy(html: str):
+    """Referenz: bisherige Implementierung (lazy Regex auf den ersten Preload + Objekt-Regex)."""
+    try:
+        match = re.search(r"SG\.container\.appPreloads\[\s*'(\d+)'\s*\]\s*=\s*(\[[\s\S]*?\]);", html, re.DOTALL)
+        if match:
+            for item in json.loads(match.group(2)):
+                if isinstance(item, dict) and "kader" in item:
+                    return item.get("kader", [])
+    except Exception:
+        pass
+    obj_pattern = re.compile(
+        r'\{[^{}]*?"spielerName"\s*:\s*"([^"]+)"[^{}]*?'
+        r'"kartenGelb"\s*:\s*(\d+)[^{}]*?'
+        r'(?:\"kartenGelbRot\"\s*:\s*(\d+))?[^{}]*?'
+        r'(?:\"kartenRot\"\s*:\s*(\d+))?[^{}]*?'
+        r'(?:"spielerProfilUrl"\s*:\s*"([^"]*)")?[^{}]*?\}',
+        re.DOTALL
+    )
+    return [m.groups() for m in obj_pattern.finditer(html)]
+
+
+def bench_kader(args):
+    from oefb_preloads import find_preload_value
+    html = Path(args.html).read_text(encoding="utf-8", errors="ignore") if args.html else synthetic_kader_page()
+    print(f"Seite: {len(html) / 1024:.0f} KB")
+    legacy = timeit(_kader_legacy, html, n=args.n)
+    report("extrahiere_kaderdaten (alt, Regex)", legacy)
+    report("find_preload_value(html, 'kader')", timeit(find_preload_value, html, "kader", n=args.n), legacy)
+    dash = _import_dashboard()
+    report("extrahiere_kaderdaten (neu)", timeit(dash.extrahiere_kaderdaten, html, n=args.n), legacy)
+
+
+# ========================= Tabelle (Ligaportal) =========================
+def synthetic_table_page(n_teams: int = 16, filler_kb: int = 300) -> str:
+    """Ligaportal-ähnliche Tabellenseite: Navigation/Artikel-Markup + eine Standings-Tabelle."""
+    filler = "<div class='teaser'><a href='/artikel'><span>Schlagzeile</span></a></div>\n" * (filler_kb * 1024 // 64)
+    rows = "".join(
+        f"<tr><td>{i}.</td><td><a href='/team/{i}'><span>Team</span> <span>{i}</span></a></td>"
+        f"<td>20</td><td>{20 - i}</td><td>{i % 5}</td><td>{i % 7}</td><td>{40 - i}:{10 + i}</td>"
+        f"<td>{30 - 2 * i}</td><td>{60 - 3 * i}</td></tr>"
+        for i in range(1, n_teams + 1)
+    )
+    header = "<tr><th>#</th><th>Team</th><th>S</th><th>G</th><th>U</th><th>V</th><th>Tore</th><th>D</th><th>P</th></tr>"
+    return f"<html><body>{filler}<table class='standings'>{header}{rows}</table>{filler}</body></html>"
+
+
+def bench_table(args):
+    dash = _import_dashboard()
+    if args.html:
+        html = Path(args.html).read_text(encoding="utf-8", errors="ignore")
+    else:
+        import http_fixtures
+        recorded = dict(http_fixtures.iter_fixtures()).get(dash.RL_MITTE_TABLE_URL)
+        html = recorded or synthetic_table_page()
+        print("Quelle:", "Fixture" if recorded else "synthetisch")
+    print(f"Seite: {len(html) / 1024:.0f} KB")
+    bs = timeit(dash._parse_rl_table_bs4, html, n=args.n)
+    report("BeautifulSoup html.parser", bs)
+    report("lxml", timeit(dash._parse_rl_table_lxml, html, n=args.n), bs)
+    fast, slow = dash._parse_rl_table_lxml(html), dash._parse_rl_table_bs4(html)
+    print("Ergebnis identisch:", fast == slow, f"({len(fast)} Zeilen)")
+
+
+# ========================= Fixtures (Record/Replay) =========================
+def scraper_urls(dash) -> list[str]:
+    """Alle URLs, die die Scraper des Dashboards abrufen."""
+    return [
+        *dash.LIGAPORTAL_SCHEDULE_URLS,
+        dash.LIGAPORTAL_TICKER_SCHEDULE_URL,
+        dash.RL_MITTE_TABLE_URL,
+        dash.OEFB_SPIELE_URL,
+        *dash.OEFB_KADER_URLS.values(),
+    ]
+
+
+def fixture_parsers(dash) -> list[tuple[str, tuple]]:
+    """(Name, Parser) je Seitentyp; Zuordnung über die URL."""
+    aliases = tuple(dash.get_team_aliases(dash.PREFERRED_TEAM))
+    return [
+        ("ticker.ligaportal", ("parse_ticker_schedule", dash.parse_ticker_schedule)),
+        ("spielplan", ("_extract_matches_generic_cached", lambda html: dash._extract_matches_generic_cached(html, aliases))),
+        ("tabelle", ("parse_rl_mitte_table", dash.parse_rl_mitte_table)),
+        ("kader", ("extrahiere_kaderdaten", dash.extrahiere_kaderdaten)),
+    ]
+
+
+def parser_for_url(dash, url: str):
+    low = url.lower()
+    for needle, parser in fixture_parsers(dash):
+        if needle in low:
+            return parser
+    return None
+
+
+def bench_record(args):
+    import http_fixtures
+    dash = _import_dashboard()
+    http_fixtures.set_http_mode("record")
+    for url in scraper_urls(dash):
+        try:
+            resp = http_fixtures.http_get(url, timeout=(5.0, 15.0), headers=dash.HTTP_HEADERS)
+            print(f"{resp.status_code}  {len(resp.text) / 1024:7.0f} KB  {url}")
+        except Exception as e:
+            print(f"FEHLER  {url}: {e}")
+    print(f"Fixtures: {http_fixtures.FIXTURE_DIR}")
+
+
+def bench_fixtures(args):
+    import http_fixtures
+    dash = _import_dashboard()
+    found = False
+    for url, html in http_fixtures.iter_fixtures():
+        parser = parser_for_url(dash, url)
+        if not parser:
+            continue
+        found = True
+        name, fn = parser
+        print(f"{url}  ({len(html) / 1024:.0f} KB)")
+        report(f"  {name}", timeit(fn, html, n=args.n))
+    if not found:
+        print(f"Keine Fixtures in {http_fixtures.FIXTURE_DIR} – zuerst 'python benchmarks.py record' ausführen.")
+
+
+# ========================= Startup (Import-Zeit + erster Render) =========================
+# Diese Module dürfen beim Import von dashboard_fixed noch nicht geladen sein
+STARTUP_LAZY_MODULES = ("pandas", "matplotlib", "bs4", "requests")
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+# Konfig-Konstanten des Dashboards werden im Quelltext auf die synthetische Liga umgebogen
+# (AppTest führt das Skript bei jedem Lauf neu aus, Patchen des Moduls reicht dort nicht).
+_FIRST_RENDER_SNIPPET = """
+import logging, re, sys, time
+logging.disable(logging.CRITICAL)
+from pathlib import Path
+from streamlit.testing.v1 import AppTest
+source = Path({script!r}).read_text(encoding="utf-8")
+for name, value in {paths!r}.items():
+    source, n = re.subn(rf"^{{name}} = .*$", lambda m: f"{{name}} = Path({{value!r}})", source, count=1, flags=re.M)
+    if not n:
+        sys.exit(f"Konstante {{name}} nicht gefunden")
+at = AppTest.from_string(source, default_timeout=120)
+t0 = time.perf_counter()
+at.run()
+ms = (time.perf_counter() - t0) * 1000
+problems = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+if problems:
+    sys.exit("\\n".join(problems))
+print(ms)
+"""
+
+
+def _run_python(*args: str, env: dict | None = None) -> subprocess.CompletedProcess:
+    """Frischer Interpreter (kalte Imports), Scraper im Replay-Modus – kein Netz."""
+    env = {**os.environ, "DASHBOARD_HTTP_MODE": "replay", **(env or {})}
+    return subprocess.run([sys.executable, *args], cwd=BASE, env=env, capture_output=True, text=True)
+
+
+def import_profile(module: str = "dashboard_fixed") -> tuple[float, list[tuple[float, str]]]:
+    """`python -X importtime -c "import <module>"`: (kumulierte ms, direkte Imports nach ms)."""
+    rows = []
+    for line in _run_python("-X", "importtime", "-c", f"import {module}").stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((int(m.group(2)) / 1000, len(m.group(3)), m.group(4)))
+    root = next(((ms, depth) for ms, depth, name in rows if name == module), (float("nan"), 1))
+    children = sorted(((ms, name) for ms, depth, name in rows if depth == root[1] + 2), reverse=True)
+    return root[0], children
+
+
+def lazy_violations(module: str = "dashboard_fixed") -> list[str]:
+    """Module aus STARTUP_LAZY_MODULES, die schon beim Import geladen werden."""
+    code = (f"import json, sys; import {module}; "
+            f"print(json.dumps([m for m in {STARTUP_LAZY_MODULES!r} if m in sys.modules]))")
+    out = _run_python("-c", code).stdout.strip().splitlines()
+    return json.loads(out[-1]) if out else list(STARTUP_LAZY_MODULES)
+
+
+def startup_paths(league: dict, root: Path) -> dict[str, str]:
+    """Dashboard-Pfade für den Render-Test: Analysen, Clips, Excel und Caches der synthetischen Liga."""
+    return {
+        "BASE_DIR": str(league["base"]),
+        "RL_VIDEOS_BASE": str(league["videos"]),
+        "VIDEOS_BASE": str(league["videos"]),
+        "MATCHPLAN_BASE": str(root / "matchplan"),
+        "IND_ANALYSEN_BASE": str(root / "individuell"),
+        "ALTERSSTATISTIK_EXCEL": str(league["excel"]),
+        "LOCAL_DATA_DIR": str(root / "lokal"),
+        "CACHE_DIR": str(root / "cache"),
+    }
+
+
+def first_render_ms(league: dict, root: Path, script: str = "dashboard_fixed.py") -> float:
+    """Zeit bis zum ersten vollständigen Script-Durchlauf (Streamlit AppTest, kalter Prozess)
+    gegen die synthetische Liga. Exception oder st.error im Render -> RuntimeError."""
+    code = _FIRST_RENDER_SNIPPET.format(script=str(BASE / script), paths=startup_paths(league, root))
+    proc = _run_python("-c", code, env={"DASHBOARD_FIXTURE_DIR": str(league["fixtures"])})
+    out = proc.stdout.strip().splitlines()
+    if proc.returncode or not out:
+        raise RuntimeError(proc.stderr.strip()[-800:] or "kein Ergebnis")
+    return float(out[-1])
+
+
+def load_baseline() -> dict:
+    try:
+        return json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(name: str, values: dict):
+    data = load_baseline()
+    data[name] = {key: round(value, 1) for key, value in values.items()}
+    BASELINE_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def compare_baseline(name: str, values: dict, tolerance: float = TOLERANCE) -> list[str]:
+    """Messwerte (ms) gegen die gespeicherte Baseline; Liste der Regressionen.
+    Ein Messwert ohne Baseline zählt auch dazu (erst mit --save anlegen)."""
+    baseline = load_baseline().get(name, {})
+    regressions = []
+    for key, value in values.items():
+        ref = baseline.get(key)
+        if ref:
+            print(f"  {key:<28} {value:9.1f} ms   Baseline {ref:9.1f} ms   x{value / ref:4.2f}")
+            if value > ref * (1 + tolerance) and value - ref > MIN_DELTA_MS:
+                regressions.append(f"{key}: {value:.1f} ms > {ref:.1f} ms + {tolerance:.0%}")
+        else:
+            print(f"  {key:<28} {value:9.1f} ms   (keine Baseline)")
+            regressions.append(f"{key}: keine Baseline '{name}' in {BASELINE_FILE.name} (mit --save anlegen)")
+    return regressions
+
+
+def bench_startup(args):
+    import tempfile
+    imports, renders = [], []
+    children = []
+    with tempfile.TemporaryDirectory(prefix="dashboard-startup-") as tmp:
+        root = Path(tmp)
+        league = generate_league(root, args.teams, args.scripts, args.clips)
+        for _ in range(args.n):
+            total, children = import_profile()
+            imports.append(total)
+            try:
+                renders.append(first_render_ms(league, root))
+            except RuntimeError as e:
+                print(f"REGRESSION: erster Render fehlgeschlagen: {e}")
+                return 1
+    print("Größte direkte Imports von dashboard_fixed:")
+    for ms, name in children[:8]:
+        print(f"  {name:<28} {ms:9.1f} ms")
+    values = {"import_ms": statistics.median(imports), "first_render_ms": statistics.median(renders)}
+    if args.save:
+        save_baseline("startup", values)
+        print(f"Baseline gespeichert: {BASELINE_FILE}")
+    problems = compare_baseline("startup", values)
+    eager = lazy_violations()
+    if eager:
+        problems.append(f"beim Import geladen (sollte lazy sein): {', '.join(eager)}")
+    for p in problems:
+        print("REGRESSION:", p)
+    return 1 if problems else 0
+
+
+# ========================= Suite (synthetische Liga) =========================
+CLIP_CATEGORIES = ("1Touch", "2Touch", "Elfmeter", "Kopfball")
+SYNTH_SCORERS = ("PirkerM", "HuberL", "GruberT", "MayerS", "WagnerJ", "BauerF", "MoserK", "LeitnerP")
+
+
+def _synth_teams(n_teams: int) -> list[str]:
+    # JWR zuerst (PREFERRED_TEAM); Namen ohne "_" wie die Ordner der Videos
+    return ["JWR"] + [f"Team{i:02d}" for i in range(1, n_teams)]
+
+
+def _goal_script(team: str, kind: str, rng, n_goals: int) -> str:
+    """Tor-Skript im Format der Analysen (goals/assists-Listen + plt.title)."""
+    goals = [(rng.randint(10, 58), rng.randint(70, 100)) for _ in range(n_goals)]
+    assists = [(rng.randint(0, 68), rng.randint(20, 100)) for _ in range(n_goals)]
+    return (
+        "import matplotlib.pyplot as plt\n\n"
+        "def draw_field():\n"
+        "    fig, ax = plt.subplots(figsize=(6, 10))\n"
+        "    ax.set_facecolor('green')\n"
+        f"    goals = {goals}  # Torpositionen\n"
+        f"    assists = {assists}  # Assist-Positionen\n"
+        f"    plt.title(\"{kind} {team}\")\n"
+        "    plt.show()\n\n"
+        "draw_field()\n"
+    )
+
+
+def _write_workbook(path: Path, teams: list[str], n_players: int, rng):
+    """Altersstatistik-Arbeitsmappe: Gesamtübersicht + ein Blatt pro Team
+    (Startelf-Blöcke A:L, Kader P:Q wie von Durchschnittsalter.read_workbook erwartet)."""
+    import datetime
+    import pandas as pd
+    n_matches = 2 * (len(teams) - 1)
+    with pd.ExcelWriter(path, engine="openpyxl") as xl:
+        summary = pd.DataFrame({"Team": teams, "Altersdurchschnitt": [round(rng.uniform(19, 26), 2) for _ in teams]})
+        summary.to_excel(xl, sheet_name="Gesamtübersicht", index=False)
+        for team in teams:
+            players = [f"{team} Spieler {i:02d}" for i in range(n_players)]
+            rows = []
+            for r in range(max(n_matches, n_players)):
+                row = [None] * 17
+                if r < n_matches:
+                    row[0] = rng.choice([t for t in teams if t != team])
+                    row[1:12] = rng.sample(players, 11)
+                if r < n_players:
+                    row[15] = players[r]
+                    row[16] = datetime.datetime(1995, 1, 1) + datetime.timedelta(days=rng.randint(0, 12 * 365))
+                rows.append(row)
+            pd.DataFrame(rows).to_excel(xl, sheet_name=team, index=False, header=False)
+
+
+def _write_logo(path: Path, rng):
+    try:
+        from PIL import Image
+    except ImportError:
+        return
+    color = tuple(rng.randint(0, 255) for _ in range(3)) + (255,)
+    Image.new("RGBA", (400, 400), color).save(path)
+
+
+def _schedule_page(teams: list[str], rng) -> str:
+    """Liga-Spielplan (zukünftige Spiele, Paarungen 'Heim - Gast' mit Datum davor)."""
+    import datetime
+    start = datetime.date.today() + datetime.timedelta(days=3)
+    rows = []
+    for rnd in range(2 * (len(teams) - 1)):
+        date = start + datetime.timedelta(days=7 * rnd)
+        order = rng.sample(teams, len(teams))
+        for home, away in zip(order[::2], order[1::2]):
+            home, away = ("Junge Wikinger Ried" if t == "JWR" else t for t in (home, away))
+            rows.append(f"<tr><td>Sa, {date:%d.%m.%Y}</td><td>{home} - {away}</td></tr>")
+    filler = "<div class='teaser'><a href='/artikel'><span>Schlagzeile</span></a></div>\n" * 2000
+    return f"<html><body>{filler}<table>{''.join(rows)}</table>{filler}</body></html>"
+
+
+def _ticker_page(teams: list[str]) -> str:
+    """Ticker-Spielplan der eigenen Mannschaft (Datum + Live-Ticker-Link '...-gegen-...')."""
+    import datetime
+    start = datetime.date.today() + datetime.timedelta(days=3)
+    items = []
+    for rnd, opp in enumerate(teams[1:] * 2):
+        date = start + datetime.timedelta(days=7 * rnd)
+        slug = f"junge-wikinger-ried-gegen-{opp.lower()}" if rnd % 2 else f"{opp.lower()}-gegen-junge-wikinger-ried"
+        items.append(f"<div class='match'><span>{date:%d.%m.%Y}</span>"
+                     f"<a href='/live-ticker/{1000 + rnd}/{slug}/'>Details</a></div>")
+    filler = "<div class='nav-item'><a href='/verein/seite'>Menüpunkt</a></div>\n" * 3000
+    return f"<html><body>{filler}{''.join(items)}{filler}</body></html>"
+
+
+def _oefb_spiele_page(teams: list[str]) -> str:
+    """ÖFB-Spielseite der eigenen Mannschaft: Links auf die Mannschaftsseiten der Gegner."""
+    links = [f"<a href='https://vereine.oefb.at/{t}/Mannschaften/Saison-2025-26/KM/Spiele'>{t}</a>"
+             for t in teams[1:]]
+    own = "<a href='/SVOberbankRied/Mannschaften/Saison-2025-26/KM-Amat-/Kader'>Kader</a>"
+    return f"<html><body>{own}{''.join(links * 2)}</body></html>"
+
+
+def _write_fixtures(fixture_dir: Path, pages: dict[str, str]):
+    """Seiten im Format von http_fixtures (Datei + index.json) ablegen."""
+    import http_fixtures
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    index = {}
+    for url, html in pages.items():
+        name = http_fixtures.fixture_path(url).name
+        (fixture_dir / name).write_text(html, encoding="utf-8")
+        index[url] = {"file": name, "status": 200, "recorded": "synthetisch"}
+    (fixture_dir / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def generate_league(root: Path, n_teams: int = 16, n_scripts: int = 10, n_clips: int = 3000,
+                    n_players: int = 30, seed: int = 42) -> dict:
+    """Synthetische Liga unter root:
+        analysen/<Team>/EigeneTore<Team>_NN.py, GegenTore<Team>_NN.py (je n_scripts) + Logo
+        videos/<Team>/NN_<Team>_<Gegner>_<Kategorie>_<Torschütze>.mp4 (n_clips gesamt, leer)
+        Statistik Altersdurchschnitt.xlsx (Übersicht + ein Blatt pro Team)
+        http/ – Spielplan-, Ticker-, Tabellen- und Kaderseiten als Replay-Fixtures
+    """
+    import random
+    rng = random.Random(seed)
+    teams = _synth_teams(n_teams)
+    base, videos = root / "analysen", root / "videos"
+    for team in teams:
+        team_dir = base / team
+        team_dir.mkdir(parents=True, exist_ok=True)
+        for k in range(n_scripts):
+            for kind, prefix in (("Eigene Tore", "EigeneTore"), ("Gegentore", "GegenTore")):
+                (team_dir / f"{prefix}{team}_{k:02d}.py").write_text(
+                    _goal_script(team, kind, rng, rng.randint(3, 15)), encoding="utf-8")
+        _write_logo(team_dir / "logo.png", rng)
+        (videos / team).mkdir(parents=True, exist_ok=True)
+    for i in range(n_clips):
+        team = teams[i % len(teams)]
+        opp = rng.choice([t for t in teams if t != team])
+        name = f"{i // len(teams) % 30 + 1:02d}_{team}_{opp}_{rng.choice(CLIP_CATEGORIES)}_{rng.choice(SYNTH_SCORERS)}.mp4"
+        (videos / team / name).touch()
+    excel = root / "Statistik Altersdurchschnitt.xlsx"
+    _write_workbook(excel, teams, n_players, rng)
+
+    dash = _import_dashboard()
+    pages = {url: _schedule_page(teams, rng) for url in dash.LIGAPORTAL_SCHEDULE_URLS}
+    pages[dash.LIGAPORTAL_TICKER_SCHEDULE_URL] = _ticker_page(teams)
+    pages[dash.RL_MITTE_TABLE_URL] = synthetic_table_page(n_teams)
+    pages[dash.OEFB_SPIELE_URL] = _oefb_spiele_page(teams)
+    kader_urls = [f"https://vereine.oefb.at/{t}/Mannschaften/Saison-2025-26/KM/Kader" for t in teams[1:]]
+    pages.update({url: synthetic_kader_page(n_players) for url in [*dash.OEFB_KADER_URLS.values(), *kader_urls]})
+    _write_fixtures(root / "http", pages)
+    return {"teams": teams, "base": base, "videos": videos, "excel": excel, "fixtures": root / "http"}
+
+
+def _cold(cached_fn, *args):
+    """Aufruf einer st.cache_data-Funktion ohne Cache-Treffer (Cache vorher geleert)."""
+    def run():
+        cached_fn.clear()
+        return cached_fn(*args)
+    return run
+
+
+def suite_benchmarks(league: dict, cache_dir: Path) -> list[tuple[str, object]]:
+    """(Name, Aufruf) je gemessenem Datenpfad; Dashboard-Konstanten zeigen auf die synthetische Liga."""
+    import shutil
+    import matplotlib
+    matplotlib.use("Agg")
+    import http_fixtures
+    import Durchschnittsalter as alter
+    dash = _import_dashboard()
+
+    http_fixtures.FIXTURE_DIR = league["fixtures"]
+    http_fixtures.set_http_mode("replay")
+    dash.BASE_DIR, dash.RL_VIDEOS_BASE, dash.LOGO_PATH = league["base"], league["videos"], None
+    dash.CACHE_DIR = cache_dir
+    dash.TABLE_HISTORY_FILE = cache_dir / "rl_mitte_tabelle"
+    dash.KARTEN_DB = cache_dir / "karten.sqlite"
+
+    base, teams = league["base"], league["teams"]
+    clips = sorted(f for d in league["videos"].iterdir() for f in d.iterdir())
+    opponent = teams[len(teams) // 2]
+    goals, assists, _ = dash.parse_goals_assists(base / teams[0] / f"EigeneTore{teams[0]}_00.py")
+    excel = str(league["excel"])
+
+    def birth_quarters_excel():
+        shutil.rmtree(league["excel"].parent / alter.SIDECAR_DIRNAME, ignore_errors=True)
+        alter.load_workbook.clear()
+        return alter.load_birth_quarter_data(excel)
+
+    def birth_quarters_sidecar():
+        alter.load_workbook.clear()
+        return alter.load_birth_quarter_data(excel)
+
+    def pitch():
+        fig, ax = dash.plt.subplots(figsize=(2.0, 4.0))
+        dash.draw_pitch(ax, teams[0])
+        dash.plot_events(ax, goals, assists, add_legend=True, label_prefix=teams[0])
+        fig.canvas.draw()
+        dash.plt.close(fig)
+
+    con = dash._karten_connect()
+
+    def kader_sync():
+        with con:  # voller Abgleich statt "Seite unverändert"
+            con.execute("DELETE FROM karten_sync")
+        return sum(dash.sync_kaderdaten(con, team, url) for team, url in dash._kader_urls(con).items())
+
+    return [
+        ("list_teams_and_files", _cold(dash.list_teams_and_files, base, dash.PREFERRED_TEAM)),
+        ("count_zone_split_all_teams", lambda: dash.count_zone_split_all_teams(base, teams)),
+        ("load_opponent_goals_against", _cold(dash.load_opponent_goals_against, opponent)),
+        ("extract_scorer_table", lambda: dash.extract_scorer_table(clips)),
+        ("birth_quarters_excel", birth_quarters_excel),
+        ("birth_quarters_sidecar", birth_quarters_sidecar),
+        ("draw_pitch+plot_events", pitch),
+        ("scraper_spielplan", lambda: dash._fetch_next_opponent(dash.PREFERRED_TEAM)),
+        ("scraper_ticker", lambda: dash.get_next_opponent_from_ligaportal(dash.PREFERRED_TEAM)),
+        ("scraper_tabelle", _cold(dash.fetch_rl_mitte_table)),
+        ("scraper_kader", kader_sync),
+    ]
+
+
+def bench_suite(args):
+    import tempfile
+    scale = f"{args.teams}x{args.scripts}-{args.clips}"
+    with tempfile.TemporaryDirectory(prefix="dashboard-suite-") as tmp:
+        root = Path(args.dir) if args.dir else Path(tmp)
+        t0 = time.perf_counter()
+        league = generate_league(root, args.teams, args.scripts, args.clips, args.players)
+        print(f"Synthetische Liga ({scale}, {args.players} Spieler/Team) in {time.perf_counter() - t0:.1f} s: {root}")
+        values = {}
+        for name, fn in suite_benchmarks(league, root / "cache"):
+            times = timeit(fn, n=args.n)
+            report(name, times)
+            values[name] = min(times)  # Minimum: am wenigsten vom Rauschen anderer Prozesse abhängig
+    if args.save:
+        save_baseline(f"suite-{scale}", values)
+        print(f"Baseline gespeichert: {BASELINE_FILE}")
+    print(f"Vergleich mit Baseline suite-{scale}:")
+    problems = compare_baseline(f"suite-{scale}", values, args.tolerance)
+    for p in problems:
+        print("REGRESSION:", p)
+    return 1 if problems else 0
+
+
+# ========================= CLI =========================
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Dashboard-Benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("kader", help="Kader-Extraktion alt vs. neu")
+    p.add_argument("--html", help="Gespeicherte ÖFB-Kaderseite (sonst synthetisch)")
+    p.add_argument("-n", type=int, default=20)
+    p.set_defaults(func=bench_kader)
+    p = sub.add_parser("table", help="Tabellen-Parser BeautifulSoup vs. lxml")
+    p.add_argument("--html", help="Gespeicherte Tabellenseite (sonst Fixture bzw. synthetisch)")
+    p.add_argument("-n", type=int, default=20)
+    p.set_defaults(func=bench_table)
+    p = sub.add_parser("record", help="Scraper-Seiten live abrufen und als Fixtures speichern")
+    p.set_defaults(func=bench_record)
+    p = sub.add_parser("fixtures", help="Parser über aufgezeichnete Seiten messen (offline)")
+    p.add_argument("-n", type=int, default=20)
+    p.set_defaults(func=bench_fixtures)
+    p = sub.add_parser("startup", help="Import-Zeit und Zeit bis zum ersten Render (Regressionstest)")
+    p.add_argument("-n", type=int, default=3)
+    p.add_argument("--teams", type=int, default=16)
+    p.add_argument("--scripts", type=int, default=10, help="Tor-Skripte je Team und Art (eigene/gegen)")
+    p.add_argument("--clips", type=int, default=3000, help="Video-Clips gesamt")
+    p.add_argument("--save", action="store_true", help="Messung als neue Baseline speichern")
+    p.set_defaults(func=bench_startup)
+    p = sub.add_parser("suite", help="Datenpfade gegen eine synthetische Liga (Regressionstest)")
+    p.add_argument("--teams", type=int, default=16)
+    p.add_argument("--scripts", type=int, default=10, help="Tor-Skripte je Team und Art (eigene/gegen)")
+    p.add_argument("--clips", type=int, default=3000, help="Video-Clips gesamt")
+    p.add_argument("--players", type=int, default=30, help="Kadergröße je Team")
+    p.add_argument("--dir", help="Liga hier erzeugen und behalten (sonst temporär)")
+    p.add_argument("-n", type=int, default=5)
+    p.add_argument("--tolerance", type=float, default=SUITE_TOLERANCE, help="erlaubte Verlangsamung (1.0 = +100 %%)")
+    p.add_argument("--save", action="store_true", help="Messung als neue Baseline speichern")
+    p.set_defaults(func=bench_suite)
+    args = ap.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
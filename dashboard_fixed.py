@@ -1,25 +1,59 @@
-from bs4 import BeautifulSoup
 # streamlit run dashboard_fixed.py
 # -*- coding: utf-8 -*-
+from __future__ import annotations
 
+import io
 import os
 import re
 import ast
-import base64
+import functools
 import time
 import datetime
-import json
+import hashlib
+import importlib
+import sqlite3
+import threading
 from pathlib import Path
 from collections import Counter, defaultdict
 from urllib.parse import quote_plus, unquote_plus
 
 import streamlit as st
-import matplotlib.pyplot as plt
-plt.style.use('dark_background')
-from matplotlib import patches
-import matplotlib.image as mpimg
-import pandas as pd
-import requests
+
+from http_fixtures import http_get
+from spaltenspeicher import read_frame, write_frame, frame_mtime
+from oefb_preloads import find_preload_value
+from laufzeiten import (timed, messen, cache_miss, rerun_scope, annotate, last_reruns, summarize,
+                        export_jsonl, MAX_RERUNS, PERF_LOG)
+import kommentare
+import spielerindex
+import suchindex
+import matchplanindex
+from logo_assets import find_logo, data_uri, sprite_sheet, publish_static, sprite_url, sprite_row_html, pitch_texture
+
+# ========================= Lazy Imports =========================
+# pandas/matplotlib (~0.3–0.4 s) erst beim ersten Zugriff laden: Individuelle Analysen
+# und Gegneranalyse brauchen weder Plot- noch Scraping-Stack. bs4/requests werden
+# direkt in den Funktionen importiert, die sie brauchen.
+class _LazyModule:
+    """Importiert ein Modul beim ersten Attributzugriff (optional mit Setup, z.B. Plot-Style)."""
+
+    def __init__(self, name: str, on_import=None):
+        self._name = name
+        self._on_import = on_import
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_import:
+                self._on_import(module)
+            self._module = module
+        return getattr(self._module, attr)
+
+pd = _LazyModule("pandas")
+plt = _LazyModule("matplotlib.pyplot", on_import=lambda m: m.style.use('dark_background'))
+patches = _LazyModule("matplotlib.patches")
+mpimg = _LazyModule("matplotlib.image")
 
 def _parse_date_safe(date_str: str) -> datetime.date | None:
     """Robuste Datumserkennung; vermeidet strptime-Formate ohne Jahr (Deprecation ab Python 3.15)."""
@@ -59,11 +93,31 @@ IND_ANALYSEN_BASE = Path(r"C:\Users\demmelb-ma\OneDrive\JWR\Individuelle Analyse
 VIDEOS_BASE = Path(r"C:\Users\demmelb-ma\OneDrive\JWR\Videos")            # Neue Videos-Basis
 VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".avi", ".mkv", ".webm"}
 DOC_EXTS = {".pptx", ".pdf", ".xlsx"}
-COMMENTS_FILE = BASE_DIR / "video_comments.json"  # Datei für gespeicherte Kommentare
-# Neuer Pfad für das Altersstatistik-Skript
-ALTERSSTATISTIK_SCRIPT = Path(r"C:\Users\demmelb-ma\OneDrive - COC AG\JWR\Matches\2526\Durchschnittsalter.py")
+COMMENTS_FILE = BASE_DIR / "video_comments.json"  # alte Kommentar-Datei (wird einmalig übernommen)
+# Lokal und nicht synchronisiert: SQLite (WAL, -wal/-shm) verträgt keinen Abgleich über OneDrive
+# zwischen Rechnern. Der Kommentar-Speicher gilt pro Rechner (alle Sitzungen dieses Dashboards).
+LOCAL_DATA_DIR = Path(os.environ.get("LOCALAPPDATA") or Path.home() / ".local" / "share") / "JWR-Dashboard"
+COMMENTS_DB = LOCAL_DATA_DIR / "video_comments.sqlite"  # Video-Kommentare mit Versionen (siehe kommentare.py)
 # Pfad zur Excel-Datei für Altersstatistik (falls vorhanden)
 ALTERSSTATISTIK_EXCEL = Path(r"C:\Users\demmelb-ma\OneDrive - COC AG\JWR\Matches\2526\Statistik Altersdurchschnitt.xlsx")
+# Lokale Caches (Tabellen-Historie etc.) – Punkt-Ordner, taucht nicht als Team auf
+CACHE_DIR = BASE_DIR / ".dashboard_cache"
+TABLE_HISTORY_FILE = CACHE_DIR / "rl_mitte_tabelle"  # Tabellen-Snapshots (Parquet/CSV)
+KARTEN_DB = CACHE_DIR / "karten.sqlite"               # Kartenstand + Historie aller Teams
+LOGO_CACHE_DIR = CACHE_DIR / "logos"                  # verkleinerte Logos (Sprite-Sheet)
+THUMB_DIR = CACHE_DIR / "thumbs"                      # Clip-Vorschaubilder (nur mit OpenCV)
+SEARCH_DB = CACHE_DIR / "suche.sqlite"                # Volltextindex (Clips, Kommentare, PPTX/PDF)
+MATCHPLAN_THUMB_DIR = CACHE_DIR / "folien"           # Folien-Vorschau der Matchplan-Decks (ohne Windows)
+STATIC_DIR = Path(__file__).parent / "static"         # Streamlit-Static-Serving (app/static/...)
+KARTEN_SYNC_INTERVAL = 900                            # Sekunden zwischen zwei Kader-Syncs
+KARTEN_MAX_SCHWELLE = 10                              # höchster wählbarer Schwellwert
+# ÖFB-Kaderseiten je Team (Ordnername -> URL). Die übrigen Liga-Teams werden aus den Links
+# der JWR-Spielseite abgeleitet (discover_kader_urls); Einträge hier haben Vorrang, z.B. wenn
+# ein Vereinsname nicht auf den Ordnernamen passt.
+OEFB_KADER_URLS = {
+    "JWR": "https://vereine.oefb.at/SVOberbankRied/Mannschaften/Saison-2025-26/KM-Amat-/Kader",
+}
+OEFB_SPIELE_URL = "https://vereine.oefb.at/SVOberbankRied/Mannschaften/Saison-2025-26/KM-Amat-/Spiele"
 # --- Netz-Settings
 HTTP_HEADERS = {"Cache-Control": "no-cache", "User-Agent": "Mozilla/5.0"}
 HTTP_TIMEOUT = (3.0, 4.0)  # (connect, read) kurz halten
@@ -77,6 +131,9 @@ LIGAPORTAL_SCHEDULE_URLS = [
     "https://www.ligaportal.at/oberoesterreich/regionalliga-mitte/spielplan",
 ]
 
+# Ticker-Spielplan der eigenen Mannschaft (Button "Nächster Gegner")
+LIGAPORTAL_TICKER_SCHEDULE_URL = "https://ticker.ligaportal.at/mannschaft/65/junge-wikinger-ried/spielplan"
+
 # Tabelle Regionalliga Mitte
 RL_MITTE_TABLE_URL = "https://www.ligaportal.at/regionalliga-mitte/tabelle"
 
@@ -112,6 +169,7 @@ st.markdown(
       .logo-row { display:flex; align-items:center; gap:10px; flex-wrap:wrap; justify-content:flex-start; margin-top:0.75rem; margin-bottom:0.5rem; overflow:visible; }
       .logo-row img { border-radius:4px; max-height:28px; display:block; cursor:pointer; background:transparent; padding:2px; }
       .logo-row a { text-decoration:none; }
+      .logo-row .logo-sprite { display:block; height:28px; border-radius:4px; cursor:pointer; background-repeat:no-repeat; }
 
       /* Controls */
       .stRadio > div { gap: 0.5rem; }
@@ -231,12 +289,16 @@ def _extract_matches_generic_cached(html: str, aliases_key: tuple[str, ...]):
 @st.cache_data(ttl=900, show_spinner=False)  # 15 Min Cache
 def get_next_opponent(team: str = "JWR") -> str | None:
     """Ermittelt den nächsten Gegner (cached) – nur über Ligaportal."""
+    return _fetch_next_opponent(team)
+
+@timed()
+def _fetch_next_opponent(team: str) -> str | None:
     aliases = tuple(get_team_aliases(team))  # cache key muss hashbar sein
     try:
         all_matches = []
         for url in LIGAPORTAL_SCHEDULE_URLS:
             try:
-                lp_html = requests.get(url, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, allow_redirects=True).text
+                lp_html = http_get(url, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, allow_redirects=True).text
                 matches = _extract_matches_generic_cached(lp_html, aliases)
                 all_matches.extend(matches)
             except Exception:
@@ -252,6 +314,98 @@ def get_next_opponent(team: str = "JWR") -> str | None:
         pass
     return None
 
+@st.cache_resource(ttl=900, show_spinner=False)
+def _next_opponent_job(team: str) -> dict:
+    """Gegner-Erkennung im Hintergrund (prozessweit, alle 15 Min neu). Sobald job['done']
+    gesetzt ist, steht das Ergebnis in job['value'] (None wenn nichts gefunden)."""
+    job = {"value": None, "done": threading.Event()}
+
+    def run():
+        try:
+            job["value"] = _fetch_next_opponent(team)
+        finally:
+            job["done"].set()
+
+    threading.Thread(target=run, name="gegner-erkennung", daemon=True).start()
+    return job
+
+def next_opponent_if_ready(team: str) -> str | None:
+    """Nächster Gegner, falls die Hintergrund-Erkennung schon fertig ist – blockiert nie."""
+    job = _next_opponent_job(team)
+    return job["value"] if job["done"].is_set() else None
+
+def _normalize_ticker_team_name(s: str) -> str:
+    """Slug-Text ("sk treibach") in lesbaren Teamnamen wandeln."""
+    s = re.sub(r"\s+", " ", s).strip()
+    # Abkürzungen groß
+    tokens = s.split()
+    out = []
+    for t in tokens:
+        tt = t.lower()
+        if tt in {"sk","sv","ask","usv","fc","sc","dsc","wac","atsv","usk"}:
+            out.append(tt.upper())
+        elif tt == "st":
+            out.append("St.")
+        else:
+            # Word-case
+            out.append(t.capitalize())
+    name = " ".join(out)
+    # Spezifische Fälle
+    name = name.replace("St. Anna Am Aigen", "St. Anna")
+    name = name.replace("St Anna", "St. Anna")
+    name = name.replace("Junge Wikinger Ried", "Junge Wikinger Ried")
+    return name
+
+def parse_ticker_schedule(html: str, team_slug: str = "junge-wikinger-ried") -> list[tuple[datetime.date, str]]:
+    """Zukünftige Spiele (Datum, Gegner) aus einer Ligaportal-Ticker-Spielplanseite – nur Parsing."""
+    # Alle relevanten Live-Ticker/Details-Links sammeln, die beide Teams im Slug tragen
+    link_pat = re.compile(r'''/live-ticker/\d+/([^"'>]+)/?''', re.IGNORECASE)
+    date_pat = re.compile(r"(\d{2}\.\d{2}\.\d{4})")
+
+    today = datetime.date.today()
+    candidates: list[tuple[datetime.date, str]] = []
+
+    for m in link_pat.finditer(html):
+        slug = m.group(1)
+        if "gegen" not in slug or team_slug not in slug:
+            continue
+
+        # Position im HTML, um nahegelegenes Datum davor zu finden
+        pos = m.start()
+        window_start = max(0, pos - 3000)
+        context = html[window_start:pos]
+        dates = list(date_pat.finditer(context))
+        if not dates:
+            continue
+        date_str = dates[-1].group(1)  # letztes Datum vor dem Link
+        try:
+            game_date = datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
+        except Exception:
+            continue
+
+        if game_date < today:
+            continue
+
+        # Gegner aus dem Slug extrahieren
+        home_away = slug.split("-gegen-")
+        if len(home_away) != 2:
+            continue
+        left, right = home_away[0], home_away[1]
+        if team_slug in left:
+            opp_slug = right
+        elif team_slug in right:
+            opp_slug = left
+        else:
+            continue
+
+        # Slug in lesbaren Namen wandeln
+        opp_raw = opp_slug.replace("-", " ").strip()
+        candidates.append((game_date, _normalize_ticker_team_name(opp_raw)))
+
+    candidates.sort(key=lambda x: x[0])
+    return candidates
+
+@timed()
 def get_next_opponent_from_ligaportal(team: str = "JWR") -> str | None:
     """Ermittelt den nächsten Gegner direkt von der Ligaportal-Teamseite.
 
@@ -263,91 +417,12 @@ def get_next_opponent_from_ligaportal(team: str = "JWR") -> str | None:
     - Gib den Gegner des nächsten zukünftigen Spiels zurück
     """
     try:
-        import re
-        from datetime import datetime
-
-        url = "https://ticker.ligaportal.at/mannschaft/65/junge-wikinger-ried/spielplan"
-        resp = requests.get(url, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, allow_redirects=True)
+        resp = http_get(LIGAPORTAL_TICKER_SCHEDULE_URL, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, allow_redirects=True)
         if resp.status_code != 200:
             return None
-
-        html = resp.text
-
-        # Alle relevanten Live-Ticker/Details-Links sammeln, die beide Teams im Slug tragen
-        link_pat = re.compile(r'''/live-ticker/\d+/([^"'>]+)/?''', re.IGNORECASE)
-        date_pat = re.compile(r"(\d{2}\.\d{2}\.\d{4})")
-
-        today = datetime.now().date()
-        candidates: list[tuple[datetime, str]] = []
-
-        for m in link_pat.finditer(html):
-            slug = m.group(1)
-            if "gegen" not in slug or "junge-wikinger-ried" not in slug:
-                continue
-
-            # Position im HTML, um nahegelegenes Datum davor zu finden
-            pos = m.start()
-            window_start = max(0, pos - 3000)
-            context = html[window_start:pos]
-            dates = list(date_pat.finditer(context))
-            if not dates:
-                continue
-            date_str = dates[-1].group(1)  # letztes Datum vor dem Link
-            try:
-                game_date = datetime.strptime(date_str, "%d.%m.%Y").date()
-            except Exception:
-                continue
-
-            if game_date < today:
-                continue
-
-            # Gegner aus dem Slug extrahieren
-            home_away = slug.split("-gegen-")
-            if len(home_away) != 2:
-                continue
-            left, right = home_away[0], home_away[1]
-            if "junge-wikinger-ried" in left:
-                opp_slug = right
-            elif "junge-wikinger-ried" in right:
-                opp_slug = left
-            else:
-                continue
-
-            # Slug in lesbaren Namen wandeln
-            opp_raw = opp_slug.replace("-", " ").strip()
-
-            # Spezielle Normalisierungen
-            def normalize_team_name(s: str) -> str:
-                s = re.sub(r"\s+", " ", s).strip()
-                # Abkürzungen groß
-                tokens = s.split()
-                out = []
-                for t in tokens:
-                    tt = t.lower()
-                    if tt in {"sk","sv","ask","usv","fc","sc","dsc","wac","atsv","usk"}:
-                        out.append(tt.upper())
-                    elif tt == "st":
-                        out.append("St.")
-                    else:
-                        # Word-case
-                        out.append(t.capitalize())
-                name = " ".join(out)
-                # Spezifische Fälle
-                name = name.replace("St. Anna Am Aigen", "St. Anna")
-                name = name.replace("St Anna", "St. Anna")
-                name = name.replace("Junge Wikinger Ried", "Junge Wikinger Ried")
-                return name
-
-            opponent_name = normalize_team_name(opp_raw)
-            candidates.append((game_date, opponent_name))
-
-        if not candidates:
-            return None
-
+        candidates = parse_ticker_schedule(resp.text)
         # Nächstes Spiel wählen
-        candidates.sort(key=lambda x: x[0])
-        return candidates[0][1]
-
+        return candidates[0][1] if candidates else None
     except Exception:
         return None
 
@@ -409,7 +484,7 @@ def list_teams_and_files(base_dir: Path, preferred: str = "JWR"):
     for p in sorted(base_dir.iterdir() if base_dir.exists() else []):
         if p.is_dir():
             # System-Ordner und virtuelle Umgebungen ausblenden
-            if p.name in ['.devcontainer', '.git', '__pycache__', '.venv', 'venv', 'env', '.env']:
+            if p.name in ['.devcontainer', '.git', '__pycache__', '.venv', 'venv', 'env', '.env', CACHE_DIR.name]:
                 continue
             teams.append(p.name)
             files = sorted(list(p.glob("*.py")))
@@ -458,6 +533,7 @@ def parse_title(src: str):
     title = m.group(1)
     return title.replace("\\n", "\n")
 
+@timed()
 def parse_goals_assists(file_path: Path):
     if not file_path:
         return [], [], None
@@ -471,32 +547,44 @@ def parse_goals_assists(file_path: Path):
     return goals, assists, title
 
 def find_team_logo(team: str):
-    team_dir = BASE_DIR / team
-    exts = ("*.png", "*.jpg", "*.jpeg", "*.bmp")
-    imgs = []
-    for ext in exts:
-        imgs.extend(sorted(team_dir.glob(ext)))
-    if imgs:
-        return imgs[0]
+    logo = find_logo(BASE_DIR / team)
+    if logo:
+        return logo
     if LOGO_PATH and LOGO_PATH.exists():
         return LOGO_PATH
     return None
 
 def encode_image_base64(path: Path):
-    mime = "image/png"
-    name = path.name.lower()
-    if name.endswith(".jpg") or name.endswith(".jpeg"):
-        mime = "image/jpeg"
-    elif name.endswith(".bmp"):
-        mime = "image/bmp"
-    elif name.endswith(".png"):
-        mime = "image/png"
-    try:
-        data = path.read_bytes()
-        b64 = base64.b64encode(data).decode()
-        return f"data:{mime};base64,{b64}"
-    except Exception:
-        return None
+    return data_uri(path)
+
+@st.cache_data(show_spinner=False)
+def _logo_row_html(logos: tuple[tuple[str, str, float], ...], static_serving: bool) -> str:
+    """HTML der Logo-Zeile; Key = (Team, Logo-Pfad, mtime) aller Teams, d.h. neu gebaut
+    wird nur, wenn ein Logo dazukommt oder sich ändert."""
+    links = [(f"?open={quote_plus(t)}", f"LineUp {t} öffnen", t) for t, _, _ in logos]
+    sprite = sprite_sheet([Path(p) for _, p, _ in logos], LOGO_CACHE_DIR)
+    if sprite is None:  # ohne Pillow: Originale wie bisher
+        imgs = []
+        for (href, title, alt), (_, p, _) in zip(links, logos):
+            uri = encode_image_base64(Path(p))
+            if uri:
+                imgs.append(f'<a href="{href}" target="_self" title="{title}"><img src="{uri}" alt="{alt}" /></a>')
+        return '<div class="logo-row">' + ''.join(imgs) + '</div>'
+    url = (publish_static(sprite, STATIC_DIR) if static_serving else None) or sprite_url(sprite)
+    return sprite_row_html(links, sprite["widths"], url)
+
+def team_logo_row(teams) -> str:
+    """Logo-Zeile für alle Teams (pro Rerun nur stat-Aufrufe, kein Lesen/Encodieren)."""
+    logos = []
+    for t in teams:
+        lp = find_team_logo(t)
+        try:
+            logos.append((t, str(lp), lp.stat().st_mtime))
+        except (AttributeError, OSError):
+            continue
+    if not logos:
+        return ""
+    return _logo_row_html(tuple(logos), bool(st.get_option("server.enableStaticServing")))
 
 def int_to_roman(n: int) -> str:
     vals = [(1000,'M'),(900,'CM'),(500,'D'),(400,'CD'),(100,'C'),(90,'XC'),(50,'L'),(40,'XL'),(10,'X'),(9,'IX'),(5,'V'),(4,'IV'),(1,'I')]
@@ -552,8 +640,10 @@ def build_labels_with_roman(files):
         labels.append(base)
     return labels
 
+@timed(cache=True)
 @st.cache_data(show_spinner=False)
 def load_team_videos(team: str):
+    cache_miss("load_team_videos")
     resolved_dir = resolve_video_dir_for_team(team)
     vids = {'Elfmeter': [], '1 Touch': [], '2 Touch': [], 'Sonstiges': []}
     if not resolved_dir or not resolved_dir.exists():
@@ -571,9 +661,11 @@ def load_team_videos(team: str):
             vids['Sonstiges'].append(f)
     return vids
 
+@timed(cache=True)
 @st.cache_data(show_spinner=False)
 def load_opponent_goals_against(opponent: str):
     """Lädt alle Videos, wo der Gegner als TeamB (zweites Team) im Dateinamen vorkommt."""
+    cache_miss("load_opponent_goals_against")
     vids = {'Elfmeter': [], '1 Touch': [], '2 Touch': [], 'Sonstiges': []}
     
     # Im RL_VIDEOS_BASE Verzeichnis nach Videos suchen
@@ -612,74 +704,128 @@ def load_opponent_goals_against(opponent: str):
     return vids
 
 # ========================= Matchplan-Auflösung (robust) =========================
-@st.cache_data(show_spinner=False)
-def list_matchplan_team_dirs(base: Path):
-    mapping = {}
-    if base.exists():
-        for p in sorted(base.iterdir()):
-            if p.is_dir():
-                mapping[_normalize_name(p.name)] = p
-    return mapping
+@st.cache_resource(show_spinner=False)
+def get_matchplan_index() -> matchplanindex.MatchplanIndex:
+    """Prozessweiter Index der LineUp-/Gegneranalyse-Decks; ein Watcher-Thread hält ihn aktuell.
+    Folien-Vorschauen nur dort, wo os.startfile fehlt."""
+    index = matchplanindex.MatchplanIndex(MATCHPLAN_BASE, thumb_dir=MATCHPLAN_THUMB_DIR if os.name != "nt" else None)
+    index.refresh()
+    index.start()
+    return index
+
+def resolve_matchplan_deck(team: str, kind: str = "LineUp") -> dict | None:
+    """Neuestes Deck zum Team: Dict-Lookup über Ordner-/Dateiname, sonst ohne Präfixe
+    (SV, FC, …) über die Schlüssel im Speicher – kein Verzeichnislauf."""
+    index = get_matchplan_index()
+    deck = index.latest(kind, team)
+    if deck is not None:
+        return deck
+    stripped = _strip_tokens(_normalize_name(team))
+    if not stripped:
+        return None
+    for key in sorted(index.keys(kind)):
+        ks = _strip_tokens(key)
+        if ks == stripped or key.startswith(stripped) or stripped.startswith(key) or ks.startswith(stripped) or stripped.startswith(ks):
+            return index.latest(kind, key)
+    return None
 
 def resolve_matchplan_ppt(team: str):
-    if not MATCHPLAN_BASE.exists():
-        return None
-    norm_team = _normalize_name(team)
-    stripped = _strip_tokens(norm_team)
-    dir_map = list_matchplan_team_dirs(MATCHPLAN_BASE)
-    candidate_dir = None
-    if norm_team in dir_map:
-        candidate_dir = dir_map[norm_team]
+    deck = resolve_matchplan_deck(team, "LineUp")
+    return deck["pfad"] if deck else None
+
+def render_deck_preview(deck: dict):
+    """Ersatz für os.startfile: Folien als Vorschaubilder, sonst Name und Folienanzahl."""
+    folien = f" ({deck['folien']} Folien)" if deck.get("folien") else ""
+    if deck.get("vorschau"):
+        with st.expander(f"📊 {deck['pfad'].name}{folien}", expanded=True):
+            st.image([str(p) for p in deck["vorschau"]], width=220,
+                     caption=[f"Folie {i}" for i in range(1, len(deck["vorschau"]) + 1)])
     else:
-        for key, path in dir_map.items():
-            ks = _strip_tokens(key)
-            if ks == stripped or key.startswith(stripped) or stripped.startswith(key) or ks.startswith(stripped) or stripped.startswith(ks):
-                candidate_dir = path
-                break
-    if candidate_dir:
-        exact = candidate_dir / f"LineUp_{team}.pptx"
-        if exact.exists():
-            return exact
-        hits = sorted(candidate_dir.glob("LineUp_*.pptx"))
-        if hits:
-            return hits[0]
-    for p in sorted(MATCHPLAN_BASE.rglob("LineUp_*.pptx")):
-        name_norm = _normalize_name(p.stem.replace("LineUp_", ""))
-        if stripped in _strip_tokens(name_norm):
-            return p
-    return None
+        st.info(f"PowerPoint-Datei gefunden: {deck['pfad'].name}{folien}")
+
+def _table_row_from_cols(cols: list[str]) -> dict | None:
+    """Eine Tabellenzeile aus Zellentexten. Erwartet: [Platz, Team, S, G, U, V, Tore, D, P, ...]"""
+    if len(cols) < 9 or not cols[0].endswith('.'):
+        return None
+    try:
+        _int = lambda v: int(v) if v.lstrip("+-").isdigit() else None
+        return {
+            "rank": int(cols[0].replace('.', '')),
+            "team": cols[1],
+            "played": _int(cols[2]),
+            "wins": _int(cols[3]),
+            "draws": _int(cols[4]),
+            "losses": _int(cols[5]),
+            "goals": cols[6],  # z.B. 7:13
+            "goal_diff": _int(cols[7]),
+            "points": cols[8],
+        }
+    except Exception:
+        return None
 
+def _parse_rl_table_lxml(html: str) -> list[dict] | None:
+    """Schneller Pfad über lxml (C-Parser); None wenn lxml nicht installiert ist."""
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        return None
+    table = lxml_html.fromstring(html).find(".//table")
+    if table is None:
+        return []
+    rows = []
+    for tr in table.iter("tr"):
+        # wie BeautifulSoup get_text(strip=True): Textstücke einzeln strippen und zusammenfügen
+        cols = ["".join(t.strip() for t in c.itertext()) for c in tr if c.tag in ("td", "th")]
+        row = _table_row_from_cols(cols)
+        if row:
+            rows.append(row)
+    return rows
+
+def _parse_rl_table_bs4(html: str) -> list[dict]:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table")
+    rows = []
+    if not table:
+        return rows
+    for tr in table.find_all("tr"):
+        cols = [c.get_text(strip=True) for c in tr.find_all(["td","th"]) ]
+        row = _table_row_from_cols(cols)
+        if row:
+            rows.append(row)
+    return rows
+
+def parse_rl_mitte_table(html: str) -> list[dict]:
+    """Liest die Tabellenzeilen (rank, team, played, wins, draws, losses, goals, goal_diff, points)
+    aus dem HTML – lxml wenn verfügbar, sonst BeautifulSoup. Nur Parsing, kein Request."""
+    try:
+        rows = _parse_rl_table_lxml(html)
+        if rows is not None:
+            return rows
+    except Exception:
+        pass
+    return _parse_rl_table_bs4(html)
+
+@timed(cache=True)
 @st.cache_data(ttl=900, show_spinner=False)
 def fetch_rl_mitte_table():
-    """Lädt die Tabelle und gibt Liste von Dicts mit rank, team, goals, points zurück."""
+    """Lädt die Tabelle und gibt Liste von Dicts (siehe parse_rl_mitte_table) zurück.
+
+    Jeder frische Abruf wird zusätzlich als Snapshot in der Tabellen-Historie abgelegt.
+    """
+    cache_miss("fetch_rl_mitte_table")
     try:
-        resp = requests.get(RL_MITTE_TABLE_URL, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, allow_redirects=True)
+        resp = http_get(RL_MITTE_TABLE_URL, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS, allow_redirects=True)
         html = resp.text
     except Exception:
         return []
 
     try:
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table")
-        rows = []
-        if not table:
-            return rows
-        for tr in table.find_all("tr"):
-            cols = [c.get_text(strip=True) for c in tr.find_all(["td","th"]) ]
-            # Erwartet: [Platz, Team, S, G, U, V, Tore, D, P, ...]
-            if len(cols) >= 9 and cols[0].endswith('.'):
-                try:
-                    rank_str = cols[0].replace('.', '')
-                    rank = int(rank_str)
-                    team = cols[1]
-                    goals = cols[6]  # z.B. 7:13
-                    points = cols[8]
-                    rows.append({"rank": rank, "team": team, "goals": goals, "points": points})
-                except Exception:
-                    continue
-        return rows
+        rows = parse_rl_mitte_table(html)
     except Exception:
         return []
+    store_table_snapshot(rows)
+    return rows
 
 def normalize_table_team_name(name: str) -> str:
     n = name.lower().strip()
@@ -737,42 +883,116 @@ def normalize_table_team_name(name: str) -> str:
     # Fallback: erste zwei Wörter kapitalisieren
     return " ".join([w.capitalize() for w in name.split()[:3]])
 
+def _table_team_key(team: str) -> str:
+    """Lookup-Schlüssel eines Ordner-/Tabellennamens (JWR ist bereits normiert)."""
+    return "JWR" if team == "JWR" else normalize_table_team_name(team)
+
+@st.cache_data(ttl=900, show_spinner=False)
+def get_table_index() -> dict:
+    """Team-Index über die aktuelle Tabelle: normierter Name -> Zeile (erster Treffer gewinnt)."""
+    index = {}
+    for r in fetch_rl_mitte_table():
+        index.setdefault(normalize_table_team_name(r.get("team", "")), r)
+    return index
+
 def get_team_table_info(team: str) -> dict | None:
-    rows = fetch_rl_mitte_table()
-    if not rows:
+    index = get_table_index()
+    if not index:
         return None
-    
-    # Spezielle Behandlung für JWR
-    if team == "JWR":
-        # Suche nach verschiedenen JWR-Varianten in der Tabelle
-        jwr_variants = ["junge wikinger ried", "junge wikinger r", "junge wikinger"]
-        for r in rows:
-            team_name = r.get("team", "").lower()
-            if any(variant in team_name for variant in jwr_variants):
-                return r
-    
-    target = normalize_table_team_name(team)
-    best = None
-    
+
+    target = _table_team_key(team)
+    best = index.get(target)
+
     # Debug: Zeige verfügbare Teams in der Tabelle
     if st.session_state.get('debug_table_teams', False):
-        available_teams = [normalize_table_team_name(r.get("team","")) for r in rows]
-        st.caption(f"Debug: Suche '{target}' in verfügbaren Teams: {available_teams}")
-    
-    for r in rows:
-        t = normalize_table_team_name(r.get("team",""))
-        if t == target:
-            best = r
-            break
-    
-    # Debug: Falls kein Match gefunden
-    if not best and st.session_state.get('debug_table_teams', False):
-        original_teams = [r.get("team","") for r in rows]
-        st.caption(f"Debug: Kein Match für '{target}' (Original: '{team}'). Originale Teams: {original_teams}")
-    
+        st.caption(f"Debug: Suche '{target}' in verfügbaren Teams: {list(index)}")
+        if not best:
+            original_teams = [r.get("team","") for r in index.values()]
+            st.caption(f"Debug: Kein Match für '{target}' (Original: '{team}'). Originale Teams: {original_teams}")
+
     return best
 
+# ========================= Tabellen-Historie (Snapshots) =========================
+TABLE_HISTORY_COLUMNS = ["ts", "team_key", "team", "rank", "played", "wins", "draws", "losses",
+                         "goals_for", "goals_against", "goal_diff", "points"]
+
+def _table_rows_to_frame(rows: list[dict]) -> pd.DataFrame:
+    """Wandelt Tabellenzeilen in einen Snapshot-DataFrame (ein Zeitstempel für alle Zeilen)."""
+    ts = pd.Timestamp.now(tz="UTC").floor("s")
+    recs = []
+    for r in rows:
+        gf, _, ga = str(r.get("goals", "")).partition(":")
+        recs.append({
+            "ts": ts,
+            "team_key": normalize_table_team_name(r.get("team", "")),
+            "team": r.get("team", ""),
+            "rank": int(r["rank"]),
+            "played": r.get("played"),
+            "wins": r.get("wins"),
+            "draws": r.get("draws"),
+            "losses": r.get("losses"),
+            "goals_for": int(gf) if gf.strip().isdigit() else None,
+            "goals_against": int(ga) if ga.strip().isdigit() else None,
+            "goal_diff": r.get("goal_diff"),
+            "points": int(r["points"]) if str(r.get("points", "")).isdigit() else None,
+        })
+    df = pd.DataFrame.from_records(recs, columns=TABLE_HISTORY_COLUMNS)
+    for c in TABLE_HISTORY_COLUMNS[3:]:
+        df[c] = df[c].astype("Int16")
+    return df
+
+@st.cache_resource(show_spinner=False)
+def _table_history_lock() -> threading.Lock:
+    """Prozessweite Sperre für Lesen-Anhängen-Schreiben der Tabellen-Historie (alle Sitzungen)."""
+    return threading.Lock()
+
+def store_table_snapshot(rows: list[dict]) -> bool:
+    """Speichert einen Tabellen-Snapshot, sofern sich die Tabelle seit dem letzten geändert hat."""
+    if not rows:
+        return False
+    snap = _table_rows_to_frame(rows)
+    # ohne Sperre: zwei Sitzungen lesen denselben Stand, die zweite überschreibt den Snapshot der ersten
+    with _table_history_lock():
+        return _append_table_snapshot(snap)
+
+def _append_table_snapshot(snap: pd.DataFrame) -> bool:
+    hist = read_frame(TABLE_HISTORY_FILE, parse_dates=["ts"])
+    if hist is not None and not hist.empty:
+        last = hist[hist["ts"] == hist["ts"].max()]
+        key_cols = ["team_key", "rank", "played", "points"]
+        same = (
+            last[key_cols].astype(str).sort_values("team_key").reset_index(drop=True)
+            .equals(snap[key_cols].astype(str).sort_values("team_key").reset_index(drop=True))
+        )
+        if same:
+            return False
+        snap = pd.concat([hist.reindex(columns=TABLE_HISTORY_COLUMNS), snap], ignore_index=True)
+    return write_frame(snap, TABLE_HISTORY_FILE)
+
+@st.cache_data(show_spinner=False)
+def _load_table_trajectories(history_mtime: float) -> dict:
+    """Verlauf je Team (ein Punkt pro absolviertem Spieltag, letzter Snapshot gewinnt).
+
+    Rückgabe: team_key -> DataFrame[played, rank, points, goals_for, goals_against, d_rank, d_points]
+    """
+    hist = read_frame(TABLE_HISTORY_FILE, parse_dates=["ts"])
+    if hist is None or hist.empty:
+        return {}
+    hist = hist.dropna(subset=["played"]).sort_values("ts")
+    per_round = hist.drop_duplicates(subset=["team_key", "played"], keep="last").sort_values(["team_key", "played"])
+    per_round = per_round.assign(
+        d_rank=per_round.groupby("team_key")["rank"].diff(),
+        d_points=per_round.groupby("team_key")["points"].diff(),
+    )
+    cols = ["played", "rank", "points", "goals_for", "goals_against", "d_rank", "d_points"]
+    return {k: g[cols].reset_index(drop=True) for k, g in per_round.groupby("team_key", sort=False)}
+
+def get_team_table_history(team: str) -> pd.DataFrame | None:
+    """Platz-/Punkteverlauf eines Teams aus den lokal gespeicherten Snapshots (kein Request)."""
+    return _load_table_trajectories(frame_mtime(TABLE_HISTORY_FILE)).get(_table_team_key(team))
+
 # ========================= Zeichnen / Plot =========================
+@timed()
 def draw_pitch(ax, team: str):
     ax.set_facecolor('green')
     ax.set_xlim(0, 68)
@@ -782,8 +1002,11 @@ def draw_pitch(ax, team: str):
     logo_path = find_team_logo(team)
     if logo_path:
         try:
-            logo = mpimg.imread(str(logo_path))
-            ax.imshow(logo, extent=[0, 68, 0, 100], alpha=0.05, zorder=1)
+            texture = pitch_texture(logo_path)  # gecacht, Alpha schon eingerechnet
+            if texture is not None:
+                ax.imshow(texture, extent=[0, 68, 0, 100], zorder=1)
+            else:
+                ax.imshow(mpimg.imread(str(logo_path)), extent=[0, 68, 0, 100], alpha=0.05, zorder=1)
         except Exception:
             pass
 
@@ -874,62 +1097,80 @@ def plot_events(ax, goals, assists, add_legend=False, label_prefix=""):
         ax.plot([a[0], g[0]], [a[1], g[1]], color="white", linestyle="--", linewidth=0.8, alpha=0.5, zorder=5)
 
 # ======= Individuelle Analysen =======
-@st.cache_data(show_spinner=False)
 def list_individual_players(base: Path):
-    players = []
-    if base.exists():
-        for p in sorted(base.iterdir()):
-            if p.is_dir():
-                players.append(p.name)
-    return players
+    """Spielerordner – neu gelesen nur, wenn sich der Basisordner ändert (neuer Spieler)."""
+    return spielerindex.list_players(base)
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _player_index_job() -> threading.Thread:
+    """Asset-Index aller Spieler im Hintergrund vorwärmen (prozessweit, alle 10 Min neu;
+    läuft der vorige Scan noch, endet der neue sofort)."""
+    job = threading.Thread(target=spielerindex.refresh, args=(IND_ANALYSEN_BASE, THUMB_DIR),
+                           kwargs={"wait": False}, name="spielerindex", daemon=True)
+    job.start()
+    return job
+
+def player_assets(player_name) -> dict | None:
+    """Porträt, Clips (Länge, Vorschaubild), Dokumente und Kommentare eines Spielers –
+    ein Index-Lookup plus eine Kommentar-Abfrage (beide warm aus dem Cache)."""
+    assets = spielerindex.player_assets(IND_ANALYSEN_BASE / player_name, THUMB_DIR)
+    if assets is None:
+        return None
+    return {**assets, "comments": get_player_comments(player_name)}
 
-@st.cache_data(show_spinner=False)
-def list_player_files(player_dir: Path):
-    files = []
-    if player_dir.exists():
-        for f in sorted(player_dir.iterdir()):
-            if f.is_file() and (f.suffix.lower() in DOC_EXTS or f.suffix.lower() in VIDEO_EXTS):
-                files.append(f)
-    return files
-
-def load_video_comments():
-    """Lädt gespeicherte Video-Kommentare aus der JSON-Datei."""
-    if COMMENTS_FILE.exists():
-        try:
-            with open(COMMENTS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+def format_duration(seconds) -> str:
+    if seconds is None:
+        return ""
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes}:{secs:02d}"
 
-def save_video_comments(comments):
-    """Speichert Video-Kommentare in der JSON-Datei."""
+def get_player_comments(player_name) -> dict:
+    """Alle Kommentare eines Spielers ({video: {'text', 'version', ...}}) – eine Abfrage, sonst Cache."""
     try:
-        with open(COMMENTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(comments, f, ensure_ascii=False, indent=2)
-        return True
-    except Exception:
-        return False
+        return kommentare.player_comments(COMMENTS_DB, player_name, legacy_json=COMMENTS_FILE)
+    except sqlite3.Error:
+        return {}
 
 def get_video_comment(player_name, video_name):
     """Holt den Kommentar für ein spezifisches Video eines Spielers."""
-    comments = load_video_comments()
-    return comments.get(player_name, {}).get(video_name, "")
+    return get_player_comments(player_name).get(video_name, {}).get("text", "")
 
-def set_video_comment(player_name, video_name, comment):
-    """Setzt den Kommentar für ein spezifisches Video eines Spielers."""
-    comments = load_video_comments()
-    if player_name not in comments:
-        comments[player_name] = {}
-    comments[player_name][video_name] = comment
-    return save_video_comments(comments)
+def set_video_comment(player_name, video_name, comment, based_on=None):
+    """Speichert den Kommentar als neue Version und gibt deren Nummer zurück (None bei Fehler).
+    based_on: Version, auf der die Eingabe beruht – hat inzwischen jemand anderes
+    gespeichert, kommt kommentare.KommentarKonflikt."""
+    try:
+        return kommentare.save_comment(COMMENTS_DB, player_name, video_name, comment, based_on=based_on)
+    except sqlite3.Error:
+        return None
+
+# Team-Farben der Altersstatistik im Dashboard (einfarbig, passend zu den übrigen Ansichten)
+ALTERSSTATISTIK_TEAM_COLORS = {
+    'JWR': '#1f77b4',
+    'LASK': '#ff7f0e',
+    'Sturm': '#2ca02c',
+    'Rapid': '#d62728',
+    'WAC': '#9467bd',
+    'Liefering': '#8c564b',
+    'Altach Juniors': '#e377c2',
+    'Young Violets': '#7f7f7f',
+    'Gleisdorf': '#bcbd22',
+    'Gurten': '#17becf',
+    'Kalsdorf': '#ff9896',
+    'Lafnitz': '#98df8a',
+    'Oedt': '#ffbb78',
+    'St. Anna': '#f0027f',
+    'Treibach': '#386cb0',
+    'Velden': '#fdc086',
+    'Voitsberg': '#beaed4',
+    'Wallern': '#fccde5',
+    'Weiz': '#d9d9d9',
+    'Dietach': '#fb8072'
+}
 
+@timed()
 def load_and_execute_altersstatistik_script():
-    """Lädt und führt das Altersstatistik-Skript aus."""
-    if not ALTERSSTATISTIK_SCRIPT.exists():
-        st.error(f"Altersstatistik-Skript nicht gefunden: {ALTERSSTATISTIK_SCRIPT}")
-        return False
-    
+    """Zeichnet die Altersstatistik als eingebettete Ansicht (Durchschnittsalter.py neben dem Dashboard)."""
     # Prüfe ob Excel-Datei existiert
     if not ALTERSSTATISTIK_EXCEL.exists():
         st.warning(f"""
@@ -947,240 +1188,18 @@ def load_and_execute_altersstatistik_script():
         return False
     
     try:
-        # Skript-Inhalt laden
-        script_content = ALTERSSTATISTIK_SCRIPT.read_text(encoding='utf-8', errors='ignore')
-        
-        # Modifiziere das Skript, um den absoluten Pfad zur Excel-Datei zu verwenden
-        # Ersetze alle relativen Pfade mit dem absoluten Pfad
-        # Verwende raw string um Unicode-Escape-Fehler zu vermeiden
-        script_content = script_content.replace(
-            '"Statistik Altersdurchschnitt.xlsx"',
-            f'r"{str(ALTERSSTATISTIK_EXCEL)}"'
-        )
-        
-        # Modifiziere die get_team_color Funktion im Skript, um ungültige Farben zu verhindern
-        script_content = script_content.replace(
-            'def get_team_color(team_name):',
-            '''def get_team_color(team_name):
-    """Gibt eine sichere Farbe für ein Team zurück, immer gültige Hex-Farbe"""
-    if team_name is None:
-        return '#1f77b4'  # Standard-Blau
-    
-    team_str = str(team_name).strip()
-    if not team_str or team_str.lower() in ['nan', 'none', '']:
-        return '#1f77b4'  # Standard-Blau
-    
-    # Suche nach passender Farbe
-    for team_key, color in TEAM_COLORS.items():
-        if team_key.lower() in team_str.lower():
-            return color
+        from Durchschnittsalter import render_altersstatistik  # lazy: Plotly erst in dieser Ansicht
+    except ImportError as e:
+        # Keine Installation zur Laufzeit (blockiert den Request) – Hinweis statt pip
+        st.error(f"❌ Das Modul '{e.name}' ist nicht installiert. Installieren Sie es mit: `pip install -r requirements.txt`")
+        return False
     
-    # Fallback: Generiere eine Farbe basierend auf dem Team-Namen
-    import hashlib
-    hash_object = hashlib.md5(team_str.encode())
-    hash_hex = hash_object.hexdigest()
-    return f'#{hash_hex[:6]}'  # Erste 6 Zeichen als Farbe'''
-        )
-        
-        # Modifiziere das Dropdownmenü, um nan-Werte zu filtern
-        script_content = script_content.replace(
-            'options=df_teams[\'Team\'].tolist(),',
-            'options=filter_valid_teams(df_teams[\'Team\'].tolist()),'
-        )
-        
-        # Korrigiere das Team-Mapping für Young Violets
-        script_content = script_content.replace(
-            "'Young Violets': 'Young Violetts',",
-            "'Young Violets': 'Young Violets',"
-        )
-        
-        # Korrigiere den Fallback-Namen für Young Violets
-        script_content = script_content.replace(
-            "'Young Violetts'",
-            "'Young Violets'"
+    try:
+        render_altersstatistik(
+            ALTERSSTATISTIK_EXCEL,
+            team_colors=ALTERSSTATISTIK_TEAM_COLORS,
+            embedded=True,
         )
-        
-        # Skript in einem exec() ausführen
-        # Erstelle einen lokalen Namespace für die Ausführung
-        local_namespace = {
-            'st': st,
-            'pd': pd,
-            'plt': plt,
-            'numpy': None,  # Wird bei Bedarf importiert
-            'np': None,     # Wird bei Bedarf importiert
-            'matplotlib': None,  # Wird bei Bedarf importiert
-            'os': os,
-            'pathlib': None,
-            'Path': Path,
-            # Standard-Team-Farben für das Altersstatistik-Skript
-            'TEAM_COLORS': {
-                'JWR': '#1f77b4',
-                'LASK': '#ff7f0e',
-                'Sturm': '#2ca02c',
-                'Rapid': '#d62728',
-                'WAC': '#9467bd',
-                'Liefering': '#8c564b',
-                'Altach Juniors': '#e377c2',
-                'Young Violets': '#7f7f7f',
-                'Gleisdorf': '#bcbd22',
-                'Gurten': '#17becf',
-                'Kalsdorf': '#ff9896',
-                'Lafnitz': '#98df8a',
-                'Oedt': '#ffbb78',
-                'St. Anna': '#f0027f',
-                'Treibach': '#386cb0',
-                'Velden': '#fdc086',
-                'Voitsberg': '#beaed4',
-                'Wallern': '#fccde5',
-                'Weiz': '#d9d9d9',
-                'Dietach': '#fb8072'
-            }
-        }
-        
-        # Versuche häufig benötigte Module zu importieren
-        try:
-            import numpy as np
-            local_namespace['np'] = np
-            local_namespace['numpy'] = np
-        except ImportError:
-            pass
-        
-        try:
-            import plotly
-            import plotly.express as px
-            import plotly.graph_objects as go
-            import plotly.offline as pyo
-            local_namespace['plotly'] = plotly
-            local_namespace['px'] = px
-            local_namespace['go'] = go
-            local_namespace['pyo'] = pyo
-        except ImportError:
-            st.warning("⚠️ Das 'plotly' Modul ist nicht installiert. Installieren Sie es mit: `pip install plotly`")
-            # Versuche plotly zu installieren
-            try:
-                import subprocess
-                import sys
-                st.info("🔄 Versuche plotly zu installieren...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "plotly"])
-                st.success("✅ plotly erfolgreich installiert!")
-                
-                # Jetzt nochmal importieren
-                import plotly
-                import plotly.express as px
-                import plotly.graph_objects as go
-                import plotly.offline as pyo
-                local_namespace['plotly'] = plotly
-                local_namespace['px'] = px
-                local_namespace['go'] = go
-                local_namespace['pyo'] = pyo
-            except Exception as install_error:
-                st.error(f"❌ Konnte plotly nicht installieren: {install_error}")
-                st.info("Bitte installieren Sie plotly manuell mit: `pip install plotly`")
-                return False
-        
-        # Versuche openpyxl zu importieren (wird für Excel-Dateien benötigt)
-        try:
-            import openpyxl
-            local_namespace['openpyxl'] = openpyxl
-        except ImportError:
-            st.warning("⚠️ Das 'openpyxl' Modul ist nicht installiert. Es wird für Excel-Dateien benötigt.")
-            # Versuche openpyxl zu installieren
-            try:
-                import subprocess
-                import sys
-                st.info("🔄 Versuche openpyxl zu installieren...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "openpyxl"])
-                st.success("✅ openpyxl erfolgreich installiert!")
-                
-                # Jetzt nochmal importieren
-                import openpyxl
-                local_namespace['openpyxl'] = openpyxl
-            except Exception as install_error:
-                st.error(f"❌ Konnte openpyxl nicht installieren: {install_error}")
-                st.info("Bitte installieren Sie openpyxl manuell mit: `pip install openpyxl`")
-                return False
-        
-        try:
-            import seaborn as sns
-            local_namespace['sns'] = sns
-        except ImportError:
-            pass
-        
-        try:
-            import scipy
-            local_namespace['scipy'] = scipy
-        except ImportError:
-            pass
-        
-        # TEAM_COLORS Variable für das Altersstatistik-Skript hinzufügen
-        TEAM_COLORS = {
-            'JWR': '#1f77b4',
-            'LASK': '#ff7f0e',
-            'Sturm': '#2ca02c',
-            'Rapid': '#d62728',
-            'WAC': '#9467bd',
-            'Liefering': '#8c564b',
-            'Altach Juniors': '#e377c2',
-            'Young Violets': '#7f7f7f',
-            'Gleisdorf': '#bcbd22',
-            'Gurten': '#17becf',
-            'Kalsdorf': '#ff9896',
-            'Lafnitz': '#98df8a',
-            'Oedt': '#ffbb78',
-            'St. Anna': '#f0027f',
-            'Treibach': '#386cb0',
-            'Velden': '#fdc086',
-            'Voitsberg': '#beaed4',
-            'Wallern': '#fccde5',
-            'Weiz': '#d9d9d9',
-            'Dietach': '#fb8072'
-        }
-        
-        # TEAM_COLORS sowohl im lokalen als auch im globalen Namespace verfügbar machen
-        local_namespace['TEAM_COLORS'] = TEAM_COLORS
-        globals()['TEAM_COLORS'] = TEAM_COLORS
-        
-        # Hilfsfunktion zum Filtern von ungültigen Team-Namen
-        def filter_valid_teams(teams):
-            """Filtert ungültige Team-Namen (NaN, None, leere Strings) heraus."""
-            if teams is None:
-                return []
-            valid_teams = []
-            for team in teams:
-                if team is not None and str(team).lower() not in ['nan', 'none', ''] and str(team).strip():
-                    valid_teams.append(team)
-            return valid_teams
-        
-        # Filter-Funktion zum lokalen Namespace hinzufügen
-        local_namespace['filter_valid_teams'] = filter_valid_teams
-        
-        # Sichere get_team_color Funktion hinzufügen
-        def safe_get_team_color(team_name):
-            """Gibt eine sichere Farbe für ein Team zurück, immer gültige Hex-Farbe"""
-            if team_name is None:
-                return '#1f77b4'  # Standard-Blau
-            
-            team_str = str(team_name).strip()
-            if not team_str or team_str.lower() in ['nan', 'none', '']:
-                return '#1f77b4'  # Standard-Blau
-            
-            # Suche nach passender Farbe
-            for team_key, color in TEAM_COLORS.items():
-                if team_key.lower() in team_str.lower():
-                    return color
-            
-            # Fallback: Generiere eine Farbe basierend auf dem Team-Namen
-            import hashlib
-            hash_object = hashlib.md5(team_str.encode())
-            hash_hex = hash_object.hexdigest()
-            return f'#{hash_hex[:6]}'  # Erste 6 Zeichen als Farbe
-        
-        # Sichere Funktionen zum lokalen Namespace hinzufügen
-        local_namespace['get_team_color'] = safe_get_team_color
-        local_namespace['safe_get_team_color'] = safe_get_team_color
-        
-        # Skript ausführen
-        exec(script_content, globals(), local_namespace)
         return True
         
     except Exception as e:
@@ -1189,224 +1208,229 @@ def load_and_execute_altersstatistik_script():
         return False
 
 # ========================= Render-Block (Vergleich) =========================
-def render_compare(goals_a, assists_a, label_a,
-                   goals_b, assists_b, label_b,
-                   team_a, team_b, file_a=None, file_b=None):
-    # ============== OBERER TEIL: Felder + rechte Stat-Spalte ==============
-    colA_field, colB_field, col_stats_top = st.columns([2, 2, 2], gap="small")
-
-    # --- Spielfeld Team A
-    with colA_field:
-        fig1, ax1 = plt.subplots(figsize=(2.0, 4.0))
-        draw_pitch(ax1, team_a)
-        plot_events(ax1, goals_a, assists_a, add_legend=True, label_prefix=label_a or team_a)
-        ax1.legend(loc="lower left", fontsize=4)
-        plt.title(label_a or team_a, fontsize=6)
-        st.pyplot(fig1, use_container_width=False)
-
-    # --- Spielfeld Team B
-    with colB_field:
-        fig2, ax2 = plt.subplots(figsize=(2.0, 4.0))
-        draw_pitch(ax2, team_b)
-        plot_events(ax2, goals_b, assists_b, add_legend=True, label_prefix=label_b or team_b)
-        ax2.legend(loc="lower left", fontsize=4)
-        plt.title(label_b or team_b, fontsize=6)
-        st.pyplot(fig2, use_container_width=False)
-
-    # --- Statboxen (ALLE TEAMS) direkt rechts neben dem rechten Spielfeld
-    with col_stats_top:
-        teams_for_stats = globals().get("teams", [team_a, team_b])
-
-        # Überschrift für Liga-Statistiken
-        st.markdown("<div class='small-heading' style='margin-bottom:8px;'>Liga-Statistiken</div>", unsafe_allow_html=True)
-
-        # 1) Torstatistik gesamt (Videos)
-        totals = count_all_goals(teams_for_stats)
-        st.markdown(
-            "<div style='font-size:0.9rem; font-weight:600; "
-            "padding:6px 10px; border:1px solid rgba(0,0,0,0.1); "
-            "border-radius:6px; background:rgba(0,0,0,0.03); margin-bottom:6px;'>"
-            f"Torstatistik: {totals['1 Touch']} 1Touch, "
-            f"{totals['2 Touch']} 2Touch, "
-            f"{totals['Elfmeter']} Elfmeter, "
-            f"{totals['Sonstiges']} Sonstiges"
-            "</div>",
-            unsafe_allow_html=True
-        )
-
-        # 2) Eigene Zonentore (x 24–42, y 84–100): innen / außerhalb
-        innen_total, ausser_total, zone_per_team = count_zone_split_all_teams(
-            BASE_DIR, teams_for_stats, x_min=24, x_max=42, y_min=84, y_max=100
-        )
-        gesamt = innen_total + ausser_total
-        share_in = f"{(innen_total/gesamt*100):.0f}%" if gesamt else "–"
-        share_out = f"{(ausser_total/gesamt*100):.0f}%" if gesamt else "–"
+# Die Vergleichsansicht besteht aus Abschnitten mit expliziten Eingaben (Team, Tore,
+# Video-Quelle). Als st.fragment läuft ein Abschnitt bei Klicks auf seine eigenen
+# Widgets allein neu (z.B. Kategorie-Radio von Team A -> nur Video-Abschnitt A).
+# Teure Ergebnisse (Spielfeld-Bilder, Liga-Statistik) sind nach ihren Eingaben
+# gecacht, damit auch ein voller Rerun nur geänderte Abschnitte neu zeichnet.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def dashboard_section(fn):
+    """Abschnitt als st.fragment (falls die Streamlit-Version das kann), sonst normal.
+    Läuft der Abschnitt allein (Fragment-Rerun), wird er als eigener Durchlauf gemessen."""
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        with rerun_scope("fragment", abschnitt=fn.__name__), messen(fn.__name__):
+            return fn(*args, **kwargs)
+    return _fragment(run) if _fragment else run
+
+def _file_mtime(path) -> float:
+    try:
+        return Path(path).stat().st_mtime
+    except (OSError, TypeError):
+        return 0.0
 
-        st.markdown(
-            "<div style='font-size:0.9rem; font-weight:600; "
-            "padding:6px 10px; border:1px solid rgba(0,0,0,0.1); "
-            "border-radius:6px; background:rgba(0,0,0,0.03); margin-bottom:6px;'>"
-            f"Eigene Zonentore (x 24–42, y 84–100): "
-            f"{innen_total} innen ({share_in}), "
-            f"{ausser_total} außerhalb ({share_out})"
-            "</div>",
-            unsafe_allow_html=True
-        )
+def _goal_files_stamp(base_dir: Path, teams) -> tuple:
+    """(Datei, mtime) aller Tor-Skripte der Teams – Cache-Key der Liga-Statistik."""
+    stamp = []
+    for t in teams:
+        try:
+            with os.scandir(base_dir / t) as it:
+                stamp.extend((f"{t}/{e.name}", e.stat().st_mtime) for e in it if e.name.lower().endswith(".py"))
+        except OSError:
+            continue
+    return tuple(sorted(stamp))
+
+@timed(cache=True)
+@st.cache_data(show_spinner=False, max_entries=8)
+def league_zone_stats(teams: tuple, files_stamp: tuple) -> dict:
+    """Torstatistik und Zonentore (eigene/gegen) aller Teams; neu nur bei geänderten Tor-Skripten."""
+    cache_miss("league_zone_stats")
+    return {
+        "totals": count_all_goals(teams),
+        "eigene": count_zone_split_all_teams(BASE_DIR, list(teams), x_min=24, x_max=42, y_min=84, y_max=100),
+        "gegen": count_zone_split_all_teams_against(BASE_DIR, list(teams), x_min=24, x_max=42, y_min=84, y_max=100),
+    }
 
-        with st.expander("Details pro Team – Eigene Zonentore"):
-            if zone_per_team:
-                df_zone = pd.DataFrame([{"Team": k, **v} for k, v in zone_per_team.items()])
-                if not df_zone.empty:
-                    df_zone["Anteil innen %"] = df_zone.apply(
-                        lambda r: (r["innen"]/r["gesamt"]*100) if r["gesamt"] else 0,
-                        axis=1
-                    )
-                    df_zone = df_zone.sort_values(["Anteil innen %", "Team"], ascending=[False, True])
-                    df_zone["Anteil innen %"] = df_zone["Anteil innen %"].apply(lambda v: f"{v:.0f}%" if v else "–")
-                st.dataframe(df_zone, use_container_width=True, hide_index=True)
-            else:
-                st.caption("Keine Zonentore-Daten gefunden.")
+@timed(cache=True)
+@st.cache_data(show_spinner=False, max_entries=64)
+def pitch_png(team: str, label: str, goals, assists, logo_mtime: float) -> bytes:
+    """Spielfeld mit Toren/Assists als PNG (wie st.pyplot: dpi 200, bbox tight)."""
+    cache_miss("pitch_png")
+    fig, ax = plt.subplots(figsize=(2.0, 4.0))
+    draw_pitch(ax, team)
+    plot_events(ax, goals, assists, add_legend=True, label_prefix=label)
+    ax.legend(loc="lower left", fontsize=4)
+    ax.set_title(label, fontsize=6)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+def render_pitch(team: str, goals, assists, label: str):
+    st.image(pitch_png(team, label, goals, assists, _file_mtime(find_team_logo(team))), output_format="PNG")
+
+@dashboard_section
+def render_league_stats(teams_for_stats: tuple, team_a: str, team_b: str):
+    """Statboxen (alle Teams) plus Infoboxen/Tabellenverlauf der beiden gewählten Teams."""
+    # Überschrift für Liga-Statistiken
+    st.markdown("<div class='small-heading' style='margin-bottom:8px;'>Liga-Statistiken</div>", unsafe_allow_html=True)
+
+    stats = league_zone_stats(teams_for_stats, _goal_files_stamp(BASE_DIR, teams_for_stats))
+
+    # 1) Torstatistik gesamt (Videos)
+    totals = stats["totals"]
+    st.markdown(
+        "<div style='font-size:0.9rem; font-weight:600; "
+        "padding:6px 10px; border:1px solid rgba(0,0,0,0.1); "
+        "border-radius:6px; background:rgba(0,0,0,0.03); margin-bottom:6px;'>"
+        f"Torstatistik: {totals['1 Touch']} 1Touch, "
+        f"{totals['2 Touch']} 2Touch, "
+        f"{totals['Elfmeter']} Elfmeter, "
+        f"{totals['Sonstiges']} Sonstiges"
+        "</div>",
+        unsafe_allow_html=True
+    )
 
-        # 3) Gegentore – Zonenstatistik (x 24–42, y 84–100)
-        g_in, g_out, g_per_team = count_zone_split_all_teams_against(
-            BASE_DIR, teams_for_stats, x_min=24, x_max=42, y_min=84, y_max=100
-        )
-        g_total = g_in + g_out
-        g_share_in = f"{(g_in/g_total*100):.0f}%" if g_total else "–"
-        g_share_out = f"{(g_out/g_total*100):.0f}%" if g_total else "–"
+    # 2) Eigene Zonentore (x 24–42, y 84–100): innen / außerhalb
+    innen_total, ausser_total, zone_per_team = stats["eigene"]
+    gesamt = innen_total + ausser_total
+    share_in = f"{(innen_total/gesamt*100):.0f}%" if gesamt else "–"
+    share_out = f"{(ausser_total/gesamt*100):.0f}%" if gesamt else "–"
+
+    st.markdown(
+        "<div style='font-size:0.9rem; font-weight:600; "
+        "padding:6px 10px; border:1px solid rgba(0,0,0,0.1); "
+        "border-radius:6px; background:rgba(0,0,0,0.03); margin-bottom:6px;'>"
+        f"Eigene Zonentore (x 24–42, y 84–100): "
+        f"{innen_total} innen ({share_in}), "
+        f"{ausser_total} außerhalb ({share_out})"
+        "</div>",
+        unsafe_allow_html=True
+    )
 
-        st.markdown(
-            "<div style='font-size:0.9rem; font-weight:600; "
-            "padding:6px 10px; border:1px solid rgba(0,0,0,0.1); "
-            "border-radius:6px; background:rgba(0,0,0,0.03);'>"
-            f"Gegentore (x 24–42, y 84–100): "
-            f"{g_in} innen ({g_share_in}), "
-            f"{g_out} außerhalb ({g_share_out})"
-            "</div>",
-            unsafe_allow_html=True
-        )
+    with st.expander("Details pro Team – Eigene Zonentore"):
+        if zone_per_team:
+            df_zone = pd.DataFrame([{"Team": k, **v} for k, v in zone_per_team.items()])
+            if not df_zone.empty:
+                df_zone["Anteil innen %"] = df_zone.apply(
+                    lambda r: (r["innen"]/r["gesamt"]*100) if r["gesamt"] else 0,
+                    axis=1
+                )
+                df_zone = df_zone.sort_values(["Anteil innen %", "Team"], ascending=[False, True])
+                df_zone["Anteil innen %"] = df_zone["Anteil innen %"].apply(lambda v: f"{v:.0f}%" if v else "–")
+            st.dataframe(df_zone, use_container_width=True, hide_index=True)
+        else:
+            st.caption("Keine Zonentore-Daten gefunden.")
+
+    # 3) Gegentore – Zonenstatistik (x 24–42, y 84–100)
+    g_in, g_out, g_per_team = stats["gegen"]
+    g_total = g_in + g_out
+    g_share_in = f"{(g_in/g_total*100):.0f}%" if g_total else "–"
+    g_share_out = f"{(g_out/g_total*100):.0f}%" if g_total else "–"
+
+    st.markdown(
+        "<div style='font-size:0.9rem; font-weight:600; "
+        "padding:6px 10px; border:1px solid rgba(0,0,0,0.1); "
+        "border-radius:6px; background:rgba(0,0,0,0.03);'>"
+        f"Gegentore (x 24–42, y 84–100): "
+        f"{g_in} innen ({g_share_in}), "
+        f"{g_out} außerhalb ({g_share_out})"
+        "</div>",
+        unsafe_allow_html=True
+    )
 
-        with st.expander("Details pro Team – Gegentore"):
-            if g_per_team:
-                df_g = pd.DataFrame([{"Team": k, **v} for k, v in g_per_team.items()])
-                if not df_g.empty:
-                    df_g["Anteil innen %"] = df_g.apply(
-                        lambda r: (r["innen"]/r["gesamt"]*100) if r["gesamt"] else 0,
-                        axis=1
-                    )
-                    df_g = df_g.sort_values(["gesamt", "Team"], ascending=[False, True])  # nach Gesamt absteigend
-                    df_g["Anteil innen %"] = df_g["Anteil innen %"].apply(lambda v: f"{v:.0f}%" if v else "–")
-                st.dataframe(df_g, use_container_width=True, hide_index=True)
-            else:
-                st.caption("Keine Gegentore-Daten gefunden.")
-
-        # Zusatz: Infoboxen der aktuell ausgewählten Teams (rechts, unterhalb)
-        selected_teams = list(dict.fromkeys([team_a, team_b]))
-        st.markdown("<div class='small-heading' style='margin-top:8px;'>Ausgewählte Teams – Statistiken</div>", unsafe_allow_html=True)
-        for tname in selected_teams:
-            vids = load_team_videos(tname)
-            ts = {
-                "1Touch": len(vids.get("1 Touch", [])),
-                "2Touch": len(vids.get("2 Touch", [])),
-                "Elfmeter": len(vids.get("Elfmeter", [])),
-                "Sonstiges": len(vids.get("Sonstiges", [])),
-            }
+    with st.expander("Details pro Team – Gegentore"):
+        if g_per_team:
+            df_g = pd.DataFrame([{"Team": k, **v} for k, v in g_per_team.items()])
+            if not df_g.empty:
+                df_g["Anteil innen %"] = df_g.apply(
+                    lambda r: (r["innen"]/r["gesamt"]*100) if r["gesamt"] else 0,
+                    axis=1
+                )
+                df_g = df_g.sort_values(["gesamt", "Team"], ascending=[False, True])  # nach Gesamt absteigend
+                df_g["Anteil innen %"] = df_g["Anteil innen %"].apply(lambda v: f"{v:.0f}%" if v else "–")
+            st.dataframe(df_g, use_container_width=True, hide_index=True)
+        else:
+            st.caption("Keine Gegentore-Daten gefunden.")
+
+    # Zusatz: Infoboxen der aktuell ausgewählten Teams (rechts, unterhalb)
+    selected_teams = list(dict.fromkeys([team_a, team_b]))
+    st.markdown("<div class='small-heading' style='margin-top:8px;'>Ausgewählte Teams – Statistiken</div>", unsafe_allow_html=True)
+    for tname in selected_teams:
+        vids = load_team_videos(tname)
+        ts = {
+            "1Touch": len(vids.get("1 Touch", [])),
+            "2Touch": len(vids.get("2 Touch", [])),
+            "Elfmeter": len(vids.get("Elfmeter", [])),
+            "Sonstiges": len(vids.get("Sonstiges", [])),
+        }
+        if tname in zone_per_team and tname in g_per_team:
+            zi_in, zi_out, zi_tot = zone_per_team[tname].values()
+            zg_in, zg_out, zg_tot = g_per_team[tname].values()
+        else:
             zi_in, zi_out, zi_tot = count_zone_split_for_team(BASE_DIR / tname, x_min=24, x_max=42, y_min=84, y_max=100)
             zg_in, zg_out, zg_tot = count_zone_split_for_team_against(BASE_DIR / tname, x_min=24, x_max=42, y_min=84, y_max=100)
-            tbl = get_team_table_info(tname)
-            if tbl:
-                liga_info = f"Platz {tbl['rank']}, Tore {tbl['goals']}, Punkte {tbl['points']}"
-            else:
-                liga_info = "Platz/Tore/Punkte: –"
-            st.markdown(
-                f"<div style='border:1px solid rgba(255,255,255,0.08); border-radius:8px; padding:8px; background:rgba(255,255,255,0.03); margin-top:6px;'>"
-                f"<div class='small-heading'>{tname}</div>"
-                f"<div style='font-size:0.85rem; margin-top:2px; color:#9ca3af;'><b>Ligastatus:</b> {liga_info}</div>"
-                f"<div style='font-size:0.85rem; margin-top:4px;'><b>Torstatistik:</b> {ts['1Touch']} 1Touch, {ts['2Touch']} 2Touch, {ts['Elfmeter']} Elfmeter, {ts['Sonstiges']} Sonstiges</div>"
-                f"<div style='font-size:0.85rem; margin-top:2px;'><b>Eigene Zonentore:</b> {zi_in} innen, {zi_out} außerhalb (gesamt {zi_tot})</div>"
-                f"<div style='font-size:0.85rem; margin-top:2px;'><b>Gegentore in Zone:</b> {zg_in} innen, {zg_out} außerhalb (gesamt {zg_tot})</div>"
-                f"</div>",
-                unsafe_allow_html=True
-            )
-
-    # ============== UNTERER TEIL: Videos + Scorer ==============
-    # --- Team A (links): Videos | Torschützen
-    colA_vids, colA_scorers = st.columns([2, 1], gap="small")
-    with colA_vids:
-        # Team A: Videos basierend auf der ausgewählten Datei laden
-        if file_a and "Gegentore" in file_a.name:
-            vidsA = load_opponent_goals_against(team_a)
-            title_suffix_a = " (Gegentore)"
+        tbl = get_team_table_info(tname)
+        if tbl:
+            liga_info = f"Platz {tbl['rank']}, Tore {tbl['goals']}, Punkte {tbl['points']}"
+            if tbl.get("wins") is not None:
+                liga_info += f", Bilanz {tbl['wins']}-{tbl['draws']}-{tbl['losses']}"
+            hist = get_team_table_history(tname)
+            if hist is not None and len(hist) >= 2:
+                d_rank, d_points = hist["d_rank"].iloc[-1], hist["d_points"].iloc[-1]
+                if pd.notna(d_rank) and pd.notna(d_points):
+                    arrow = "▲" if d_rank < 0 else ("▼" if d_rank > 0 else "=")
+                    # Vergleichs-Snapshot: fehlen Spieltage in der Historie, liegt er weiter zurück
+                    prev_round = hist["played"].iloc[-2]
+                    since = f"seit Spieltag {int(prev_round)}" if pd.notna(prev_round) else "zum letzten Stand"
+                    liga_info += f" ({arrow}{abs(int(d_rank)) or ''}, {int(d_points):+d} P. {since})"
         else:
-            vidsA = load_team_videos(team_a)
-            title_suffix_a = ""
-        cntE, cnt1, cnt2, cntS = (
-            len(vidsA.get('Elfmeter', [])),
-            len(vidsA.get('1 Touch', [])),
-            len(vidsA.get('2 Touch', [])),
-            len(vidsA.get('Sonstiges', []))
-        )
-        
-        # Automatisch nächste verfügbare Kategorie auswählen
-        categories = ['Elfmeter', '1 Touch', '2 Touch', 'Sonstiges']
-        counts = [cntE, cnt1, cnt2, cntS]
-        default_cat_idx = 0
-        for i, count in enumerate(counts):
-            if count > 0:
-                default_cat_idx = i
-                break
-        
-        radio_labels_A = [
-            f"Elfmeter ({cntE})",
-            f"1 Touch ({cnt1})",
-            f"2 Touch ({cnt2})",
-            f"Sonstiges ({cntS})"
-        ]
-        radio_map_A = {radio_labels_A[i]: cat for i, cat in enumerate(categories)}
-        st.markdown(f"<div class='small-heading'>🎬 Tore {team_a}{title_suffix_a}</div>", unsafe_allow_html=True)
-        catA_label = st.radio("Kategorie", radio_labels_A, key="vid_cat_A", horizontal=True, index=default_cat_idx)
-        catA = radio_map_A[catA_label]
-        filesA = vidsA.get(catA, [])
-        if filesA:
-            labelsA = build_labels_with_roman(filesA)
-            selA = st.selectbox("Tor auswählen", range(len(filesA)), key="vid_sel_A", format_func=lambda i: labelsA[i])
-            st.video(str(filesA[selA]))
-        else:
-            st.caption("Keine Videos in dieser Kategorie.")
-    with colA_scorers:
-        st.markdown(f"<div class='small-heading'>🏆 Torschützen {team_a}{title_suffix_a}</div>", unsafe_allow_html=True)
-        scorer_data_a = extract_scorer_table(
-            vidsA.get("Elfmeter", []) + vidsA.get("1 Touch", []) +
-            vidsA.get("2 Touch", []) + vidsA.get("Sonstiges", [])
+            liga_info = "Platz/Tore/Punkte: –"
+        st.markdown(
+            f"<div style='border:1px solid rgba(255,255,255,0.08); border-radius:8px; padding:8px; background:rgba(255,255,255,0.03); margin-top:6px;'>"
+            f"<div class='small-heading'>{tname}</div>"
+            f"<div style='font-size:0.85rem; margin-top:2px; color:#9ca3af;'><b>Ligastatus:</b> {liga_info}</div>"
+            f"<div style='font-size:0.85rem; margin-top:4px;'><b>Torstatistik:</b> {ts['1Touch']} 1Touch, {ts['2Touch']} 2Touch, {ts['Elfmeter']} Elfmeter, {ts['Sonstiges']} Sonstiges</div>"
+            f"<div style='font-size:0.85rem; margin-top:2px;'><b>Eigene Zonentore:</b> {zi_in} innen, {zi_out} außerhalb (gesamt {zi_tot})</div>"
+            f"<div style='font-size:0.85rem; margin-top:2px;'><b>Gegentore in Zone:</b> {zg_in} innen, {zg_out} außerhalb (gesamt {zg_tot})</div>"
+            f"</div>",
+            unsafe_allow_html=True
         )
-        if scorer_data_a:
-            counts = defaultdict(int)
-            for row in scorer_data_a:
-                counts[row["Spieler"]] += row["Tore"]
-            for name, cnt in sorted(counts.items(), key=lambda x: x[1], reverse=True):
-                st.markdown(f"- {name} ({cnt} {'Tor' if cnt==1 else 'Tore'})")
-        else:
-            st.caption("Keine Torschützen-Daten verfügbar.")
 
-    # --- Team B (rechts unten): Videos | Torschützen
-    colB_vids, colB_scorers = st.columns([2, 1], gap="small")
-    with colB_vids:
-        # Team B: Videos basierend auf der ausgewählten Datei laden
-        if file_b and "Gegentore" in file_b.name:
-            vidsB = load_opponent_goals_against(team_b)
-            title_suffix = " (Gegentore)"
-        elif team_b == team_a:  # Wenn es der gleiche Gegner ist
-            vidsB = load_opponent_goals_against(team_b)
+    # Tabellenverlauf der ausgewählten Teams (nur lokale Snapshots, kein Scrape)
+    trends = {t: get_team_table_history(t) for t in selected_teams}
+    trends = {t: h for t, h in trends.items() if h is not None and len(h) >= 2}
+    if trends:
+        st.markdown("<div class='small-heading' style='margin-top:8px;'>Tabellenverlauf</div>", unsafe_allow_html=True)
+        fig_t, ax_t = plt.subplots(figsize=(3.2, 1.6))
+        for t, h in trends.items():
+            ax_t.plot(h["played"], h["rank"], marker="o", markersize=2, linewidth=1, label=f"{t} ({h['points'].iloc[-1]} P.)")
+        ax_t.invert_yaxis()
+        ax_t.set_xlabel("Spieltag", fontsize=5)
+        ax_t.set_ylabel("Platz", fontsize=5)
+        ax_t.tick_params(labelsize=5)
+        ax_t.legend(fontsize=4, loc="best")
+        st.pyplot(fig_t, use_container_width=True)
+        plt.close(fig_t)
+
+@dashboard_section
+def render_video_section(side: str, team: str, against: bool):
+    """Videos (Kategorie/Tor-Auswahl) und Torschützen eines Teams. side = "A"/"B" für die Widget-Keys."""
+    col_vids, col_scorers = st.columns([2, 1], gap="small")
+    with col_vids:
+        # Videos: eigene Tore oder Gegentore (je nach gewählter Datei)
+        if against:
+            vids = load_opponent_goals_against(team)
             title_suffix = " (Gegentore)"
         else:
-            vidsB = load_team_videos(team_b)
+            vids = load_team_videos(team)
             title_suffix = ""
-            
         cntE, cnt1, cnt2, cntS = (
-            len(vidsB.get('Elfmeter', [])),
-            len(vidsB.get('1 Touch', [])),
-            len(vidsB.get('2 Touch', [])),
-            len(vidsB.get('Sonstiges', []))
+            len(vids.get('Elfmeter', [])),
+            len(vids.get('1 Touch', [])),
+            len(vids.get('2 Touch', [])),
+            len(vids.get('Sonstiges', []))
         )
         
         # Automatisch nächste verfügbare Kategorie auswählen
@@ -1418,32 +1442,32 @@ def render_compare(goals_a, assists_a, label_a,
                 default_cat_idx = i
                 break
         
-        radio_labels_B = [
+        radio_labels = [
             f"Elfmeter ({cntE})",
             f"1 Touch ({cnt1})",
             f"2 Touch ({cnt2})",
             f"Sonstiges ({cntS})"
         ]
-        radio_map_B = {radio_labels_B[i]: cat for i, cat in enumerate(categories)}
-        st.markdown(f"<div class='small-heading'>🎬 Tore {team_b}{title_suffix}</div>", unsafe_allow_html=True)
-        catB_label = st.radio("Kategorie", radio_labels_B, key="vid_cat_B", horizontal=True, index=default_cat_idx)
-        catB = radio_map_B[catB_label]
-        filesB = vidsB.get(catB, [])
-        if filesB:
-            labelsB = build_labels_with_roman(filesB)
-            selB = st.selectbox("Tor auswählen", range(len(filesB)), key="vid_sel_B", format_func=lambda i: labelsB[i])
-            st.video(str(filesB[selB]))
+        radio_map = {radio_labels[i]: cat for i, cat in enumerate(categories)}
+        st.markdown(f"<div class='small-heading'>🎬 Tore {team}{title_suffix}</div>", unsafe_allow_html=True)
+        cat_label = st.radio("Kategorie", radio_labels, key=f"vid_cat_{side}", horizontal=True, index=default_cat_idx)
+        cat = radio_map[cat_label]
+        files = vids.get(cat, [])
+        if files:
+            labels = build_labels_with_roman(files)
+            sel = st.selectbox("Tor auswählen", range(len(files)), key=f"vid_sel_{side}", format_func=lambda i: labels[i])
+            st.video(str(files[sel]))
         else:
             st.caption("Keine Videos in dieser Kategorie.")
-    with colB_scorers:
-        st.markdown(f"<div class='small-heading'>🏆 Torschützen {team_b}{title_suffix}</div>", unsafe_allow_html=True)
-        scorer_data_b = extract_scorer_table(
-            vidsB.get("Elfmeter", []) + vidsB.get("1 Touch", []) +
-            vidsB.get("2 Touch", []) + vidsB.get("Sonstiges", [])
+    with col_scorers:
+        st.markdown(f"<div class='small-heading'>🏆 Torschützen {team}{title_suffix}</div>", unsafe_allow_html=True)
+        scorer_data = extract_scorer_table(
+            vids.get("Elfmeter", []) + vids.get("1 Touch", []) +
+            vids.get("2 Touch", []) + vids.get("Sonstiges", [])
         )
-        if scorer_data_b:
+        if scorer_data:
             counts = defaultdict(int)
-            for row in scorer_data_b:
+            for row in scorer_data:
                 counts[row["Spieler"]] += row["Tore"]
             for name, cnt in sorted(counts.items(), key=lambda x: x[1], reverse=True):
                 st.markdown(f"- {name} ({cnt} {'Tor' if cnt==1 else 'Tore'})")
@@ -1451,6 +1475,117 @@ def render_compare(goals_a, assists_a, label_a,
             st.caption("Keine Torschützen-Daten verfügbar.")
 
 
+@dashboard_section
+def render_scorer_overview(team_a: str, team_b: str):
+    """Torschützen mit Videos: bei gleichem Team eine Liste, sonst je Team ein Tab."""
+    if team_a == team_b:
+        # Bei gleichem Team: Nur eigene Tore für die Torschützen-Übersicht
+        vidsA_all = load_team_videos(team_a)
+        vidsB_all = load_team_videos(team_b)  # Gleiche Daten wie Team A
+    else:
+        # Bei verschiedenen Teams: Beide zeigen eigene Tore
+        vidsA_all = load_team_videos(team_a)
+        vidsB_all = load_team_videos(team_b)
+        
+    scorer_data_a = extract_scorer_table(
+        vidsA_all.get("Elfmeter", []) + vidsA_all.get("1 Touch", []) +
+        vidsA_all.get("2 Touch", []) + vidsA_all.get("Sonstiges", [])
+    )
+    scorer_data_b = extract_scorer_table(
+        vidsB_all.get("Elfmeter", []) + vidsB_all.get("1 Touch", []) +
+        vidsB_all.get("2 Touch", []) + vidsB_all.get("Sonstiges", [])
+    )
+    
+    if scorer_data_a or scorer_data_b:
+        if team_a == team_b:
+            # Wenn es das gleiche Team ist: Einheitliche Anzeige
+            st.markdown("### 🏆 Torschützen-Übersicht")
+            
+            # Alle Torschützen in einer Liste zusammenfassen
+            all_scorers = {}
+            
+            # Bei gleichem Team nur Team A Daten verwenden (keine Duplikate)
+            if scorer_data_a:
+                for row in scorer_data_a:
+                    player = row["Spieler"]
+                    if player not in all_scorers:
+                        all_scorers[player] = {"Tore": 0, "Details": []}
+                    all_scorers[player]["Tore"] += row["Tore"]
+                    for video in row["Videos"]:
+                        all_scorers[player]["Details"].append({
+                            "Video": video, 
+                            "Kategorie": row["Kategorie"], 
+                            "Gegner": row["Gegner"]
+                        })
+            
+            # Nach Toranzahl sortieren und anzeigen
+            for name, data in sorted(all_scorers.items(), key=lambda x: x[1]["Tore"], reverse=True):
+                st.markdown(f"#### {name} ({data['Tore']} {'Tor' if data['Tore']==1 else 'Tore'})")
+                
+                for detail in data["Details"]:
+                    with st.expander(f"▶️ {name} – {detail['Kategorie']} vs. {detail['Gegner']}"):
+                        st.video(str(detail["Video"]))
+        else:
+            # Wenn es verschiedene Teams sind: Separate Tabs
+            tab1, tab2 = st.tabs([f"Torschützen {team_a}", f"Torschützen {team_b}"])
+            with tab1:
+                if scorer_data_a:
+                    grouped = defaultdict(lambda: {"Tore": 0, "Details": []})
+                    for row in scorer_data_a:
+                        grouped[row["Spieler"]]["Tore"] += row["Tore"]
+                        for video in row["Videos"]:
+                            grouped[row["Spieler"]]["Details"].append({"Video": video, "Kategorie": row["Kategorie"], "Gegner": row["Gegner"]})
+                    for name, data in sorted(grouped.items(), key=lambda x: x[1]["Tore"], reverse=True):
+                        st.markdown(f"### {name} ({data['Tore']} {'Tor' if data['Tore']==1 else 'Tore'})")
+                        for detail in data["Details"]:
+                            with st.expander(f"▶️ {name} – {detail['Kategorie']} vs. {detail['Gegner']}"):
+                                st.video(str(detail["Video"]))
+                else:
+                    st.caption("Keine Torschützen-Daten für Team A verfügbar.")
+            with tab2:
+                if scorer_data_b:
+                    grouped = defaultdict(lambda: {"Tore": 0, "Details": []})
+                    for row in scorer_data_b:
+                        grouped[row["Spieler"]]["Tore"] += row["Tore"]
+                        for video in row["Videos"]:
+                            grouped[row["Spieler"]]["Details"].append({"Video": video, "Kategorie": row["Kategorie"], "Gegner": row["Gegner"]})
+                    for name, data in sorted(grouped.items(), key=lambda x: x[1]["Tore"], reverse=True):
+                        st.markdown(f"### {name} ({data['Tore']} {'Tor' if data['Tore']==1 else 'Tore'})")
+                        for detail in data["Details"]:
+                            with st.expander(f"▶️ {name} – {detail['Kategorie']} vs. {detail['Gegner']}"):
+                                st.video(str(detail["Video"]))
+                else:
+                    st.caption("Keine Torschützen-Daten für Team B verfügbar.")
+    else:
+        st.caption("Keine Torschützen-Daten verfügbar.")
+
+
+@timed()
+def render_compare(goals_a, assists_a, label_a,
+                   goals_b, assists_b, label_b,
+                   team_a, team_b, file_a=None, file_b=None, teams=None):
+    # ============== OBERER TEIL: Felder + rechte Stat-Spalte ==============
+    colA_field, colB_field, col_stats_top = st.columns([2, 2, 2], gap="small")
+
+    # --- Spielfeld Team A
+    with colA_field:
+        render_pitch(team_a, goals_a, assists_a, label_a or team_a)
+
+    # --- Spielfeld Team B
+    with colB_field:
+        render_pitch(team_b, goals_b, assists_b, label_b or team_b)
+
+    # --- Statboxen (ALLE TEAMS) direkt rechts neben dem rechten Spielfeld
+    with col_stats_top:
+        render_league_stats(tuple(teams or [team_a, team_b]), team_a, team_b)
+
+    # ============== UNTERER TEIL: Videos + Scorer ==============
+    # --- Team A (links): eigene Tore, außer es ist eine Gegentore-Datei gewählt
+    render_video_section("A", team_a, bool(file_a and "Gegentore" in file_a.name))
+    # --- Team B: Gegentore auch dann, wenn es der gleiche Gegner wie Team A ist
+    render_video_section("B", team_b, bool(file_b and "Gegentore" in file_b.name) or team_b == team_a)
+
+
 
 # ========================= Query-Param Handling (Logo-Klick öffnet PPTX lokal) =========================
 def _open_if_requested():
@@ -1467,15 +1602,17 @@ def _open_if_requested():
     target = get_param("open")
     if target:
         team = unquote_plus(target)
-        ppt = resolve_matchplan_ppt(team)
-        if ppt and ppt.exists() and os.name == "nt":
+        deck = resolve_matchplan_deck(team, "LineUp")
+        if deck is None or not deck["pfad"].exists():
+            st.info(f"Kein LineUp für „{team}“ gefunden.")
+        elif os.name == "nt":
             try:
-                os.startfile(str(ppt))
+                os.startfile(str(deck["pfad"]))
                 st.toast(f"Öffne LineUp {team} …", icon="📂")
             except Exception as e:
                 st.warning(f"Konnte LineUp {team} nicht öffnen: {e}")
         else:
-            st.info(f"Kein LineUp für „{team}“ gefunden.")
+            render_deck_preview(deck)
         try:
             set_params(open="")
         except Exception:
@@ -1525,13 +1662,8 @@ def set_defaults(teams, file_index):
         # Team A
         st.session_state['tA'] = team0
 
-        # Gegner ermitteln + mappen
-        try:
-            raw_opp = get_next_opponent(team0)
-        except Exception:
-            raw_opp = None
-        mapped = map_to_existing_team(raw_opp, teams) if raw_opp else None
-        st.session_state['tB'] = mapped or team0
+        # Gegner ermitteln + mappen (im Hintergrund; bis dahin Team A als Platzhalter)
+        _apply_next_opponent(teams, team0)
 
         # Datei-Defaults (auf Basis Team A, wie bisher)
         st.session_state['fA_idx'] = files0.index(file_a_def) if (files0 and file_a_def in files0) else 0
@@ -1539,19 +1671,40 @@ def set_defaults(teams, file_index):
 
         st.session_state['_init_done'] = True
     else:
-        # Nur nachziehen, falls tB noch fehlt (oder identisch zu team0 geblieben ist und wir einen Gegner haben)
-        if 'tB' not in st.session_state or not st.session_state.get('tB'):
-            try:
-                raw_opp = get_next_opponent(team0)
-            except Exception:
-                raw_opp = None
-            mapped = map_to_existing_team(raw_opp, teams) if raw_opp else None
-            st.session_state['tB'] = mapped or team0
+        # Nur nachziehen, falls tB noch fehlt oder die Gegner-Erkennung noch aussteht
+        if 'tB' not in st.session_state or not st.session_state.get('tB') or st.session_state.get('_tB_pending'):
+            _apply_next_opponent(teams, team0)
 
         ss_default('tA', team0)
         ss_default('fA_idx', files0.index(file_a_def) if (files0 and file_a_def in files0) else 0)
         ss_default('fB_idx', files0.index(file_b_def) if (files0 and file_b_def in files0) else 0)
 
+def _apply_next_opponent(teams, team0):
+    """Setzt Team B auf den erkannten Gegner, sobald die Hintergrund-Erkennung fertig ist.
+    Solange sie läuft, bleibt Team A als Platzhalter und `_tB_pending` (= Team A) gesetzt; eine
+    eigene Auswahl des Nutzers wird nicht überschrieben."""
+    job = _next_opponent_job(team0)
+    if not job["done"].is_set():
+        st.session_state.setdefault('tB', team0)
+        st.session_state['_tB_pending'] = team0
+        return
+    pending = st.session_state.pop('_tB_pending', False)
+    if pending and st.session_state.get('tB') not in (None, "", team0):
+        return  # Nutzer hat inzwischen selbst gewählt
+    mapped = map_to_existing_team(job["value"], teams) if job["value"] else None
+    st.session_state['tB'] = mapped or team0
+
+def _opponent_placeholder(team0: str):
+    """Hinweis, solange der nächste Gegner ermittelt wird; danach ein App-Rerun, damit die
+    Ansicht das Ergebnis übernimmt. Nur aufrufen, solange die Erkennung aussteht – das
+    Fragment läuft sonst jede Sekunde weiter."""
+    if _next_opponent_job(team0)["done"].is_set():
+        st.rerun()
+    st.caption("⏳ Nächster Gegner wird ermittelt …")
+
+if _fragment:
+    _opponent_placeholder = _fragment(run_every=1)(_opponent_placeholder)
+
 def count_all_goals(teams):
     """Zählt alle Tore aus den Video-Ordnern über alle Teams nach Kategorien."""
     totals = {"1 Touch": 0, "2 Touch": 0, "Elfmeter": 0, "Sonstiges": 0}
@@ -1692,19 +1845,15 @@ def _qp_get_value(val):
 
 # ========================= ÖFB-Parser =========================
 def extrahiere_kaderdaten(html: str):
-    import json as _json
     import re as _re
+    # Schneller Pfad: nur den Preload-Block mit "kader" parsen (siehe oefb_preloads)
     try:
-        pattern = r"SG\.container\.appPreloads\[\s*'(\d+)'\s*\]\s*=\s*(\[[\s\S]*?\]);"
-        match = _re.search(pattern, html, _re.DOTALL)
-        if match:
-            json_text = match.group(2)
-            data = _json.loads(json_text)
-            for item in data:
-                if isinstance(item, dict) and "kader" in item:
-                    return item.get("kader", [])
+        kader = find_preload_value(html, "kader")
+        if isinstance(kader, list):
+            return kader
     except Exception:
         pass
+    # Fallback: einzelne Spieler-Objekte per Regex aus dem HTML lesen
     results = []
     obj_pattern = _re.compile(
         r'\{[^{}]*?"spielerName"\s*:\s*"([^"]+)"[^{}]*?'
@@ -1741,15 +1890,279 @@ def extrahiere_kaderdaten(html: str):
         return list(merged.values())
     return []
 
+# ========================= Kartenwarnung (Hintergrund-Sync) =========================
+KARTEN_ARTEN = ("Gelb", "Gelb-Rot", "Rot")
+
+def _karten_connect() -> sqlite3.Connection:
+    """Eigene Verbindung pro Thread; WAL erlaubt Lesen während der Sync schreibt."""
+    KARTEN_DB.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(KARTEN_DB, timeout=10)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS karten_stand (
+            team TEXT, spieler TEXT, gelb INTEGER, gelbrot INTEGER, rot INTEGER,
+            profil TEXT, aktualisiert REAL, PRIMARY KEY (team, spieler));
+        CREATE TABLE IF NOT EXISTS karten_historie (
+            team TEXT, spieler TEXT, gelb INTEGER, gelbrot INTEGER, rot INTEGER, ts REAL);
+        CREATE INDEX IF NOT EXISTS idx_karten_historie ON karten_historie (team, spieler, ts);
+        CREATE TABLE IF NOT EXISTS karten_sync (
+            team TEXT PRIMARY KEY, seiten_hash TEXT, ts REAL, fehler TEXT);
+        CREATE TABLE IF NOT EXISTS karten_quellen (team TEXT PRIMARY KEY, url TEXT);
+        """
+    )
+    return con
+
+def _to_int(v) -> int:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return 0
+
+@timed()
+def sync_kaderdaten(con: sqlite3.Connection, team: str, url: str) -> int:
+    """Lädt eine Kaderseite und übernimmt nur geänderte Spieler, entfernt abgegangene.
+    Rückgabe: Anzahl Änderungen."""
+    now = time.time()
+    html = http_get(url, timeout=8, headers=HTTP_HEADERS).text
+    page_hash = hashlib.sha1(html.encode("utf-8", "ignore")).hexdigest()
+    row = con.execute("SELECT seiten_hash FROM karten_sync WHERE team = ?", (team,)).fetchone()
+    if row and row[0] == page_hash:
+        with con:
+            con.execute("UPDATE karten_sync SET ts = ?, fehler = NULL WHERE team = ?", (now, team))
+        return 0
+
+    alt = {r[0]: tuple(r[1:]) for r in con.execute(
+        "SELECT spieler, gelb, gelbrot, rot FROM karten_stand WHERE team = ?", (team,))}
+    changed, kader = [], set()
+    for k in extrahiere_kaderdaten(html):
+        name = str(k.get("spielerName") or "").strip()
+        if not name:
+            continue
+        kader.add(name)
+        counts = (_to_int(k.get("kartenGelb")), _to_int(k.get("kartenGelbRot")), _to_int(k.get("kartenRot")))
+        if alt.get(name) != counts:
+            changed.append((team, name, *counts, (k.get("spielerProfilUrl") or "").strip(), now))
+    with con:
+        con.executemany(
+            "INSERT INTO karten_stand (team, spieler, gelb, gelbrot, rot, profil, aktualisiert) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (team, spieler) DO UPDATE SET gelb = excluded.gelb, gelbrot = excluded.gelbrot, "
+            "rot = excluded.rot, profil = excluded.profil, aktualisiert = excluded.aktualisiert",
+            changed,
+        )
+        # aus dem Kader abgegangene Spieler raus (Historie bleibt); leerer Kader = Seite kaputt, nichts löschen
+        weg = [(team, name) for name in alt.keys() - kader] if kader else []
+        con.executemany("DELETE FROM karten_stand WHERE team = ? AND spieler = ?", weg)
+        con.executemany(
+            "INSERT INTO karten_historie (team, spieler, gelb, gelbrot, rot, ts) VALUES (?, ?, ?, ?, ?, ?)",
+            [(c[0], c[1], c[2], c[3], c[4], now) for c in changed],
+        )
+        con.execute(
+            "INSERT INTO karten_sync (team, seiten_hash, ts, fehler) VALUES (?, ?, ?, NULL) "
+            "ON CONFLICT (team) DO UPDATE SET seiten_hash = excluded.seiten_hash, ts = excluded.ts, fehler = NULL",
+            (team, page_hash, now),
+        )
+    return len(changed) + len(weg)
+
+_OEFB_TEAM_LINK_RE = re.compile(
+    r"(?:vereine\.oefb\.at)?/([A-Za-z0-9\-]+)/Mannschaften/(Saison-[0-9\-]+)/([A-Za-z0-9\-]+)/")
+
+def _team_folders() -> list[str]:
+    try:
+        return sorted(p.name for p in BASE_DIR.iterdir() if p.is_dir() and not p.name.startswith("."))
+    except OSError:
+        return []
+
+def discover_kader_urls(teams: list[str]) -> dict[str, str]:
+    """Kaderseiten der Gegner aus den Mannschafts-Links der JWR-Spielseite:
+    Vereins-Slug (z.B. SKTreibach) -> Teamordner, URL = .../<Mannschaft>/Kader."""
+    html = http_get(OEFB_SPIELE_URL, timeout=8, headers=HTTP_HEADERS).text.replace("\\/", "/")
+    own = OEFB_SPIELE_URL.split("/")[3]
+    urls = {}
+    for slug, saison, mannschaft in _OEFB_TEAM_LINK_RE.findall(html):
+        team = map_to_existing_team(slug, teams) if slug != own else None
+        if team and team not in urls:
+            urls[team] = f"https://vereine.oefb.at/{slug}/Mannschaften/{saison}/{mannschaft}/Kader"
+    return urls
+
+def _kader_urls(con: sqlite3.Connection) -> dict[str, str]:
+    """Abgeleitete Kaderseiten (gespeichert, damit ein Ausfall der Spielseite nichts kostet)
+    plus OEFB_KADER_URLS, die Vorrang haben."""
+    try:
+        found = discover_kader_urls(_team_folders())
+    except Exception:
+        found = {}
+    if found:
+        with con:
+            con.executemany("INSERT OR REPLACE INTO karten_quellen (team, url) VALUES (?, ?)", found.items())
+    return {**dict(con.execute("SELECT team, url FROM karten_quellen")), **OEFB_KADER_URLS}
+
+def _karten_rebuild(state: dict, con: sqlite3.Connection):
+    """Berechnet die Risiko-Listen je (Team, Art, Schwellwert) vor – die UI liest nur noch."""
+    risiko = {}
+    for team, spieler, gelb, gelbrot, rot in con.execute("SELECT team, spieler, gelb, gelbrot, rot FROM karten_stand"):
+        for art, n in zip(KARTEN_ARTEN, (gelb, gelbrot, rot)):
+            for schwelle in range(1, min(n, KARTEN_MAX_SCHWELLE) + 1):
+                risiko.setdefault((team, art, schwelle), []).append((spieler, n))
+    for lst in risiko.values():
+        lst.sort(key=lambda x: (-x[1], x[0]))
+    state["risiko"] = risiko
+    state["sync"] = {t: (ts, err) for t, ts, err in con.execute("SELECT team, ts, fehler FROM karten_sync")}
+
+def _karten_sync_once(state: dict, con: sqlite3.Connection):
+    state["urls"] = _kader_urls(con)
+    errors = {}
+    for team, url in state["urls"].items():
+        try:
+            sync_kaderdaten(con, team, url)
+        except Exception as e:
+            errors[team] = str(e)
+    _karten_rebuild(state, con)
+    # Fehler nur im Speicher: ein Schreibfehler (z.B. DB gesperrt) darf den Sync nicht beenden
+    state["sync"] = {**state["sync"], **{t: (state["sync"].get(t, (None, None))[0], e) for t, e in errors.items()}}
+
+def _karten_sync_loop(state: dict):
+    con = None
+    while True:
+        try:  # keine Ausnahme darf den Thread beenden (get_karten_tracker startet ihn nie neu)
+            con = con or _karten_connect()
+            _karten_sync_once(state, con)
+        except Exception as e:
+            sync = dict(state["sync"])
+            for team in state["urls"]:
+                sync[team] = (sync.get(team, (None, None))[0], f"{type(e).__name__}: {e}")
+            state["sync"] = sync
+            if con is not None:
+                con.close()
+            con = None
+        state["wake"].wait(KARTEN_SYNC_INTERVAL)
+        state["wake"].clear()
+
+@st.cache_resource(show_spinner=False)
+def get_karten_tracker() -> dict:
+    """Prozessweiter Karten-Tracker: Stand aus SQLite sofort verfügbar, Sync im Hintergrund."""
+    state = {"risiko": {}, "sync": {}, "urls": dict(OEFB_KADER_URLS), "wake": threading.Event()}
+    con = _karten_connect()
+    state["urls"] = {**dict(con.execute("SELECT team, url FROM karten_quellen")), **OEFB_KADER_URLS}
+    _karten_rebuild(state, con)
+    con.close()
+    threading.Thread(target=_karten_sync_loop, args=(state,), name="karten-sync", daemon=True).start()
+    return state
+
+def get_karten_risiko(team: str, art: str, schwelle: int) -> list[tuple[str, int]]:
+    """Spieler eines Teams mit mindestens `schwelle` Karten der Art (vorberechnet, kein Request)."""
+    return get_karten_tracker()["risiko"].get((team, art, int(schwelle)), [])
+
+
+# ========================= Suche =========================
+SEARCH_ICONS = {"Tor-Clip": "⚽", "Gegner-Clip": "🎬", "Spielerclip": "👤", "Kommentar": "💬", "Dokument": "📄"}
+
+def _all_comments():
+    return kommentare.all_comments(COMMENTS_DB, legacy_json=COMMENTS_FILE)
+
+def refresh_search_index(wait: bool = True) -> dict | None:
+    """Clips, Dokumente und Kommentare inkrementell in den Volltextindex übernehmen."""
+    return suchindex.refresh(
+        SEARCH_DB,
+        clip_roots={
+            "Tor-Clip": (RL_VIDEOS_BASE, parse_filename_parts),
+            "Gegner-Clip": (VIDEOS_BASE, parse_filename_parts),
+            "Spielerclip": (IND_ANALYSEN_BASE, None),
+        },
+        doc_roots=[IND_ANALYSEN_BASE, MATCHPLAN_BASE],
+        comments=_all_comments,
+        player_base=IND_ANALYSEN_BASE,
+        wait=wait,
+    )
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def _search_index_job() -> threading.Thread:
+    """Index im Hintergrund aktualisieren (prozessweit, alle 5 Min neu)."""
+    job = threading.Thread(target=refresh_search_index, name="suchindex", daemon=True)
+    job.start()
+    return job
+
+def render_search_view():
+    st.markdown("<h4>🔎 Suche</h4>", unsafe_allow_html=True)
+    job = _search_index_job()
+    # frisch gespeicherte Kommentare sofort finden (ein Zählervergleich, blockiert nie)
+    try:
+        suchindex.refresh(SEARCH_DB, comments=_all_comments, player_base=IND_ANALYSEN_BASE, wait=False)
+    except sqlite3.Error:
+        pass  # DB gesperrt/defekt: mit dem bestehenden Index weitersuchen
+
+    query = st.text_input("Suche", key="suche_text", label_visibility="collapsed",
+                          placeholder="z.B. PirkerM, Durchdecken, Pressing …")
+    arten = st.multiselect("Quellen", list(SEARCH_ICONS), key="suche_arten", placeholder="Alle Quellen")
+    info = suchindex.index_info(SEARCH_DB)
+    if job.is_alive():
+        st.caption("⏳ Index wird aktualisiert …")
+    if not query:
+        st.caption(" · ".join(f"{SEARCH_ICONS.get(art, '')} {art}: {n}" for art, n in sorted(info["eintraege"].items()))
+                   or "Index ist noch leer.")
+        return
+
+    t0 = time.perf_counter()
+    hits = suchindex.search(SEARCH_DB, query, arten)
+    st.caption(f"{len(hits)} Treffer in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    playing = st.session_state.get("suche_video")
+    for i, hit in enumerate(hits):
+        path = Path(hit["pfad"])
+        st.markdown(f"{SEARCH_ICONS.get(hit['art'], '•')} **{hit['titel']}**  \n{hit['auszug']}")
+        if hit["art"] == "Dokument":
+            if st.button("📂 Öffnen", key=f"suche_open_{i}"):
+                if os.name == "nt":
+                    try:
+                        os.startfile(str(path))
+                    except Exception as e:
+                        st.error(f"❌ Fehler beim Öffnen: {e}")
+                else:
+                    st.info(f"Datei: {path}")
+        elif path.suffix.lower() in VIDEO_EXTS:
+            if playing == str(path):
+                st.video(str(path))
+            elif st.button("▶ Abspielen", key=f"suche_play_{i}"):
+                st.session_state["suche_video"] = str(path)
+                st.rerun()
+        st.caption(str(path))
+
+# ========================= Performance-Ansicht =========================
+def render_performance_view():
+    """Versteckte Ansicht (?view=Performance): Laufzeiten und Cache-Treffer der letzten Durchläufe."""
+    st.markdown("<h4>⏱️ Performance</h4>", unsafe_allow_html=True)
+    n = st.slider("Letzte Durchläufe", 1, MAX_RERUNS, min(20, MAX_RERUNS), key="perf_n")
+    entries = [e for e in last_reruns() if e.get("ansicht") != "Performance"][:n]
+    if not entries:
+        st.info("Noch keine Messungen – zuerst eine andere Ansicht öffnen.")
+        return
+    st.markdown("<div class='small-heading'>Je Abschnitt</div>", unsafe_allow_html=True)
+    st.dataframe(pd.DataFrame(summarize(entries)), use_container_width=True, hide_index=True)
+    st.markdown("<div class='small-heading'>Je Durchlauf (neueste zuerst)</div>", unsafe_allow_html=True)
+    st.dataframe(
+        pd.DataFrame([
+            {"Zeit": e["ts"], "Art": e["art"], "Ansicht": e.get("ansicht") or e.get("abschnitt", ""),
+             "Gesamt ms": e["gesamt_ms"], **{k: v["ms"] for k, v in e["abschnitte"].items()}}
+            for e in entries
+        ]),
+        use_container_width=True,
+        hide_index=True
+    )
+    st.download_button("⬇️ JSONL exportieren", export_jsonl(entries), file_name="dashboard_laufzeiten.jsonl", mime="application/jsonl")
+    if PERF_LOG:
+        st.caption(f"Jeder Durchlauf wird zusätzlich angehängt an: {PERF_LOG}")
+
 
 # ========================= MAIN =========================
 def main():
+    with rerun_scope("rerun"):
+        _render_main()
+
+def _render_main():
     base = BASE_DIR
     if not base.exists():
         st.error(f"Basisverzeichnis nicht gefunden: {base}")
         st.stop()
 
-    global teams  # für Stat-Box rechts
     teams, file_index = list_teams_and_files(base, preferred=PREFERRED_TEAM)
     if not teams:
         st.warning("Keine Mannschaftsordner gefunden.")
@@ -1785,7 +2198,9 @@ def main():
                 st.experimental_set_query_params(**kw)
 
         current_view = _qp_get_value(get_param("view")) or "Dashboard"
-        options = ["Dashboard", "Individuelle Analysen", "Gegneranalyse", "Altersstatistik"]
+        options = ["Dashboard", "Individuelle Analysen", "Gegneranalyse", "Altersstatistik", "Suche"]
+        if current_view == "Performance":  # versteckt, nur über ?view=Performance
+            options.append("Performance")
         view = st.selectbox(
             "Ansicht",
             options,
@@ -1794,20 +2209,28 @@ def main():
         )
         if view != current_view:
             set_params_safe(view=view)
+        annotate(ansicht=view)
 
         # Spieler-Buttons für individuelle Analysen in der Sidebar
         if view == "Individuelle Analysen":
             st.markdown("### 👥 Spieler auswählen")
             
+            _player_index_job()
             players = list_individual_players(IND_ANALYSEN_BASE)
             if not players:
                 st.info("Keine Spielerordner gefunden.")
             else:
-                # Spieler Zeile für Zeile anzeigen
-                for i, player_name in enumerate(players):
-                    if st.button(player_name, key=f"btn_player_{i}", use_container_width=True):
-                        st.session_state.selected_player = player_name
-                        st.rerun()
+                # Auswahlfeld mit Suche (Tippen filtert) statt eines Buttons pro Spieler
+                if st.session_state.get("selected_player") not in players:
+                    st.session_state.pop("selected_player", None)
+                st.selectbox(
+                    "Spieler",
+                    players,
+                    index=None,
+                    key="selected_player",
+                    placeholder=f"🔍 Spieler suchen ({len(players)})",
+                    label_visibility="collapsed",
+                )
 
         
         if view == "Dashboard":
@@ -1820,6 +2243,8 @@ def main():
                 st.session_state["tB"] = qp_tB
 
             # Nächsten Gegner automatisch von Ligaportal laden
+            if st.session_state.get('_tB_pending'):
+                _opponent_placeholder(st.session_state['_tB_pending'])
             if st.button("🔄 Nächster Gegner"):
                 try:
                     next_opp = get_next_opponent_from_ligaportal("JWR")
@@ -1934,46 +2359,51 @@ def main():
                         st.session_state.show_warnsystem = False
                         st.rerun()
                 
-                url = "https://vereine.oefb.at/SVOberbankRied/Mannschaften/Saison-2025-26/KM-Amat-/Kader"
+                tracker = get_karten_tracker()
+                # JWR + nächster Gegner (sofern eine Kaderseite hinterlegt ist)
+                warn_teams = [PREFERRED_TEAM]
+                opp = map_to_existing_team(next_opponent_if_ready(PREFERRED_TEAM), list(tracker["urls"]))
+                if opp and opp not in warn_teams:
+                    warn_teams.append(opp)
                 cols = st.columns([1,1,1,1,2])
                 with cols[0]:
-                    art = st.selectbox("Art", ["Gelb", "Gelb-Rot", "Rot"], help="Welche Karten-Art prüfen?")
+                    art = st.selectbox("Art", list(KARTEN_ARTEN), help="Welche Karten-Art prüfen?")
                 with cols[1]:
-                    thresh = st.number_input("Schwellwert", min_value=1, max_value=10, value=3, step=1, help="Ab wie vielen Karten warnen? Gilt für die gewählte Art.")
+                    thresh = st.number_input("Schwellwert", min_value=1, max_value=KARTEN_MAX_SCHWELLE, value=3, step=1, help="Ab wie vielen Karten warnen? Gilt für die gewählte Art.")
                 with cols[2]:
-                    show_all = st.checkbox("JWR Spieler mit gelb", value=False)
-                try:
-                    headers = {"Cache-Control": "no-cache"}
-                    resp = requests.get(url, timeout=8, headers=headers)
-                    html = resp.text
-                    kader = extrahiere_kaderdaten(html)
-                except Exception as e:
-                    st.error(f"Kaderdaten konnten nicht geladen werden: {e}")
-                    kader = []
-                df = pd.DataFrame(kader) if kader else pd.DataFrame(columns=["spielerName","kartenGelb","kartenGelbRot","kartenRot","spielerProfilUrl"])
-                if not df.empty:
-                    df["kartenGelb"] = pd.to_numeric(df.get("kartenGelb", 0), errors="coerce").fillna(0).astype(int)
-                    df["kartenGelbRot"] = pd.to_numeric(df.get("kartenGelbRot", 0), errors="coerce").fillna(0).astype(int)
-                    df["kartenRot"] = pd.to_numeric(df.get("kartenRot", 0), errors="coerce").fillna(0).astype(int)
-                    df = df.rename(columns={"spielerName": "Spieler", "kartenGelb": "Gelb", "kartenGelbRot": "Gelb-Rot", "kartenRot": "Rot", "spielerProfilUrl": "Profil"})
-                    col_map = {"Gelb": "Gelb", "Gelb-Rot": "Gelb-Rot", "Rot": "Rot"}
-                    sel_col = col_map.get(art, "Gelb")
-                    warn_df = df[df[sel_col] >= int(thresh)].sort_values([sel_col, "Spieler"], ascending=[False, True])
-                    if not warn_df.empty:
-                        st.warning(f"⚠️ Spieler mit ≥ {int(thresh)} {sel_col}:")
-                        st.dataframe(warn_df[["Spieler", sel_col]], use_container_width=True, hide_index=True)
+                    warn_team = st.selectbox("Team", warn_teams, help="JWR oder nächster Gegner")
+                with cols[3]:
+                    show_all = st.checkbox(f"{warn_team} Spieler mit {art}", value=False)
+                with cols[4]:
+                    ts, err = tracker["sync"].get(warn_team, (None, None))
+                    if ts:
+                        st.caption(f"Stand: {datetime.datetime.fromtimestamp(ts):%d.%m. %H:%M}")
+                    if err:
+                        st.caption(f"⚠️ Sync fehlgeschlagen: {err}")
+                    if st.button("🔄 Sync", help="Kaderdaten jetzt im Hintergrund aktualisieren", key="btn_karten_sync"):
+                        tracker["wake"].set()
+
+                if warn_team not in tracker["urls"]:
+                    st.info(f"Keine ÖFB-Kaderseite für {warn_team} gefunden (OEFB_KADER_URLS ergänzen).")
+                elif not any(k[0] == warn_team for k in tracker["risiko"]) and not ts:
+                    if err:
+                        st.warning("Kaderdaten konnten noch nicht geladen werden – 🔄 Sync versucht es erneut.")
                     else:
-                        st.success(f"✅ Kein Spieler mit ≥ {int(thresh)} {sel_col}")
+                        st.info("Kaderdaten werden im Hintergrund geladen …")
+                else:
+                    warn_list = get_karten_risiko(warn_team, art, thresh)
+                    if warn_list:
+                        st.warning(f"⚠️ Spieler mit ≥ {int(thresh)} {art}:")
+                        st.dataframe(pd.DataFrame(warn_list, columns=["Spieler", art]), use_container_width=True, hide_index=True)
+                    else:
+                        st.success(f"✅ Kein Spieler mit ≥ {int(thresh)} {art}")
                     if show_all:
-                        st.markdown(f"### Übersicht {sel_col} (Spieler mit mindestens 1 {sel_col})")
-                        # Nur Spieler anzeigen, die mindestens 1 Karte der gewählten Art haben
-                        filtered_df = df[df[sel_col] > 0].sort_values([sel_col, "Spieler"], ascending=[False, True])
-                        if not filtered_df.empty:
-                            st.dataframe(filtered_df[["Spieler", sel_col]], use_container_width=True, hide_index=True)
+                        st.markdown(f"### Übersicht {art} (Spieler mit mindestens 1 {art})")
+                        all_list = get_karten_risiko(warn_team, art, 1)
+                        if all_list:
+                            st.dataframe(pd.DataFrame(all_list, columns=["Spieler", art]), use_container_width=True, hide_index=True)
                         else:
-                            st.info(f"Kein Spieler hat {sel_col} Karten.")
-                else:
-                    st.info("Keine Kaderdaten gefunden.")
+                            st.info(f"Kein Spieler hat {art} Karten.")
             else:
                 st.session_state.show_warnsystem = False
 
@@ -1982,24 +2412,9 @@ def main():
         col_logos, col_stats = st.columns([8, 4], gap="small")
 
         with col_logos:
-            logos_html = []
-            for t in teams:
-                lp = find_team_logo(t)
-                if lp and lp.exists():
-                    data_uri = encode_image_base64(lp)
-                    if data_uri:
-                        href = f"?open={quote_plus(t)}"
-                        logos_html.append(
-                            f'<a href="{href}" target="_self" title="LineUp {t} öffnen">'
-                            f'<img src="{data_uri}" alt="{t}" /></a>'
-                        )
-                # Kein Fallback auf LOGO_PATH mehr - nur echte Team-Logos anzeigen
-            
-            if logos_html:
-                st.markdown(
-                    '<div class="logo-row">' + ''.join(logos_html) + '</div>',
-                    unsafe_allow_html=True
-                )
+            logo_row = team_logo_row(teams)
+            if logo_row:
+                st.markdown(logo_row, unsafe_allow_html=True)
 
         # Daten laden & Rendern
         goals_a, assists_a, title_a = parse_goals_assists(file_a) if file_a else ([], [], None)
@@ -2008,90 +2423,11 @@ def main():
         render_compare(
             goals_a, assists_a, title_a or f"{team_a}",
             goals_b, assists_b, title_b or f"{team_b}",
-            team_a, team_b, file_a, file_b
+            team_a, team_b, file_a, file_b, teams=teams
         )
 
         # Torschützen-Anzeige
-        if team_a == team_b:
-            # Bei gleichem Team: Nur eigene Tore für die Torschützen-Übersicht
-            vidsA_all = load_team_videos(team_a)
-            vidsB_all = load_team_videos(team_b)  # Gleiche Daten wie Team A
-        else:
-            # Bei verschiedenen Teams: Beide zeigen eigene Tore
-            vidsA_all = load_team_videos(team_a)
-            vidsB_all = load_team_videos(team_b)
-            
-        scorer_data_a = extract_scorer_table(
-            vidsA_all.get("Elfmeter", []) + vidsA_all.get("1 Touch", []) +
-            vidsA_all.get("2 Touch", []) + vidsA_all.get("Sonstiges", [])
-        )
-        scorer_data_b = extract_scorer_table(
-            vidsB_all.get("Elfmeter", []) + vidsB_all.get("1 Touch", []) +
-            vidsB_all.get("2 Touch", []) + vidsB_all.get("Sonstiges", [])
-        )
-        
-        if scorer_data_a or scorer_data_b:
-            if team_a == team_b:
-                # Wenn es das gleiche Team ist: Einheitliche Anzeige
-                st.markdown("### 🏆 Torschützen-Übersicht")
-                
-                # Alle Torschützen in einer Liste zusammenfassen
-                all_scorers = {}
-                
-                # Bei gleichem Team nur Team A Daten verwenden (keine Duplikate)
-                if scorer_data_a:
-                    for row in scorer_data_a:
-                        player = row["Spieler"]
-                        if player not in all_scorers:
-                            all_scorers[player] = {"Tore": 0, "Details": []}
-                        all_scorers[player]["Tore"] += row["Tore"]
-                        for video in row["Videos"]:
-                            all_scorers[player]["Details"].append({
-                                "Video": video, 
-                                "Kategorie": row["Kategorie"], 
-                                "Gegner": row["Gegner"]
-                            })
-                
-                # Nach Toranzahl sortieren und anzeigen
-                for name, data in sorted(all_scorers.items(), key=lambda x: x[1]["Tore"], reverse=True):
-                    st.markdown(f"#### {name} ({data['Tore']} {'Tor' if data['Tore']==1 else 'Tore'})")
-                    
-                    for detail in data["Details"]:
-                        with st.expander(f"▶️ {name} – {detail['Kategorie']} vs. {detail['Gegner']}"):
-                            st.video(str(detail["Video"]))
-            else:
-                # Wenn es verschiedene Teams sind: Separate Tabs
-                tab1, tab2 = st.tabs([f"Torschützen {team_a}", f"Torschützen {team_b}"])
-                with tab1:
-                    if scorer_data_a:
-                        grouped = defaultdict(lambda: {"Tore": 0, "Details": []})
-                        for row in scorer_data_a:
-                            grouped[row["Spieler"]]["Tore"] += row["Tore"]
-                            for video in row["Videos"]:
-                                grouped[row["Spieler"]]["Details"].append({"Video": video, "Kategorie": row["Kategorie"], "Gegner": row["Gegner"]})
-                        for name, data in sorted(grouped.items(), key=lambda x: x[1]["Tore"], reverse=True):
-                            st.markdown(f"### {name} ({data['Tore']} {'Tor' if data['Tore']==1 else 'Tore'})")
-                            for detail in data["Details"]:
-                                with st.expander(f"▶️ {name} – {detail['Kategorie']} vs. {detail['Gegner']}"):
-                                    st.video(str(detail["Video"]))
-                    else:
-                        st.caption("Keine Torschützen-Daten für Team A verfügbar.")
-                with tab2:
-                    if scorer_data_b:
-                        grouped = defaultdict(lambda: {"Tore": 0, "Details": []})
-                        for row in scorer_data_b:
-                            grouped[row["Spieler"]]["Tore"] += row["Tore"]
-                            for video in row["Videos"]:
-                                grouped[row["Spieler"]]["Details"].append({"Video": video, "Kategorie": row["Kategorie"], "Gegner": row["Gegner"]})
-                        for name, data in sorted(grouped.items(), key=lambda x: x[1]["Tore"], reverse=True):
-                            st.markdown(f"### {name} ({data['Tore']} {'Tor' if data['Tore']==1 else 'Tore'})")
-                            for detail in data["Details"]:
-                                with st.expander(f"▶️ {name} – {detail['Kategorie']} vs. {detail['Gegner']}"):
-                                    st.video(str(detail["Video"]))
-                    else:
-                        st.caption("Keine Torschützen-Daten für Team B verfügbar.")
-        else:
-            st.caption("Keine Torschützen-Daten verfügbar.")
+        render_scorer_overview(team_a, team_b)
 
     elif view == "Individuelle Analysen":
         # ============== Individuelle Analysen Ansicht ==============
@@ -2109,34 +2445,46 @@ def main():
                 # Spielername und Bild nebeneinander mit Abstand anzeigen
                 st.markdown(f"### {selected_player}")
                 
-                # Spielerbild mit Abstand laden und anzeigen
-                player_dir = IND_ANALYSEN_BASE / selected_player
-                image_files = list(player_dir.glob("*.png")) + list(player_dir.glob("*.jpg")) + list(player_dir.glob("*.jpeg"))
-                if image_files:
-                    st.image(str(image_files[0]), width=80)
-                
-                pdir = IND_ANALYSEN_BASE / selected_player
-                pfiles = list_player_files(pdir)
+                assets = player_assets(selected_player) or {"portrait": None, "clips": [], "docs": [], "comments": {}}
+                if assets["portrait"]:
+                    st.image(str(assets["portrait"]), width=80)
 
-                if not pfiles:
+                if not assets["clips"] and not assets["docs"]:
                     st.caption("Keine Dateien im gewählten Ordner.")
                 else:
-                    video_files = [f for f in pfiles if f.suffix.lower() in VIDEO_EXTS]
+                    if assets["docs"]:
+                        st.caption("📄 " + " · ".join(d.name for d in assets["docs"]))
 
-                    if not video_files:
+                    if not assets["clips"]:
                         st.caption("Keine Videos für diesen Spieler vorhanden.")
                     else:
 
+                        player_comments = assets["comments"]
+                        playing = st.session_state.setdefault("playing_clips", set())
                         cols_per_row = 4
                         cols = st.columns(cols_per_row, gap="small")
-                        for i, vf in enumerate(video_files):
+                        for i, clip in enumerate(assets["clips"]):
+                            vf = clip["path"]
                             with cols[i % cols_per_row]:
-                                st.video(str(vf))
-                                st.caption(vf.name)
+                                # mit Vorschaubild wird der Player erst auf Klick geladen
+                                if clip["thumbnail"] and str(vf) not in playing:
+                                    st.image(str(clip["thumbnail"]))
+                                    if st.button("▶ Abspielen", key=f"play_{selected_player}_{vf.name}", use_container_width=True):
+                                        playing.add(str(vf))
+                                        st.rerun()
+                                else:
+                                    st.video(str(vf))
+                                duration = format_duration(clip["duration"])
+                                st.caption(f"{vf.name} · {duration}" if duration else vf.name)
                                 
                                 # Kommentarfeld für das Video
                                 comment_key = f"comment_{selected_player}_{vf.name}"
-                                current_comment = get_video_comment(selected_player, vf.name)
+                                stored = player_comments.get(vf.name, {})
+                                current_comment = stored.get("text", "")
+                                # Version, auf der die Eingabe beruht (Stand beim ersten Anzeigen)
+                                base_key = f"base_{comment_key}"
+                                if base_key not in st.session_state:
+                                    st.session_state[base_key] = stored.get("version", 0)
                                 
                                 # Kommentar-Textfeld
                                 new_comment = st.text_area(
@@ -2150,15 +2498,32 @@ def main():
                                 
                                 # Speichern-Button
                                 if st.button("💾 Speichern", key=f"save_{comment_key}", use_container_width=True):
-                                    if set_video_comment(selected_player, vf.name, new_comment):
-                                        st.success("✅ Kommentar gespeichert!")
-                                        st.rerun()
+                                    try:
+                                        version = set_video_comment(selected_player, vf.name, new_comment,
+                                                                    based_on=st.session_state[base_key])
+                                    except kommentare.KommentarKonflikt as e:
+                                        # nächster Klick überschreibt bewusst den neuen Stand
+                                        st.session_state[base_key] = e.aktuell["version"]
+                                        st.warning(f"⚠️ Inzwischen von jemand anderem geändert: "
+                                                   f"{e.aktuell['text'] or '(leer)'} – erneut speichern zum Überschreiben.")
                                     else:
-                                        st.error("❌ Fehler beim Speichern")
+                                        if version is None:
+                                            st.error("❌ Fehler beim Speichern")
+                                        elif version:
+                                            st.session_state[base_key] = version
+                                            st.success("✅ Kommentar gespeichert!")
+                                            st.rerun()
+                                        else:
+                                            st.info("Kein Kommentar eingegeben.")
                                 
                                 # Zeige gespeicherten Kommentar an, falls vorhanden
                                 if current_comment:
                                     st.info(f"📝 **Gespeichert:** {current_comment}")
+                                if stored.get("version", 0) > 1:
+                                    with st.expander(f"🕘 Verlauf ({stored['version']} Versionen)"):
+                                        for h in kommentare.comment_history(COMMENTS_DB, selected_player, vf.name):
+                                            ts = datetime.datetime.fromtimestamp(h["ts"]).strftime("%d.%m.%Y %H:%M")
+                                            st.caption(f"v{h['version']} · {ts}: {h['text'] or '(leer)'}")
             else:
                 st.info("Bitte wählen Sie einen Spieler aus der Sidebar aus.")
 
@@ -2180,28 +2545,24 @@ def main():
             
             # Aktuell ausgewähltes Team im Session State speichern
             if 'selected_video_team' not in st.session_state:
-                # Automatisch den nächsten Gegner von JWR auswählen
-                try:
-                    next_opponent = get_next_opponent_from_ligaportal("JWR")
-                    if next_opponent:
-                        # Mappe den Ligaportal-Namen auf den lokalen Ordnernamen
-                        mapped_opp = map_to_existing_team(next_opponent, video_teams)
-                        if mapped_opp:
-                            st.session_state.selected_video_team = mapped_opp
-                        else:
-                            # Fallback: Erstes verfügbares Team
-                            st.session_state.selected_video_team = video_teams[0] if video_teams else None
-                    else:
-                        # Fallback: Erstes verfügbares Team
-                        st.session_state.selected_video_team = video_teams[0] if video_teams else None
-                except Exception:
-                    # Fallback: Erstes verfügbares Team
-                    st.session_state.selected_video_team = video_teams[0] if video_teams else None
+                # Erstes verfügbares Team, bis die Hintergrund-Erkennung den nächsten Gegner kennt
+                st.session_state.selected_video_team = video_teams[0]
+                st.session_state['_video_team_pending'] = True
+            if st.session_state.get('_video_team_pending') and _next_opponent_job(PREFERRED_TEAM)["done"].is_set():
+                st.session_state.pop('_video_team_pending')
+                # Mappe den Ligaportal-Namen auf den lokalen Ordnernamen
+                mapped_opp = map_to_existing_team(next_opponent_if_ready(PREFERRED_TEAM), video_teams)
+                if mapped_opp:
+                    st.session_state.selected_video_team = mapped_opp
+            if st.session_state.get('_video_team_pending'):
+                with st.sidebar:
+                    _opponent_placeholder(PREFERRED_TEAM)
             
             # Team-Buttons anzeigen
             for team_name in video_teams:
                 if st.sidebar.button(team_name, key=f"btn_team_{team_name}", use_container_width=True):
                     st.session_state.selected_video_team = team_name
+                    st.session_state.pop('_video_team_pending', None)  # eigene Wahl nicht überschreiben
                     st.rerun()
             
             # Ausgewähltes Team anzeigen
@@ -2226,9 +2587,7 @@ def main():
                     with col_title:
                         st.markdown(f"### 📁 {selected_video_team} - Gegneranalyse")
                     with col_ppt:
-                        # PowerPoint-Link suchen und anzeigen
-                        ppt_path = None
-                        
+                        # PowerPoint-Link aus dem Matchplan-Index (neuestes Deck)
                         # Mapping für Team-Namen zu Ordner-Namen
                         team_folder_mapping = {
                             "St. Anna": "StAnna",
@@ -2239,28 +2598,24 @@ def main():
                         
                         # Verwende gemappten Ordnernamen oder Original-Namen
                         folder_name = team_folder_mapping.get(selected_video_team, selected_video_team)
-                        matchplan_team_dir = MATCHPLAN_BASE / folder_name
-                        
-                        if matchplan_team_dir.exists():
-                            # Suche nach PowerPoint-Dateien die mit "Gegneranalyse" beginnen
-                            ppt_files = list(matchplan_team_dir.glob("Gegneranalyse*.pptx"))
-                            if ppt_files:
-                                ppt_path = sorted(ppt_files)[0]  # Erste gefundene Datei
+                        ppt_deck = get_matchplan_index().latest("Gegneranalyse", folder_name)
                         
-                        if ppt_path and ppt_path.exists():
+                        if ppt_deck and ppt_deck["pfad"].exists():
                             # PowerPoint öffnen Button
                             if st.button("📊 PowerPoint öffnen", key=f"btn_ppt_{selected_video_team}"):
                                 try:
-                                    import os
                                     if os.name == "nt":  # Windows
-                                        os.startfile(str(ppt_path))
+                                        os.startfile(str(ppt_deck["pfad"]))
                                         # Keine Erfolgsmeldung mehr anzeigen
                                     else:
-                                        st.info(f"PowerPoint-Datei gefunden: {ppt_path.name}")
+                                        st.session_state["ppt_preview"] = str(ppt_deck["pfad"])
                                 except Exception as e:
                                     st.error(f"❌ Fehler beim Öffnen: {e}")
                         else:
                             st.caption(f"Keine PowerPoint gefunden")
+                    # Folien-Vorschau (ohne Windows) in voller Breite unter der Überschrift
+                    if ppt_deck and st.session_state.get("ppt_preview") == str(ppt_deck["pfad"]):
+                        render_deck_preview(ppt_deck)
                     
                     # Videos in einem Grid anzeigen
                     
@@ -2312,11 +2667,17 @@ def main():
         success = load_and_execute_altersstatistik_script()
         
         if not success:
-            st.warning("""
-            **Hinweis:** Falls das Altersstatistik-Skript nicht geladen werden kann, 
-            überprüfen Sie bitte den Pfad: `C:\\Users\\demmelb-ma\\OneDrive - COC AG\\JWR\\Matches\\2526\\Durchschnittsalter.py`
+            st.warning(f"""
+            **Hinweis:** Die Altersstatistik kommt aus `Durchschnittsalter.py` im Ordner des Dashboards;
+            die Daten aus `{ALTERSSTATISTIK_EXCEL}`.
             """)
 
+    elif view == "Suche":
+        render_search_view()
+
+    elif view == "Performance":
+        render_performance_view()
+
 # Entry point
 if __name__ == "__main__":
     main()
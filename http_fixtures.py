@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP-Abrufe der Scraper mit Record/Replay.
+
+Modus über Umgebungsvariable DASHBOARD_HTTP_MODE (oder set_http_mode):
+    live    – normaler Request (Standard)
+    record  – Request + Antwort als Fixture speichern
+    replay  – nur gespeicherte Fixtures, kein Netz (fehlt eine, gibt es FileNotFoundError)
+
+Fixtures liegen in DASHBOARD_FIXTURE_DIR (Standard: ./fixtures/http) als
+<slug>-<hash>.html plus index.json (URL -> Datei, Status, Zeitpunkt).
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+FIXTURE_DIR = Path(os.environ.get("DASHBOARD_FIXTURE_DIR", Path(__file__).parent / "fixtures" / "http"))
+HTTP_MODES = ("live", "record", "replay")
+_mode = os.environ.get("DASHBOARD_HTTP_MODE", "live").strip().lower()
+_index_lock = threading.Lock()
+
+
+class FixtureResponse:
+    """Minimaler Ersatz für requests.Response (text, status_code, url)."""
+
+    def __init__(self, url: str, text: str, status_code: int = 200):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+
+
+def set_http_mode(mode: str):
+    global _mode
+    if mode not in HTTP_MODES:
+        raise ValueError(f"Unbekannter HTTP-Modus: {mode} (erlaubt: {', '.join(HTTP_MODES)})")
+    _mode = mode
+
+
+def get_http_mode() -> str:
+    return _mode
+
+
+def fixture_path(url: str) -> Path:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", url.split("://", 1)[-1]).strip("-")[:80]
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return FIXTURE_DIR / f"{slug}-{digest}.html"
+
+
+def load_fixture_index() -> dict:
+    try:
+        return json.loads((FIXTURE_DIR / "index.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _record(url: str, resp):
+    path = fixture_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(resp.text, encoding="utf-8")
+    with _index_lock:
+        index = load_fixture_index()
+        index[url] = {
+            "file": path.name,
+            "status": resp.status_code,
+            "recorded": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        (FIXTURE_DIR / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def http_get(url: str, timeout=None, headers: dict | None = None, allow_redirects: bool = True):
+    """Gleiche Signatur wie requests.get für die Scraper; berücksichtigt den Fixture-Modus."""
+    if _mode == "replay":
+        meta = load_fixture_index().get(url, {})
+        path = FIXTURE_DIR / meta["file"] if meta.get("file") else fixture_path(url)
+        if not path.exists():
+            raise FileNotFoundError(f"Keine Fixture für {url} ({path})")
+        return FixtureResponse(url, path.read_text(encoding="utf-8"), int(meta.get("status", 200)))
+    import requests  # erst beim ersten echten Request (Kaltstart)
+    resp = requests.get(url, timeout=timeout, headers=headers, allow_redirects=allow_redirects)
+    if _mode == "record":
+        _record(url, resp)
+    return resp
+
+
+def iter_fixtures():
+    """(url, html) aller aufgezeichneten Seiten."""
+    for url, meta in sorted(load_fixture_index().items()):
+        path = FIXTURE_DIR / meta.get("file", "")
+        if path.is_file():
+            yield url, path.read_text(encoding="utf-8")
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Video-Kommentare der Individuellen Analysen (SQLite, WAL).
+
+    kommentare.player_comments(db, "Fabian Rossdorfer")   # {video: {'text', 'version', 'geaendert'}}
+    kommentare.save_comment(db, spieler, video, text, based_on=version)
+    kommentare.comment_history(db, spieler, video)
+
+Statt video_comments.json bei jedem Lesen neu zu parsen und bei jedem Speichern
+komplett neu zu schreiben, liegt jeder Kommentar als eigene Zeile (Spieler, Video)
+in SQLite. Jede Änderung bekommt eine neue Version und landet zusätzlich in der
+Historie; Speichern läuft in einer IMMEDIATE-Transaktion, gleichzeitige Sitzungen
+überschreiben sich also nicht mehr unbemerkt (based_on = zuletzt gelesene Version).
+
+Nur für einen Rechner: die DB gehört in einen lokalen, nicht synchronisierten Ordner.
+SQLite-Sperren und WAL funktionieren nicht über OneDrive o.ä. zwischen Rechnern –
+dort würden sich die -wal/-shm-Dateien überholen und die DB beschädigen.
+
+Lesen geht über einen prozessweiten Cache je Spieler. Gültig ist er, solange der
+Änderungszähler in `meta` (wird bei jedem Schreiben in derselben Transaktion
+erhöht) gleich ist – eine Primärschlüssel-Abfrage statt der ganzen Datei.
+
+Beim ersten Öffnen wird eine vorhandene video_comments.json einmalig übernommen
+(Quelle 'json' in der Historie); die JSON-Datei selbst bleibt unverändert liegen.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kommentare (
+    spieler TEXT NOT NULL, video TEXT NOT NULL, text TEXT NOT NULL,
+    version INTEGER NOT NULL, geaendert REAL NOT NULL,
+    PRIMARY KEY (spieler, video));
+CREATE TABLE IF NOT EXISTS kommentar_historie (
+    spieler TEXT NOT NULL, video TEXT NOT NULL, version INTEGER NOT NULL,
+    text TEXT NOT NULL, ts REAL NOT NULL, quelle TEXT,
+    PRIMARY KEY (spieler, video, version));
+CREATE TABLE IF NOT EXISTS meta (schluessel TEXT PRIMARY KEY, wert TEXT);
+INSERT OR IGNORE INTO meta (schluessel, wert) VALUES ('stand', '0');
+"""
+
+_local = threading.local()
+_cache: dict[tuple[str, str], tuple[str, dict]] = {}
+_cache_lock = threading.Lock()
+_init_lock = threading.Lock()
+_initialized: set[str] = set()  # DB-Pfade, für die Schema und JSON-Übernahme schon gelaufen sind
+
+
+class KommentarKonflikt(ValueError):
+    """Der Kommentar wurde seit dem Lesen (based_on) von jemand anderem gespeichert."""
+
+    def __init__(self, aktuell: dict):
+        super().__init__(f"Kommentar inzwischen geändert (Version {aktuell['version']})")
+        self.aktuell = aktuell
+
+
+# ========================= Verbindung =========================
+def connect(db_path: Path, legacy_json: Path | None = None) -> sqlite3.Connection:
+    """Verbindung des aktuellen Threads (eine pro DB-Datei). Schema und Übernahme von
+    `legacy_json` laufen nur einmal pro DB-Pfad und Prozess, weitere Threads öffnen nur."""
+    cons = getattr(_local, "cons", None)
+    if cons is None:
+        cons = _local.cons = {}
+    key = str(db_path)
+    con = cons.get(key)
+    if con is not None:
+        return con
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    # isolation_level=None: Transaktionen explizit (BEGIN IMMEDIATE beim Schreiben)
+    con = sqlite3.connect(key, timeout=10, isolation_level=None)
+    con.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if key not in _initialized:
+            con.execute("PRAGMA journal_mode=WAL")  # bleibt in der DB-Datei gespeichert
+            con.executescript(SCHEMA)
+            if legacy_json is not None:
+                migrate_json(con, Path(legacy_json))
+            _initialized.add(key)
+    cons[key] = con
+    return con
+
+
+def _meta(con: sqlite3.Connection, key: str) -> str | None:
+    row = con.execute("SELECT wert FROM meta WHERE schluessel = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def migrate_json(con: sqlite3.Connection, json_path: Path) -> int:
+    """Übernimmt video_comments.json ({spieler: {video: text}}) genau einmal.
+    Leere Kommentare werden ausgelassen. Rückgabe: Anzahl übernommener Kommentare."""
+    if _meta(con, "json_migriert") is not None or not json_path.exists():
+        return 0
+    try:
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    now = time.time()
+    rows = [
+        (str(spieler), str(video), str(text).strip())
+        for spieler, videos in (data.items() if isinstance(data, dict) else [])
+        if isinstance(videos, dict)
+        for video, text in videos.items()
+        if str(text or "").strip()
+    ]
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        if _meta(con, "json_migriert") is None:  # anderer Prozess war schneller
+            con.executemany(
+                "INSERT OR IGNORE INTO kommentare (spieler, video, text, version, geaendert) VALUES (?, ?, ?, 1, ?)",
+                [(*r, now) for r in rows],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO kommentar_historie (spieler, video, version, text, ts, quelle) "
+                "VALUES (?, ?, 1, ?, ?, 'json')",
+                [(*r, now) for r in rows],
+            )
+            con.execute("INSERT INTO meta (schluessel, wert) VALUES ('json_migriert', ?)", (str(json_path),))
+            _bump(con)
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    return len(rows)
+
+
+def _bump(con: sqlite3.Connection):
+    con.execute("UPDATE meta SET wert = CAST(wert AS INTEGER) + 1 WHERE schluessel = 'stand'")
+
+
+# ========================= Lesen =========================
+def player_comments(db_path: Path, spieler: str, legacy_json: Path | None = None) -> dict[str, dict]:
+    """Alle Kommentare eines Spielers in einer Abfrage: {video: {'text', 'version', 'geaendert'}}.
+    Aus dem Cache, solange seit dem letzten Lesen nirgends geschrieben wurde."""
+    con = connect(db_path, legacy_json)
+    stand = _meta(con, "stand")
+    key = (str(db_path), spieler)
+    with _cache_lock:
+        hit = _cache.get(key)
+    if hit and hit[0] == stand:
+        return hit[1]
+    comments = {
+        video: {"text": text, "version": version, "geaendert": geaendert}
+        for video, text, version, geaendert in con.execute(
+            "SELECT video, text, version, geaendert FROM kommentare WHERE spieler = ?", (spieler,))
+    }
+    with _cache_lock:
+        _cache[key] = (stand, comments)
+    return comments
+
+
+def all_comments(db_path: Path, legacy_json: Path | None = None) -> tuple[str, list[tuple[str, str, str]]]:
+    """(Änderungszähler, [(spieler, video, text)]) aller nicht leeren Kommentare – für die Suche."""
+    con = connect(db_path, legacy_json)
+    con.execute("BEGIN")  # Zähler und Zeilen aus demselben Stand
+    try:
+        stand = _meta(con, "stand")
+        rows = con.execute("SELECT spieler, video, text FROM kommentare WHERE text != ''").fetchall()
+    finally:
+        con.execute("COMMIT")
+    return stand, rows
+
+
+def comment_history(db_path: Path, spieler: str, video: str) -> list[dict]:
+    """Alle Versionen eines Kommentars, neueste zuerst."""
+    con = connect(db_path)
+    return [
+        {"version": version, "text": text, "ts": ts, "quelle": quelle}
+        for version, text, ts, quelle in con.execute(
+            "SELECT version, text, ts, quelle FROM kommentar_historie "
+            "WHERE spieler = ? AND video = ? ORDER BY version DESC", (spieler, video))
+    ]
+
+
+# ========================= Schreiben =========================
+def save_comment(db_path: Path, spieler: str, video: str, text: str,
+                 based_on: int | None = None, quelle: str = "dashboard") -> int:
+    """Speichert den Kommentar als neue Version und gibt die Versionsnummer zurück.
+
+    based_on: Version, auf der die Eingabe beruht (0 = noch kein Kommentar). Weicht die
+    gespeicherte Version ab, wird nichts geschrieben und KommentarKonflikt ausgelöst.
+    Unveränderter Text erzeugt keine neue Version, leerer Text ohne gespeicherten
+    Kommentar schreibt gar nichts (Rückgabe 0).
+    """
+    con = connect(db_path)
+    text = (text or "").strip()
+    now = time.time()
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        row = con.execute(
+            "SELECT text, version, geaendert FROM kommentare WHERE spieler = ? AND video = ?",
+            (spieler, video)).fetchone()
+        current = row[1] if row else 0
+        if row is None and not text:  # leerer Kommentar ohne Vorgänger: nichts zu speichern
+            con.execute("ROLLBACK")
+            return 0
+        if based_on is not None and based_on != current:
+            raise KommentarKonflikt({"text": row[0], "version": row[1], "geaendert": row[2]} if row
+                                    else {"text": "", "version": 0, "geaendert": None})
+        if row and row[0] == text:
+            con.execute("ROLLBACK")
+            return current
+        version = current + 1
+        con.execute(
+            "INSERT INTO kommentare (spieler, video, text, version, geaendert) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (spieler, video) DO UPDATE SET text = excluded.text, "
+            "version = excluded.version, geaendert = excluded.geaendert",
+            (spieler, video, text, version, now),
+        )
+        con.execute(
+            "INSERT INTO kommentar_historie (spieler, video, version, text, ts, quelle) VALUES (?, ?, ?, ?, ?, ?)",
+            (spieler, video, version, text, now, quelle),
+        )
+        _bump(con)
+        con.execute("COMMIT")
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    return version
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Laufzeit-Messung für das Dashboard.
+
+    with messen("draw_pitch"): ...          # Kontextmanager
+    @timed("parse_goals_assists")           # Decorator
+    cache_miss("load_team_videos")          # erste Zeile einer st.cache_data-Funktion
+
+Jeder Script-Durchlauf (Rerun oder Fragment-Rerun) sammelt Dauer und Anzahl je
+Abschnitt sowie Cache-Treffer/-Fehlschläge (Aufrufe von @timed(..., cache=True)
+minus cache_miss im Funktionskörper). Abgeschlossene Durchläufe landen in einem
+prozessweiten Ringpuffer (letzte MAX_RERUNS); mit DASHBOARD_PERF_LOG=<pfad.jsonl>
+wird jeder Durchlauf zusätzlich als JSON-Zeile angehängt. Messungen außerhalb
+eines Durchlaufs (Hintergrund-Threads) werden einzeln als "hintergrund" abgelegt.
+"""
+
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+MAX_RERUNS = int(os.environ.get("DASHBOARD_PERF_RERUNS", "50"))
+PERF_LOG = os.environ.get("DASHBOARD_PERF_LOG")  # optionaler JSONL-Export
+
+_reruns: deque = deque(maxlen=MAX_RERUNS)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+# ========================= Durchläufe =========================
+def start_rerun(art: str = "rerun", **info) -> bool:
+    """Beginnt einen Durchlauf im aktuellen Thread. False, wenn schon einer läuft
+    (z.B. Fragment innerhalb eines vollen Reruns) – dann zählt alles zum äußeren."""
+    if getattr(_local, "rerun", None) is not None:
+        return False
+    _local.rerun = {
+        "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+        "art": art,
+        **info,
+        "_t0": time.perf_counter(),
+        "abschnitte": {},
+        "cache": {},
+    }
+    return True
+
+
+def annotate(**info):
+    """Zusatzinfos (z.B. ansicht=...) zum laufenden Durchlauf."""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        rerun.update(info)
+
+
+def finish_rerun(**info):
+    """Schließt den Durchlauf des aktuellen Threads ab und legt ihn im Ringpuffer ab."""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        return
+    _local.rerun = None
+    rerun.update(info)
+    rerun["gesamt_ms"] = round((time.perf_counter() - rerun.pop("_t0")) * 1000, 2)
+    _store(rerun)
+
+
+@contextmanager
+def rerun_scope(art: str = "rerun", **info):
+    """start_rerun/finish_rerun als Kontextmanager (auch bei st.stop/st.rerun)."""
+    started = start_rerun(art, **info)
+    try:
+        yield
+    finally:
+        if started:
+            finish_rerun()
+
+
+def _store(entry: dict):
+    with _lock:
+        _reruns.append(entry)
+    if PERF_LOG:
+        try:
+            with open(PERF_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+def last_reruns(n: int | None = None) -> list[dict]:
+    """Die letzten n abgeschlossenen Durchläufe, neueste zuerst."""
+    with _lock:
+        items = list(_reruns)
+    items.reverse()
+    return items[:n] if n else items
+
+
+def export_jsonl(entries: list[dict] | None = None) -> str:
+    return "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in (last_reruns() if entries is None else entries))
+
+
+def load_jsonl(path: Path) -> list[dict]:
+    """Exportierte Durchläufe für die Offline-Auswertung."""
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                out.append(json.loads(line))
+    return out
+
+
+# ========================= Timer =========================
+def _record(name: str, ms: float, cache: bool):
+    rerun = getattr(_local, "rerun", None)
+    if rerun is None:
+        _store({
+            "ts": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "art": "hintergrund",
+            "gesamt_ms": round(ms, 2),
+            "abschnitte": {name: {"ms": round(ms, 2), "n": 1}},
+            "cache": {},
+        })
+        return
+    section = rerun["abschnitte"].setdefault(name, {"ms": 0.0, "n": 0})
+    section["ms"] = round(section["ms"] + ms, 2)
+    section["n"] += 1
+    if cache:
+        rerun["cache"].setdefault(name, {"hit": 0, "miss": 0})["hit"] += 1
+
+
+@contextmanager
+def messen(name: str, cache: bool = False):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, (time.perf_counter() - t0) * 1000, cache)
+
+
+def timed(name: str | None = None, cache: bool = False):
+    """Decorator-Variante von messen(). Mit cache=True über einer st.cache_data-Funktion
+    zählt jeder Aufruf als Treffer, bis cache_miss() im Funktionskörper ihn umbucht."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with messen(label, cache=cache):
+                return fn(*args, **kwargs)
+
+        if hasattr(fn, "clear"):  # st.cache_data-API erhalten
+            wrapper.clear = fn.clear
+        return wrapper
+    return deco
+
+
+def cache_miss(name: str):
+    """Im Körper einer gecachten Funktion aufrufen: läuft nur bei einem Cache-Miss."""
+    rerun = getattr(_local, "rerun", None)
+    if rerun is not None:
+        counts = rerun["cache"].setdefault(name, {"hit": 0, "miss": 0})
+        # der umschließende Timer bucht erst nach dem Aufruf einen Treffer -> vorab ausgleichen
+        counts["miss"] += 1
+        counts["hit"] -= 1
+
+
+# ========================= Auswertung =========================
+def summarize(entries: list[dict]) -> list[dict]:
+    """Je Abschnitt: Anzahl Durchläufe, Summe/Median/Max ms, Cache-Trefferquote."""
+    per_name: dict[str, dict] = {}
+    for entry in entries:
+        for name, sec in entry.get("abschnitte", {}).items():
+            agg = per_name.setdefault(name, {"Abschnitt": name, "ms": [], "Aufrufe": 0, "hit": 0, "miss": 0})
+            agg["ms"].append(sec["ms"])
+            agg["Aufrufe"] += sec["n"]
+        for name, c in entry.get("cache", {}).items():
+            agg = per_name.setdefault(name, {"Abschnitt": name, "ms": [], "Aufrufe": 0, "hit": 0, "miss": 0})
+            agg["hit"] += c["hit"]
+            agg["miss"] += c["miss"]
+    rows = []
+    for agg in per_name.values():
+        ms = sorted(agg.pop("ms")) or [0.0]
+        hit, miss = agg.pop("hit"), agg.pop("miss")
+        rows.append({
+            **agg,
+            "Summe ms": round(sum(ms), 1),
+            "Median ms": round(ms[len(ms) // 2], 1),
+            "Max ms": round(ms[-1], 1),
+            "Cache-Treffer %": round(100 * hit / (hit + miss), 0) if hit + miss else None,
+        })
+    return sorted(rows, key=lambda r: r["Summe ms"], reverse=True)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Logo-Assets für das Dashboard (und die Batch-Renderer).
+
+Die Logo-Zeile zeigt jedes Team-Logo mit 28 px Höhe. Statt bei jedem Rerun pro
+Team vier Globs zu machen und die Original-Dateien als Base64 einzubetten, werden
+die Logos einmal auf Anzeigegröße (doppelte Auflösung für HiDPI) verkleinert und
+in ein Sprite-Sheet gepackt. Das Sheet liegt unter einem Namen aus (Pfad, mtime)
+aller Logos im Cache-Ordner; bei `server.enableStaticServing` wird es als
+statische Datei ausgeliefert (neuer Name bei jeder Änderung -> Browser-Cache
+bleibt gültig), sonst als kleine Data-URI eingebettet.
+
+Für die Spielfeld-Hintergründe (Logo mit alpha=0.05) gibt es einen prozessweiten
+LRU-Cache fertiger Texturen: dekodiert, verkleinert und mit vormultipliziertem
+Alpha, Schlüssel (Pfad, mtime). Speicherbudget über DASHBOARD_LOGO_CACHE_MB
+(Standard 32) oder set_texture_budget().
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import html
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    from PIL import Image
+except ImportError:  # ohne Pillow bleibt es bei den Originaldateien
+    Image = None
+
+LOGO_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+DISPLAY_HEIGHT = 28       # px, wie .logo-row im Dashboard
+PIXEL_RATIO = 2           # Sheet in doppelter Auflösung
+MAX_ASPECT = 3.0          # sehr breite Logos auf 3:1 begrenzen
+SPRITE_PREFIX = "logos-"
+PITCH_LOGO_ALPHA = 0.05   # Deckkraft des Logos im Spielfeld
+PITCH_LOGO_MAX_PX = 256   # längste Seite der Textur; bei alpha=0.05 nicht von voller Auflösung zu unterscheiden
+
+_dir_index: dict[str, tuple[float, Path | None]] = {}
+
+
+# ========================= Logo-Suche =========================
+def find_logo(directory: Path) -> Path | None:
+    """Erstes Bild im Ordner – Reihenfolge wie die bisherigen Globs (png, jpg, jpeg, bmp,
+    je Endung alphabetisch). Ein scandir, gemerkt bis sich die mtime des Ordners ändert."""
+    key = str(directory)
+    try:
+        mtime = os.stat(key).st_mtime
+    except OSError:
+        return None
+    hit = _dir_index.get(key)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    by_ext: dict[str, list[str]] = {}
+    try:
+        with os.scandir(key) as it:
+            for entry in it:
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in LOGO_EXTS and not entry.name.startswith(".") and entry.is_file():
+                    by_ext.setdefault(ext, []).append(entry.name)
+    except OSError:
+        return None
+    logo = next((Path(key) / sorted(by_ext[ext])[0] for ext in LOGO_EXTS if ext in by_ext), None)
+    _dir_index[key] = (mtime, logo)
+    return logo
+
+
+def data_uri(path: Path) -> str | None:
+    """Datei als Data-URI (MIME nach Endung)."""
+    mime = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".bmp": "image/bmp"}.get(path.suffix.lower(), "image/png")
+    try:
+        return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode()}"
+    except OSError:
+        return None
+
+
+# ========================= Sprite-Sheet =========================
+def build_sprite(paths: list[Path], height: int = DISPLAY_HEIGHT * PIXEL_RATIO) -> tuple[bytes, list[int]]:
+    """Verkleinert alle Logos auf `height` px Höhe und legt sie nebeneinander in ein PNG.
+    Gibt (PNG-Bytes, Kachelbreite je Logo) zurück; nicht lesbare Logos haben Breite 0."""
+    tiles = []
+    for path in paths:
+        try:
+            with Image.open(path) as im:
+                im = im.convert("RGBA")
+                scale = min(height / im.height, height * MAX_ASPECT / im.width)
+                size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+                tiles.append(im.resize(size, Image.LANCZOS))
+        except (OSError, ValueError):
+            tiles.append(None)
+    widths = [tile.width if tile else 0 for tile in tiles]
+    sheet = Image.new("RGBA", (max(1, sum(widths)), height), (0, 0, 0, 0))
+    x = 0
+    for tile in tiles:
+        if tile:
+            sheet.paste(tile, (x, (height - tile.height) // 2))
+            x += tile.width
+    buf = io.BytesIO()
+    sheet.save(buf, format="PNG", optimize=True)
+    return buf.getvalue(), widths
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _prune(directory: Path, keep: str):
+    for old in directory.glob(f"{SPRITE_PREFIX}*"):
+        if not old.name.startswith(keep):
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def sprite_sheet(paths: list[Path], cache_dir: Path) -> dict | None:
+    """Sprite-Sheet zu den Logos: {'file': Path, 'widths': [...]}. Liegt es für denselben
+    Stand (Pfad + mtime aller Logos) schon im Cache-Ordner, wird nichts neu skaliert.
+    None ohne Pillow."""
+    if Image is None:
+        return None
+    stamp = [(str(p), os.stat(p).st_mtime) for p in paths]
+    name = SPRITE_PREFIX + hashlib.sha1(json.dumps(stamp).encode("utf-8")).hexdigest()[:16]
+    png, meta = cache_dir / f"{name}.png", cache_dir / f"{name}.json"
+    try:
+        return {"file": png, "widths": json.loads(meta.read_text(encoding="utf-8"))}
+    except (OSError, ValueError):
+        pass
+    data, widths = build_sprite(paths)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(png, data)
+        _write_atomic(meta, json.dumps(widths).encode("utf-8"))
+        _prune(cache_dir, name)
+    except OSError:
+        return {"file": None, "data": data, "widths": widths}
+    return {"file": png, "widths": widths}
+
+
+def publish_static(sprite: dict, static_dir: Path) -> str | None:
+    """Kopiert das Sheet nach `static_dir` (Streamlit-Static-Serving) und gibt die URL zurück."""
+    if not sprite.get("file"):
+        return None
+    target = static_dir / sprite["file"].name
+    try:
+        if not target.exists():
+            static_dir.mkdir(parents=True, exist_ok=True)
+            _write_atomic(target, sprite["file"].read_bytes())
+            _prune(static_dir, target.stem)
+    except OSError:
+        return None
+    return f"app/static/{target.name}"
+
+
+def sprite_url(sprite: dict) -> str | None:
+    """Data-URI des Sheets (Fallback ohne Static-Serving)."""
+    if sprite.get("data") is not None:
+        return "data:image/png;base64," + base64.b64encode(sprite["data"]).decode()
+    return data_uri(sprite["file"])
+
+
+def sprite_row_html(links: list[tuple[str, str, str]], widths: list[int], url: str,
+                    css_class: str = "logo-row") -> str:
+    """Logo-Zeile aus dem Sheet: links = [(href, title, alt)], je Logo ein Ausschnitt
+    per background-position. Maße in CSS-px (Sheet-px / PIXEL_RATIO)."""
+    total = sum(widths) / PIXEL_RATIO
+    parts = [
+        f"<style>.{css_class} .logo-sprite {{ background-image:url('{url}'); "
+        f"background-size:{total:g}px {DISPLAY_HEIGHT}px; }}</style>",
+        f'<div class="{css_class}">',
+    ]
+    x = 0
+    for (href, title, alt), width in zip(links, widths):
+        if width:
+            parts.append(
+                f'<a href="{html.escape(href)}" target="_self" title="{html.escape(title)}">'
+                f'<span class="logo-sprite" role="img" aria-label="{html.escape(alt)}" '
+                f'style="width:{width / PIXEL_RATIO:g}px; background-position:-{x / PIXEL_RATIO:g}px 0"></span></a>'
+            )
+        x += width
+    parts.append("</div>")
+    return "".join(parts)
+
+
+# ========================= Spielfeld-Texturen =========================
+_texture_budget = int(float(os.environ.get("DASHBOARD_LOGO_CACHE_MB", "32")) * 1024 * 1024)
+_textures: OrderedDict[tuple, np.ndarray] = OrderedDict()
+_texture_bytes = 0
+_texture_lock = threading.Lock()
+
+
+def set_texture_budget(megabytes: float):
+    """Speicherbudget des Textur-Caches setzen (ältere Einträge fliegen sofort raus)."""
+    global _texture_budget
+    with _texture_lock:
+        _texture_budget = int(megabytes * 1024 * 1024)
+        _evict()
+
+
+def texture_cache_info() -> dict:
+    with _texture_lock:
+        return {"eintraege": len(_textures), "bytes": _texture_bytes, "budget": _texture_budget}
+
+
+def _evict():
+    global _texture_bytes
+    while _texture_bytes > _texture_budget and _textures:
+        _, old = _textures.popitem(last=False)
+        _texture_bytes -= old.nbytes
+
+
+def _decode_texture(path: Path, alpha: float, max_px: int) -> np.ndarray:
+    import numpy as np
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+        im.thumbnail((max_px, max_px), Image.LANCZOS)  # verkleinert nur, nie größer
+        arr = np.asarray(im, dtype=np.float32) / 255.0
+    arr[..., 3] *= alpha
+    arr.setflags(write=False)  # wird zwischen Threads/Plots geteilt
+    return arr
+
+
+def pitch_texture(path: Path, alpha: float = PITCH_LOGO_ALPHA, max_px: int = PITCH_LOGO_MAX_PX) -> np.ndarray | None:
+    """RGBA-Textur (float32, Alpha bereits mit `alpha` multipliziert) für ax.imshow ohne
+    alpha-Argument. Warm kein Plattenzugriff außer stat und kein PNG-Decode. None ohne
+    Pillow oder wenn die Datei nicht lesbar ist."""
+    global _texture_bytes
+    if Image is None:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    key = (str(path), mtime, alpha, max_px)
+    with _texture_lock:
+        arr = _textures.get(key)
+        if arr is not None:
+            _textures.move_to_end(key)
+            return arr
+    try:
+        arr = _decode_texture(path, alpha, max_px)
+    except (OSError, ValueError):
+        return None
+    with _texture_lock:
+        if key not in _textures:
+            # veraltete Fassung derselben Datei (andere mtime) gleich mit entfernen
+            for stale in [k for k in _textures if k[0] == key[0] and k[1] != mtime]:
+                _texture_bytes -= _textures.pop(stale).nbytes
+            _textures[key] = arr
+            _texture_bytes += arr.nbytes
+            _evict()
+    return arr
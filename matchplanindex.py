@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Dokument-Index über MATCHPLAN_BASE (LineUp_*.pptx, Gegneranalyse*.pptx).
+
+    index = MatchplanIndex(MATCHPLAN_BASE, thumb_dir=...)
+    index.refresh(); index.start()           # erster Scan, danach Watcher-Thread
+    index.latest("LineUp", "Treibach")       # neuestes Deck zum Team (Dict-Lookup)
+
+Pro Deck: Pfad, Art, Team-Ordner (erste Ebene unter der Basis), Team aus dem
+Dateinamen, mtime, Größe und Folienanzahl (aus der Dateiliste der PPTX). Nach
+Team-Schlüssel (Ordner und Dateiname, nur Kleinbuchstaben/Ziffern) liegt je Art
+das neueste Deck bereit – ein Klick auf ein Logo kostet keinen Verzeichnislauf.
+
+Aktualisiert wird inkrementell (nur neue/geänderte Decks werden geöffnet) in einem
+Hintergrund-Thread: mit watchdog auf Dateisystem-Ereignisse, sonst alle
+POLL_SECONDS. Optional (thumb_dir, z.B. ohne os.startfile) werden Folien-Vorschauen
+gerendert: LibreOffice -> PDF -> pdftoppm -> PNG, sofern beide Programme da sind.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # ohne watchdog: Polling
+    FileSystemEventHandler = object
+    Observer = None
+
+DECK_KINDS = {"lineup_": "LineUp", "gegneranalyse": "Gegneranalyse"}
+POLL_SECONDS = 60           # ohne watchdog
+WATCH_POLL_SECONDS = 600    # mit watchdog: Sicherheitsnetz (z.B. verpasste Sync-Ereignisse)
+THUMB_DPI = 40
+CONVERT_TIMEOUT = 180       # Sekunden pro Deck
+_SLIDE_RE = re.compile(r"ppt/slides/slide\d+\.xml$")
+
+
+def normalize_key(name: str) -> str:
+    """Team-Schlüssel: nur Kleinbuchstaben und Ziffern ('St. Anna' -> 'stanna')."""
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+def deck_kind(filename: str) -> str | None:
+    low = filename.lower()
+    if not low.endswith(".pptx") or low.startswith("~$"):
+        return None
+    return next((kind for prefix, kind in DECK_KINDS.items() if low.startswith(prefix)), None)
+
+
+def slide_count(path: Path) -> int | None:
+    try:
+        with zipfile.ZipFile(path) as z:
+            return sum(1 for name in z.namelist() if _SLIDE_RE.match(name))
+    except (OSError, zipfile.BadZipFile):
+        return None
+
+
+def _deck_team(stem: str, kind: str) -> str:
+    """Team aus dem Dateinamen: 'LineUp_Treibach' -> 'Treibach', 'Gegneranalyse_WAC_R12' -> 'WAC_R12'."""
+    rest = stem[len("LineUp_"):] if kind == "LineUp" else stem[len("Gegneranalyse"):]
+    return rest.strip(" _-")
+
+
+# ========================= Folien-Vorschau =========================
+def thumbnail_tools() -> tuple[str, str] | None:
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    pdftoppm = shutil.which("pdftoppm")
+    return (soffice, pdftoppm) if soffice and pdftoppm else None
+
+
+def render_thumbnails(deck: dict, thumb_dir: Path) -> list[Path] | None:
+    """PNG je Folie unter thumb_dir/<hash(Pfad, mtime)>/; schon vorhandene werden wiederverwendet.
+    None, wenn die Umwandlung fehlschlägt (defektes/gesperrtes Deck)."""
+    target = thumb_dir / hashlib.sha1(f"{deck['pfad']}|{deck['mtime']}".encode("utf-8")).hexdigest()[:16]
+    existing = sorted(target.glob("folie-*.png"), key=lambda p: int(p.stem.rsplit("-", 1)[1]))
+    if existing:
+        return existing
+    tools = thumbnail_tools()
+    if tools is None:
+        return []
+    soffice, pdftoppm = tools
+    with tempfile.TemporaryDirectory(prefix="matchplan-") as tmp:
+        try:
+            subprocess.run([soffice, "--headless", "--convert-to", "pdf", "--outdir", tmp, str(deck["pfad"])],
+                           capture_output=True, timeout=CONVERT_TIMEOUT, check=True)
+            pdf = next(Path(tmp).glob("*.pdf"))
+            target.mkdir(parents=True, exist_ok=True)
+            subprocess.run([pdftoppm, "-png", "-r", str(THUMB_DPI), str(pdf), str(target / "folie")],
+                           capture_output=True, timeout=CONVERT_TIMEOUT, check=True)
+        except (OSError, subprocess.SubprocessError, StopIteration):
+            return None
+    # alte Stände desselben Decks entfernen
+    for old in thumb_dir.iterdir():
+        if old.is_dir() and old != target and (old / ".quelle").exists() \
+                and (old / ".quelle").read_text(encoding="utf-8") == str(deck["pfad"]):
+            shutil.rmtree(old, ignore_errors=True)
+    (target / ".quelle").write_text(str(deck["pfad"]), encoding="utf-8")
+    return sorted(target.glob("folie-*.png"), key=lambda p: int(p.stem.rsplit("-", 1)[1]))
+
+
+# ========================= Index =========================
+class _WakeHandler(FileSystemEventHandler):
+    def __init__(self, wake: threading.Event):
+        self._wake = wake
+
+    def on_any_event(self, event):
+        if str(getattr(event, "src_path", "")).lower().endswith(".pptx") or \
+                str(getattr(event, "dest_path", "")).lower().endswith(".pptx") or event.is_directory:
+            self._wake.set()
+
+
+class MatchplanIndex:
+    """Index der Matchplan-Decks; Lookups lesen nur den aktuellen Snapshot (thread-sicher)."""
+
+    def __init__(self, base: Path, thumb_dir: Path | None = None):
+        self.base = Path(base)
+        self.thumb_dir = Path(thumb_dir) if thumb_dir else None
+        self._decks: dict[str, dict] = {}
+        self._latest: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+        self.scanned_at = None
+
+    # ----- Lookups -----
+    def latest(self, kind: str, team: str) -> dict | None:
+        """Neuestes Deck der Art zum Team (Ordner- oder Dateiname), None wenn keins bekannt."""
+        return self._latest.get((kind, normalize_key(team)))
+
+    def keys(self, kind: str) -> list[str]:
+        return [key for k, key in self._latest if k == kind]
+
+    def decks(self) -> list[dict]:
+        return list(self._decks.values())
+
+    # ----- Aktualisierung -----
+    def refresh(self) -> int:
+        """Basisordner lesen; nur neue/geänderte Decks werden geöffnet. Rückgabe: Anzahl geändert."""
+        with self._lock:
+            old, decks, changed = self._decks, {}, 0
+            if self.base.exists():
+                for dirpath, dirnames, filenames in os.walk(self.base):
+                    dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+                    for name in filenames:
+                        kind = deck_kind(name)
+                        if kind is None:
+                            continue
+                        path = Path(dirpath) / name
+                        try:
+                            info = path.stat()
+                        except OSError:
+                            continue
+                        prev = old.get(str(path))
+                        if prev and prev["mtime"] == info.st_mtime and prev["groesse"] == info.st_size:
+                            decks[str(path)] = prev
+                            continue
+                        rel = path.relative_to(self.base).parts
+                        decks[str(path)] = {
+                            "pfad": path,
+                            "art": kind,
+                            "ordner": rel[0] if len(rel) > 1 else "",
+                            "team": _deck_team(path.stem, kind),
+                            "mtime": info.st_mtime,
+                            "groesse": info.st_size,
+                            "folien": slide_count(path),
+                            "vorschau": [],  # None = Umwandlung fehlgeschlagen, erst bei neuer mtime wieder
+                        }
+                        changed += 1
+            latest = {}
+            for deck in decks.values():
+                for key in {normalize_key(deck["ordner"]), normalize_key(deck["team"])} - {""}:
+                    best = latest.get((deck["art"], key))
+                    if best is None or deck["mtime"] > best["mtime"]:
+                        latest[(deck["art"], key)] = deck
+            changed += len(old.keys() - decks.keys())
+            self._decks, self._latest = decks, latest  # Snapshot tauschen
+            self.scanned_at = time.time()
+        return changed
+
+    def render_missing_thumbnails(self):
+        """Vorschau für Decks ohne Bilder. Fehlgeschlagene (vorschau None) bleiben aus, bis sich
+        ihre mtime ändert – refresh legt dann einen neuen Eintrag an."""
+        if self.thumb_dir is None or thumbnail_tools() is None:
+            return
+        for deck in self.decks():
+            if deck["vorschau"] == [] and not self._stop.is_set():
+                deck["vorschau"] = render_thumbnails(deck, self.thumb_dir)
+
+    # ----- Watcher -----
+    def start(self):
+        """Watcher-Thread starten (watchdog falls installiert, sonst Polling)."""
+        if self._thread is not None:
+            return
+        interval = POLL_SECONDS
+        if Observer is not None and self.base.exists():
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_WakeHandler(self._wake), str(self.base), recursive=True)
+                self._observer.daemon = True
+                self._observer.start()
+                interval = WATCH_POLL_SECONDS
+            except OSError:
+                self._observer = None
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="matchplan-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _run(self, interval: float):
+        self.render_missing_thumbnails()
+        while not self._stop.is_set():
+            self._wake.wait(interval)
+            if self._stop.is_set():
+                break
+            time.sleep(1.0)  # Ereignis-Serien (Speichern, OneDrive-Sync) zusammenfassen
+            self._wake.clear()
+            try:
+                self.refresh()
+            except OSError:
+                continue
+            self.render_missing_thumbnails()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Extraktion der ÖFB-Preload-Payloads aus vereine.oefb.at-Seiten.
+
+Die Seiten enthalten Blöcke der Form
+    SG.container.appPreloads['<id>'] = [ ...JSON... ];
+(Kader, Spiele, Tabelle, ...). Statt mehrerer Regex-Durchläufe über die ganze
+Seite werden die Marker in einem Durchlauf per str.find gesucht, Blöcke ohne den
+gesuchten Schlüssel übersprungen und nur der Ausschnitt eines Blocks geparst
+(orjson, sonst json.raw_decode direkt ab der Startposition).
+"""
+
+import json
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+PRELOAD_MARKER = "SG.container.appPreloads["
+_decoder = json.JSONDecoder()
+
+
+def _iter_blocks(html: str) -> Iterator[tuple[str, int, int]]:
+    """Liefert (preload_id, json_start, block_end) für alle Preload-Blöcke – ein Durchlauf."""
+    pos = html.find(PRELOAD_MARKER)
+    while pos != -1:
+        nxt = html.find(PRELOAD_MARKER, pos + len(PRELOAD_MARKER))
+        id_start = pos + len(PRELOAD_MARKER)
+        id_end = html.find("]", id_start)
+        eq = html.find("=", id_end) if id_end != -1 else -1
+        if eq != -1 and (nxt == -1 or eq < nxt):
+            preload_id = html[id_start:id_end].strip().strip("'\"")
+            json_start = eq + 1
+            while json_start < len(html) and html[json_start] in " \t\r\n":
+                json_start += 1
+            script_end = html.find("</script>", json_start)
+            ends = [e for e in (nxt, script_end) if e != -1]
+            yield preload_id, json_start, (min(ends) if ends else len(html))
+        pos = nxt
+
+
+def _parse_block(html: str, start: int, end: int) -> Any:
+    """Parst genau einen Block; Ausschnitt bis zum abschließenden ';' bevorzugt über orjson."""
+    if orjson is not None:
+        chunk = html[start:end].rstrip()
+        semi = chunk.rfind(";")
+        if semi != -1:
+            try:
+                return orjson.loads(chunk[:semi])
+            except orjson.JSONDecodeError:
+                pass
+    # raw_decode liest ab `start` genau einen JSON-Wert und ignoriert den Rest der Seite
+    return _decoder.raw_decode(html, start)[0]
+
+
+def iter_app_preloads(html: str, require: str | None = None) -> Iterator[tuple[str, Any]]:
+    """(preload_id, daten) je Block. Mit `require` werden nur Blöcke geparst, die
+    den Schlüssel (z.B. "kader", "spiele", "tabelle") textuell enthalten."""
+    needle = f'"{require}"' if require else None
+    for preload_id, start, end in _iter_blocks(html):
+        if needle and html.find(needle, start, end) == -1:
+            continue
+        try:
+            yield preload_id, _parse_block(html, start, end)
+        except ValueError:
+            continue
+
+
+def _find_key(data: Any, key: str, max_depth: int = 4) -> Any:
+    """Breitensuche nach dem ersten Dict, das `key` enthält (flach vor tief)."""
+    level = [data]
+    for _ in range(max_depth):
+        nxt = []
+        for node in level:
+            if isinstance(node, dict):
+                if key in node:
+                    return node[key]
+                nxt.extend(v for v in node.values() if isinstance(v, (dict, list)))
+            elif isinstance(node, list):
+                nxt.extend(v for v in node if isinstance(v, (dict, list)))
+        if not nxt:
+            break
+        level = nxt
+    return None
+
+
+def find_preload_value(html: str, key: str) -> Any:
+    """Erster Wert zum Schlüssel `key` über alle Preload-Blöcke (None wenn nicht vorhanden)."""
+    for _, data in iter_app_preloads(html, require=key):
+        value = _find_key(data, key)
+        if value is not None:
+            return value
+    return None
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Relativer Alterseffekt (RAE) aus dem Kader (Team, Spieler, Geburtsdatum).
+
+Erwartung ist die Gleichverteilung der Geburten über das Jahr, gewichtet mit
+der Anzahl Tage pro Quartal/Monat. Pro Team und für die ganze Liga:
+    - Anzahl und Index (beobachtet / erwartet) je Quartal
+    - Odds Ratio Q1 vs. Q4
+    - Chi-Quadrat-Test gegen die Gleichverteilung (Quartale, 3 Freiheitsgrade)
+    - Geburtsmonate als Histogramm (Team × Jan..Dez)
+
+Reine pandas/math-Funktionen ohne Streamlit; die p-Werte kommen aus der
+geschlossenen Form der Chi-Quadrat-Verteilung (kein scipy nötig).
+"""
+
+import math
+
+import pandas as pd
+
+LIGA = "Liga"
+QUARTERS = ["Q1", "Q2", "Q3", "Q4"]
+MONTHS = ["Jan", "Feb", "Mär", "Apr", "Mai", "Jun", "Jul", "Aug", "Sep", "Okt", "Nov", "Dez"]
+DAYS_PER_MONTH = [31, 28.25, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+DAYS_PER_QUARTER = [sum(DAYS_PER_MONTH[i:i + 3]) for i in range(0, 12, 3)]
+SIGNIFICANCE = 0.05
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """P(X >= x) für X ~ Chi²(dof), geschlossene Form für ganzzahlige Freiheitsgrade."""
+    if x <= 0:
+        return 1.0
+    half = x / 2
+    if dof % 2 == 0:
+        term, total = 1.0, 1.0
+        for i in range(1, dof // 2):
+            term *= half / i
+            total += term
+        return min(1.0, math.exp(-half) * total)
+    total = math.erfc(math.sqrt(half))
+    term = math.sqrt(2 * x / math.pi) * math.exp(-half)
+    for i in range(1, (dof + 1) // 2):
+        total += term
+        term *= x / (2 * i + 1)
+    return min(1.0, total)
+
+
+def _expected_shares(days: list[float]) -> pd.Series:
+    total = sum(days)
+    return pd.Series([d / total for d in days])
+
+
+def month_histogram(roster: pd.DataFrame) -> pd.DataFrame:
+    """Geburtsmonate je Team plus Liga-Zeile (Spalten Jan..Dez)."""
+    months = pd.crosstab(roster['Team'], roster['Geburtsdatum'].dt.month)
+    months = months.reindex(columns=range(1, 13), fill_value=0).set_axis(MONTHS, axis=1)
+    months.loc[LIGA] = months.sum()
+    return months.rename_axis(None, axis=0).rename_axis(None, axis=1)
+
+
+def quarter_analysis(roster: pd.DataFrame) -> pd.DataFrame:
+    """Quartals-Kennzahlen und Chi-Quadrat-Test je Team und für die Liga."""
+    counts = pd.crosstab(roster['Team'], roster['Geburtsdatum'].dt.quarter)
+    counts = counts.reindex(columns=[1, 2, 3, 4], fill_value=0)
+    counts.columns = QUARTERS
+    counts.loc[LIGA] = counts.sum()
+
+    n = counts.sum(axis=1)
+    expected_share = _expected_shares(DAYS_PER_QUARTER).set_axis(QUARTERS)
+    expected = pd.DataFrame(n.values[:, None] * expected_share.values[None, :],
+                            index=counts.index, columns=QUARTERS)
+
+    result = counts.copy()
+    result['Gesamt'] = n
+    for q in QUARTERS:
+        result[f'{q}_Index'] = (counts[q] / expected[q].where(expected[q] > 0)).round(2)
+    # Odds Ratio Q1 vs. Q4, bezogen auf die erwarteten Anteile (+0.5 gegen Division durch 0)
+    result['OR_Q1_Q4'] = (
+        ((counts['Q1'] + 0.5) / (counts['Q4'] + 0.5))
+        / (expected_share['Q1'] / expected_share['Q4'])
+    ).round(2)
+    chi2 = ((counts - expected) ** 2 / expected.where(expected > 0)).sum(axis=1)
+    result['Chi2'] = chi2.round(2)
+    result['p_Wert'] = [chi2_sf(x, len(QUARTERS) - 1) if total else float('nan')
+                        for x, total in zip(chi2, n)]
+    result['Signifikant'] = result['p_Wert'] < SIGNIFICANCE
+    return result.rename_axis('Team').reset_index()
+
+
+def analyse(roster: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Alle RAE-Tabellen auf einmal: {'quartale': ..., 'monate': ...}."""
+    return {
+        'quartale': quarter_analysis(roster),
+        'monate': month_histogram(roster).rename_axis('Team').reset_index(),
+    }
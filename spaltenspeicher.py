@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Spaltenspeicher für lokale Caches (Tabellen-Historie, Altersdaten, ...).
+
+Schreibt DataFrames als Parquet (pyarrow), ohne pyarrow als CSV-Fallback.
+Schreiben erfolgt atomar (tmp-Datei + os.replace), damit parallele
+Streamlit-Worker nie eine halb geschriebene Datei lesen.
+
+pandas/pyarrow werden erst beim Lesen/Schreiben importiert (Kaltstart des Dashboards).
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+
+def frame_path(path: Path) -> Path:
+    """Tatsächlicher Dateipfad (Endung je nach verfügbarem Format)."""
+    return Path(path).with_suffix(".parquet" if HAS_PARQUET else ".csv")
+
+
+def frame_mtime(path: Path) -> float:
+    """mtime der gespeicherten Datei (0.0 wenn nicht vorhanden) – praktisch als Cache-Key."""
+    p = frame_path(path)
+    try:
+        return p.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def read_frame(path: Path, columns: list[str] | None = None, parse_dates: list[str] | None = None) -> pd.DataFrame | None:
+    """Liest einen gespeicherten DataFrame; None wenn nicht vorhanden/lesbar."""
+    p = frame_path(path)
+    if not p.exists():
+        return None
+    import pandas as pd
+    try:
+        if HAS_PARQUET:
+            return pd.read_parquet(p, columns=columns)
+        df = pd.read_csv(p, usecols=columns, parse_dates=parse_dates or [])
+        return df
+    except Exception:
+        return None
+
+
+def write_frame(df: pd.DataFrame, path: Path) -> bool:
+    """Schreibt einen DataFrame atomar. Gibt True bei Erfolg zurück."""
+    p = frame_path(path)
+    tmp = p.with_name(p.name + f".{os.getpid()}.tmp")
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        if HAS_PARQUET:
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False)
+        os.replace(tmp, p)
+        return True
+    except Exception:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+# ========================= Partitionen (Hive-Layout key=value/) =========================
+def write_partition(df: pd.DataFrame, root: Path, key: str, value: str) -> bool:
+    """Schreibt (ersetzt) die Partition root/key=value/part."""
+    return write_frame(df, Path(root) / f"{key}={value}" / "part")
+
+
+def list_partitions(root: Path, key: str) -> list[str]:
+    """Vorhandene Partitionswerte (sortiert), ohne Dateien zu öffnen."""
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(
+        p.name.split("=", 1)[1] for p in root.glob(f"{key}=*")
+        if p.is_dir() and frame_path(p / "part").exists()
+    )
+
+
+def read_partitions(root: Path, key: str, values: list[str] | None = None,
+                    columns: list[str] | None = None, parse_dates: list[str] | None = None) -> pd.DataFrame | None:
+    """Liest nur die Partitionen mit key in values (Predicate Pushdown: andere Dateien
+    werden nicht geöffnet). Die Partitionsspalte `key` ist im Ergebnis enthalten."""
+    wanted = None if values is None else {str(v) for v in values}
+    parts = [v for v in list_partitions(root, key) if wanted is None or v in wanted]
+    if not parts:
+        return None
+    try:
+        if HAS_PARQUET:
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+            dataset = ds.dataset(
+                [str(frame_path(Path(root) / f"{key}={v}" / "part")) for v in parts],
+                format="parquet",
+                partitioning=ds.partitioning(pa.schema([(key, pa.string())]), flavor="hive"),
+                partition_base_dir=str(root),
+            )
+            cols = None if columns is None else [*columns, key]
+            return dataset.to_table(columns=cols).to_pandas()
+        frames = []
+        for v in parts:
+            df = read_frame(Path(root) / f"{key}={v}" / "part", columns, parse_dates)
+            if df is not None:
+                frames.append(df.assign(**{key: v}))
+        import pandas as pd
+        return pd.concat(frames, ignore_index=True) if frames else None
+    except Exception:
+        return None
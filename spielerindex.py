@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Asset-Index der Individuellen Analysen (ein Ordner pro Spieler).
+
+    spielerindex.list_players(base)                 # Spielerordner, gemerkt bis sich base ändert
+    spielerindex.player_assets(base / name, thumb_dir)
+
+Pro Spielerordner ein Eintrag mit Porträt, Clips, Dokumenten (.pptx/.pdf/.xlsx),
+Cliplänge und optional Vorschaubild je Clip. Der Ordner wird nur neu gelesen
+(ein scandir), wenn sich seine mtime ändert; dabei werden nur neue oder geänderte
+Dateien (Größe/mtime) neu untersucht, alles andere kommt aus dem alten Eintrag.
+Ein Überschreiben an Ort und Stelle (gleicher Name) ändert die Ordner-mtime nicht –
+das fängt refresh() ab, das zusätzlich Größe/mtime jeder Datei vergleicht.
+
+Cliplänge: bei MP4/MOV/M4V direkt aus dem mvhd-Atom (nur Atom-Header lesen, kein
+Decoder), sonst über OpenCV falls installiert. Vorschaubilder (JPEG, 320 px breit)
+nur mit OpenCV; sie liegen unter einem Namen aus (Pfad, mtime) in thumb_dir.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from pathlib import Path
+
+try:
+    import cv2  # optional: Vorschaubilder und Länge von AVI/MKV/WebM
+except ImportError:
+    cv2 = None
+
+VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".avi", ".mkv", ".webm"}
+DOC_EXTS = {".pptx", ".pdf", ".xlsx"}
+PORTRAIT_EXTS = (".png", ".jpg", ".jpeg")   # Reihenfolge wie bisher (png vor jpg)
+MP4_EXTS = {".mp4", ".mov", ".m4v"}
+THUMB_WIDTH = 320
+
+_players: dict[str, tuple[float, list[str]]] = {}
+_index: dict[str, dict] = {}
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+
+
+# ========================= Spielerliste =========================
+def list_players(base: Path) -> list[str]:
+    """Namen aller Spielerordner (alphabetisch). Ein scandir, solange sich base nicht ändert."""
+    key = str(base)
+    try:
+        mtime = os.stat(key).st_mtime
+    except OSError:
+        return []
+    hit = _players.get(key)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    try:
+        with os.scandir(key) as it:
+            names = sorted(e.name for e in it if e.is_dir() and not e.name.startswith("."))
+    except OSError:
+        return []
+    _players[key] = (mtime, names)
+    return names
+
+
+# ========================= Clip-Metadaten =========================
+def _iter_atoms(f, start: int, end: int):
+    """(typ, Position der Nutzdaten, Ende) der MP4-Atome zwischen start und end."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack(">I4s", header)
+        body = pos + 8
+        if size == 1:  # 64-bit-Größe
+            size = struct.unpack(">Q", f.read(8))[0]
+            body += 8
+        elif size == 0:  # bis Dateiende
+            size = end - pos
+        if size < 8:
+            return
+        yield kind, body, pos + size
+        pos += size
+
+
+def mp4_duration(path: Path) -> float | None:
+    """Länge in Sekunden aus moov/mvhd – liest nur Atom-Header, egal wo moov liegt."""
+    try:
+        with open(path, "rb") as f:
+            end = os.fstat(f.fileno()).st_size
+            for kind, body, atom_end in _iter_atoms(f, 0, end):
+                if kind != b"moov":
+                    continue
+                for sub, sub_body, _ in _iter_atoms(f, body, atom_end):
+                    if sub != b"mvhd":
+                        continue
+                    f.seek(sub_body)
+                    version = f.read(1)[0]
+                    if version == 1:
+                        f.seek(sub_body + 4 + 16)
+                        timescale, duration = struct.unpack(">IQ", f.read(12))
+                    else:
+                        f.seek(sub_body + 4 + 8)
+                        timescale, duration = struct.unpack(">II", f.read(8))
+                    return round(duration / timescale, 2) if timescale else None
+    except (OSError, struct.error, IndexError):
+        pass
+    return None
+
+
+def _cv2_duration(path: Path) -> float | None:
+    cap = cv2.VideoCapture(str(path))
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        return round(frames / fps, 2) if fps and frames else None
+    finally:
+        cap.release()
+
+
+def clip_duration(path: Path) -> float | None:
+    if path.suffix.lower() in MP4_EXTS:
+        duration = mp4_duration(path)
+        if duration is not None:
+            return duration
+    return _cv2_duration(path) if cv2 is not None else None
+
+
+def clip_thumbnail(path: Path, mtime: float, thumb_dir: Path) -> Path | None:
+    """Vorschaubild (Frame bei 10 % der Länge) als JPEG; None ohne OpenCV."""
+    if cv2 is None:
+        return None
+    name = hashlib.sha1(f"{path}|{mtime}".encode("utf-8")).hexdigest()[:16] + ".jpg"
+    target = thumb_dir / name
+    if target.exists():
+        return target
+    cap = cv2.VideoCapture(str(path))
+    try:
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        if frames:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(frames * 0.1))
+        ok, frame = cap.read()
+    finally:
+        cap.release()
+    if not ok:
+        return None
+    h, w = frame.shape[:2]
+    if w > THUMB_WIDTH:
+        frame = cv2.resize(frame, (THUMB_WIDTH, round(h * THUMB_WIDTH / w)), interpolation=cv2.INTER_AREA)
+    try:
+        thumb_dir.mkdir(parents=True, exist_ok=True)
+        return target if cv2.imwrite(str(target), frame) else None
+    except OSError:
+        return None
+
+
+# ========================= Index =========================
+def _file_stats(player_dir: Path) -> dict[str, tuple[int, float]]:
+    """(Größe, mtime) je Porträt, Clip und Dokument im Ordner."""
+    with os.scandir(player_dir) as it:
+        return {
+            e.name: (st.st_size, st.st_mtime)
+            for e in it
+            if e.is_file() and os.path.splitext(e.name)[1].lower() in (*PORTRAIT_EXTS, *DOC_EXTS, *VIDEO_EXTS)
+            for st in (e.stat(),)
+        }
+
+
+def _scan(player_dir: Path, old: dict | None, thumb_dir: Path | None) -> dict:
+    old_clips = {c["path"]: c for c in (old or {}).get("clips", [])}
+    portraits, clips, docs, files = {}, [], [], {}
+    with os.scandir(player_dir) as it:
+        entries = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
+    for entry in entries:
+        ext = os.path.splitext(entry.name)[1].lower()
+        path = Path(entry.path)
+        if ext in (*PORTRAIT_EXTS, *DOC_EXTS, *VIDEO_EXTS):
+            info = entry.stat()
+            files[entry.name] = (info.st_size, info.st_mtime)
+        if ext in PORTRAIT_EXTS:
+            portraits.setdefault(ext, path)
+        elif ext in DOC_EXTS:
+            docs.append(path)
+        elif ext in VIDEO_EXTS:
+            prev = old_clips.get(path)
+            if prev and prev["size"] == info.st_size and prev["mtime"] == info.st_mtime:
+                clip = prev
+                if thumb_dir is not None and clip["thumbnail"] is None and cv2 is not None:
+                    clip = {**clip, "thumbnail": clip_thumbnail(path, info.st_mtime, thumb_dir)}
+            else:
+                clip = {
+                    "path": path,
+                    "name": entry.name,
+                    "size": info.st_size,
+                    "mtime": info.st_mtime,
+                    "duration": clip_duration(path),
+                    "thumbnail": clip_thumbnail(path, info.st_mtime, thumb_dir) if thumb_dir is not None else None,
+                }
+            clips.append(clip)
+    portrait = next((portraits[ext] for ext in PORTRAIT_EXTS if ext in portraits), None)
+    return {"portrait": portrait, "clips": clips, "docs": docs, "_files": files}
+
+
+def player_assets(player_dir: Path, thumb_dir: Path | None = None, check_files: bool = False) -> dict | None:
+    """Index-Eintrag des Spielers: {'portrait', 'clips': [{path, name, size, mtime, duration,
+    thumbnail}], 'docs'}. Warm ein stat auf den Ordner; None wenn es den Ordner nicht gibt.
+    check_files: auch bei gleicher Ordner-mtime Größe/mtime jeder Datei vergleichen."""
+    key = str(player_dir)
+    try:
+        mtime = os.stat(key).st_mtime
+    except OSError:
+        return None
+    with _lock:
+        hit = _index.get(key)
+    if hit and hit["_mtime"] == mtime:
+        try:
+            if not check_files or _file_stats(Path(player_dir)) == hit["_files"]:
+                return hit
+        except OSError:
+            return hit
+    try:
+        entry = _scan(Path(player_dir), hit, thumb_dir)
+    except OSError:
+        return None
+    entry["_mtime"] = mtime
+    with _lock:
+        _index[key] = entry
+    return entry
+
+
+def refresh(base: Path, thumb_dir: Path | None = None, wait: bool = True) -> int | None:
+    """Alle Spielerordner aktualisieren (z.B. beim Start oder im Hintergrund), inkl. Dateien,
+    die an Ort und Stelle überschrieben wurden. Rückgabe: Anzahl Spieler im Index; None bei wait=False, wenn schon ein Lauf aktiv ist
+    (zwei Scans würden dieselben Clips doppelt dekodieren)."""
+    if not _refresh_lock.acquire(blocking=wait):
+        return None
+    try:
+        players = list_players(base)
+        for name in players:
+            player_assets(Path(base) / name, thumb_dir, check_files=True)
+        return len(players)
+    finally:
+        _refresh_lock.release()
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Volltextsuche über Clips, Kommentare und Analyse-Dokumente (SQLite FTS5).
+
+    suchindex.refresh(db, clip_roots=..., doc_roots=..., comments=...)
+    suchindex.search(db, "PirkerM 1touch")      # [{'art', 'titel', 'pfad', 'auszug', ...}]
+
+Quellen:
+    - Clips (Dateiname): mit Parser (parse_filename_parts: Team, Gegner, Kategorie,
+      Torschütze) als Tor-Clip, sonst als Wörter des Dateinamens
+    - Kommentare der Individuellen Analysen (kommentare.all_comments)
+    - Text aus .pptx (Folien-XML, kein python-pptx nötig) und .pdf (mit pypdf, sonst
+      nur der Dateiname)
+
+Aktualisierung inkrementell: pro Datei werden mtime und Größe gemerkt, neu gelesen
+werden nur neue/geänderte Dateien, verschwundene fliegen raus. Kommentare werden
+nur neu übernommen, wenn sich der Änderungszähler des Kommentar-Speichers ändert.
+Der Tokenizer (unicode61, ohne Akzente) trennt auch an "_", "PirkerM" findet also
+04_Treibach_StAnna_1Touch_PirkerM.mp4; jeder Suchbegriff gilt als Präfix.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader  # optional: Text aus PDFs
+except ImportError:
+    PdfReader = None
+
+VIDEO_EXTS = {".mp4", ".mov", ".m4v", ".avi", ".mkv", ".webm"}
+DOC_EXTS = {".pptx", ".pdf"}
+MAX_TEXT = 200_000        # Zeichen pro Dokument
+RESULT_LIMIT = 50
+BATCH = 200               # Dateien pro Transaktion beim Aktualisieren
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quellen (
+    id INTEGER PRIMARY KEY, schluessel TEXT UNIQUE NOT NULL, art TEXT NOT NULL,
+    mtime REAL, groesse INTEGER);
+CREATE VIRTUAL TABLE IF NOT EXISTS suche USING fts5(
+    titel, inhalt, art UNINDEXED, pfad UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2');
+CREATE TABLE IF NOT EXISTS meta (schluessel TEXT PRIMARY KEY, wert TEXT);
+"""
+
+_local = threading.local()
+_refresh_lock = threading.Lock()
+_A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Verbindung des aktuellen Threads (WAL: Suchen während der Index aktualisiert wird)."""
+    cons = getattr(_local, "cons", None)
+    if cons is None:
+        cons = _local.cons = {}
+    key = str(db_path)
+    con = cons.get(key)
+    if con is None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(key, timeout=10)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.executescript(SCHEMA)
+        cons[key] = con
+    return con
+
+
+# ========================= Text-Extraktion =========================
+def pptx_texts(path: Path) -> list[str]:
+    """Text je Folie (Reihenfolge der Foliennummern) aus den Folien-XMLs der PPTX."""
+    slide_re = re.compile(r"ppt/slides/slide(\d+)\.xml$")
+    out = []
+    with zipfile.ZipFile(path) as z:
+        slides = sorted((int(m.group(1)), name) for name in z.namelist() if (m := slide_re.match(name)))
+        for _, name in slides:
+            root = ElementTree.fromstring(z.read(name))
+            out.append(" ".join(t.text for t in root.iter(f"{_A_NS}t") if t.text))
+    return out
+
+
+def pdf_text(path: Path) -> str:
+    if PdfReader is None:
+        return ""
+    return "\n".join(page.extract_text() or "" for page in PdfReader(str(path)).pages)
+
+
+def document_text(path: Path) -> str:
+    try:
+        if path.suffix.lower() == ".pptx":
+            return "\n".join(pptx_texts(path))[:MAX_TEXT]
+        if path.suffix.lower() == ".pdf":
+            return pdf_text(path)[:MAX_TEXT]
+    except Exception:  # defekte/gesperrte Datei: nur über den Namen auffindbar
+        pass
+    return ""
+
+
+def _words(stem: str) -> str:
+    return " ".join(p for p in re.split(r"[_\-\s]+", stem) if p)
+
+
+# ========================= Aktualisierung =========================
+def _walk(root: Path, exts: set[str]):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            if name.startswith(("~$", ".")) or os.path.splitext(name)[1].lower() not in exts:
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            yield Path(path), info.st_mtime, info.st_size
+
+
+def _clip_entry(path: Path, clip_parser) -> tuple[str, str]:
+    if clip_parser is not None:
+        team, opponent, cat, scorer = clip_parser(path)
+        titel = f"{team} vs. {opponent} – {cat}" + (f" – {scorer}" if scorer else "")
+        return titel, f"{_words(path.stem)} Torschütze {scorer or ''} Team {team} Gegner {opponent} {cat}"
+    return f"{path.parent.name}: {path.stem}", f"{path.parent.name} {_words(path.stem)}"
+
+
+def _upsert(con, schluessel: str, art: str, mtime, groesse, titel: str, inhalt: str, pfad: str):
+    row = con.execute("SELECT id FROM quellen WHERE schluessel = ?", (schluessel,)).fetchone()
+    if row:
+        con.execute("UPDATE quellen SET mtime = ?, groesse = ? WHERE id = ?", (mtime, groesse, row[0]))
+        con.execute("DELETE FROM suche WHERE rowid = ?", (row[0],))
+        rowid = row[0]
+    else:
+        rowid = con.execute("INSERT INTO quellen (schluessel, art, mtime, groesse) VALUES (?, ?, ?, ?)",
+                            (schluessel, art, mtime, groesse)).lastrowid
+    con.execute("INSERT INTO suche (rowid, titel, inhalt, art, pfad) VALUES (?, ?, ?, ?, ?)",
+                (rowid, titel, inhalt, art, pfad))
+
+
+def _remove_missing(con, arten: tuple[str, ...], keep: set[str]) -> int:
+    if not arten:
+        return 0
+    marks = ",".join("?" * len(arten))
+    gone = [(i,) for i, key in con.execute(f"SELECT id, schluessel FROM quellen WHERE art IN ({marks})", arten)
+            if key not in keep]
+    con.executemany("DELETE FROM suche WHERE rowid = ?", gone)
+    con.executemany("DELETE FROM quellen WHERE id = ?", gone)
+    return len(gone)
+
+
+def _sync_files(con, sources: list[tuple]) -> int:
+    """sources: [(art, Wurzelordner, Endungen, Clip-Parser)]. Rückgabe: Anzahl neu gelesener Dateien."""
+    known = {key: (mtime, size) for key, mtime, size in con.execute("SELECT schluessel, mtime, groesse FROM quellen")}
+    seen, changed = set(), 0
+    for art, root, exts, clip_parser in sources:
+        if not root:
+            continue
+        if not Path(root).exists():  # Ordner (gerade) nicht erreichbar: Einträge behalten
+            seen.update(key for key in known if key.startswith(str(root)))
+            continue
+        for path, mtime, size in _walk(Path(root), exts):
+            key = str(path)
+            if key in seen:  # überlappende Wurzeln
+                continue
+            seen.add(key)
+            if known.get(key) == (mtime, size):
+                continue
+            if art == "Dokument":
+                titel, inhalt = f"{path.parent.name}: {path.name}", f"{_words(path.stem)}\n{document_text(path)}"
+            else:
+                titel, inhalt = _clip_entry(path, clip_parser)
+            _upsert(con, key, art, mtime, size, titel, inhalt, key)
+            changed += 1
+            if changed % BATCH == 0:
+                con.commit()
+    with con:
+        _remove_missing(con, tuple({source[0] for source in sources}), seen)
+    return changed
+
+
+def _sync_comments(con, comments, player_base: Path | None) -> int:
+    """comments: (Änderungszähler, [(spieler, video, text)]) – nur bei neuem Zähler übernommen."""
+    stand, rows = comments
+    row = con.execute("SELECT wert FROM meta WHERE schluessel = 'kommentare'").fetchone()
+    if row and row[0] == str(stand):
+        return 0
+    keep = set()
+    with con:
+        for spieler, video, text in rows:
+            key = f"kommentar:{spieler}/{video}"
+            keep.add(key)
+            pfad = str(Path(player_base) / spieler / video) if player_base else video
+            _upsert(con, key, "Kommentar", None, None, f"{spieler} – {video}", text, pfad)
+        _remove_missing(con, ("Kommentar",), keep)
+        con.execute("INSERT OR REPLACE INTO meta (schluessel, wert) VALUES ('kommentare', ?)", (str(stand),))
+    return len(rows)
+
+
+def refresh(db_path: Path, clip_roots: dict[str, tuple] | None = None, doc_roots: list[Path] | None = None,
+            comments=None, player_base: Path | None = None, wait: bool = True) -> dict | None:
+    """Index auf den aktuellen Stand bringen.
+
+    clip_roots: {art: (Ordner, Parser oder None)}, z.B. {"Tor-Clip": (RL_VIDEOS_BASE, parse_filename_parts)}
+    doc_roots: Ordner mit .pptx/.pdf (rekursiv)
+    comments: Rückgabe von kommentare.all_comments oder eine Funktion, die sie liefert
+    wait=False: None statt warten, wenn gerade schon aktualisiert wird
+    """
+    if not _refresh_lock.acquire(blocking=wait):  # ein Aktualisierer pro Prozess
+        return None
+    try:
+        t0 = time.perf_counter()
+        con = connect(db_path)
+        sources = [(art, root, VIDEO_EXTS, parser) for art, (root, parser) in (clip_roots or {}).items()]
+        sources += [("Dokument", root, DOC_EXTS, None) for root in (doc_roots or [])]
+        files = _sync_files(con, sources) if sources else 0
+        if callable(comments):
+            comments = comments()
+        notes = _sync_comments(con, comments, player_base) if comments is not None else 0
+        if sources:
+            with con:
+                con.execute("INSERT OR REPLACE INTO meta (schluessel, wert) VALUES ('aktualisiert', ?)",
+                            (str(time.time()),))
+        return {"dateien": files, "kommentare": notes, "ms": round((time.perf_counter() - t0) * 1000, 1)}
+    finally:
+        _refresh_lock.release()
+
+
+# ========================= Suche =========================
+def build_query(text: str) -> str | None:
+    """Benutzereingabe -> FTS5-Ausdruck: jedes Wort als Präfix, alle müssen vorkommen."""
+    terms = [t for t in re.split(r"[\s_]+", text.strip()) if t]
+    if not terms:
+        return None
+    return " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+
+
+def search(db_path: Path, text: str, arten: list[str] | None = None, limit: int = RESULT_LIMIT) -> list[dict]:
+    """Treffer nach Relevanz (bm25, Titel doppelt gewichtet) mit hervorgehobenem Auszug."""
+    query = build_query(text)
+    if query is None:
+        return []
+    sql = ("SELECT art, titel, pfad, snippet(suche, 1, '**', '**', ' … ', 12) "
+           "FROM suche WHERE suche MATCH ?")
+    params: list = [query]
+    if arten:
+        sql += f" AND art IN ({','.join('?' * len(arten))})"
+        params += arten
+    sql += " ORDER BY bm25(suche, 2.0, 1.0) LIMIT ?"
+    params.append(limit)
+    try:
+        rows = connect(db_path).execute(sql, params).fetchall()
+    except sqlite3.OperationalError:  # z.B. nur Sonderzeichen eingegeben
+        return []
+    return [{"art": art, "titel": titel, "pfad": pfad, "auszug": auszug} for art, titel, pfad, auszug in rows]
+
+
+def index_info(db_path: Path) -> dict:
+    """Anzahl Einträge je Art und Zeitpunkt der letzten Aktualisierung."""
+    con = connect(db_path)
+    counts = dict(con.execute("SELECT art, COUNT(*) FROM quellen GROUP BY art"))
+    row = con.execute("SELECT wert FROM meta WHERE schluessel = 'aktualisiert'").fetchone()
+    return {"eintraege": counts, "aktualisiert": float(row[0]) if row else None}